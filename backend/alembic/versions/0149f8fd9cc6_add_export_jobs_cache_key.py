@@ -0,0 +1,30 @@
+"""add export jobs cache key
+
+Revision ID: 0149f8fd9cc6
+Revises: 8bb6958dcec1
+Create Date: 2026-10-19 09:36:05.617285
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0149f8fd9cc6'
+down_revision: Union[str, Sequence[str], None] = '8bb6958dcec1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('export_jobs', sa.Column('cache_key', sa.String(), nullable=True))
+    op.create_index('ix_export_jobs_cache_key', 'export_jobs', ['cache_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_export_jobs_cache_key', table_name='export_jobs')
+    op.drop_column('export_jobs', 'cache_key')
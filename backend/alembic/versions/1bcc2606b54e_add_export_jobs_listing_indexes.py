@@ -0,0 +1,47 @@
+"""add export jobs listing indexes
+
+Revision ID: 1bcc2606b54e
+Revises: 0149f8fd9cc6
+Create Date: 2026-10-19 09:43:18.740742
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1bcc2606b54e'
+down_revision: Union[str, Sequence[str], None] = '0149f8fd9cc6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Listing: newest first, overall and per tenant
+    op.create_index(
+        'ix_export_jobs_created_at_id',
+        'export_jobs',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_export_jobs_tenant_created_at',
+        'export_jobs',
+        ['tenant_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    # Reconciliation only ever looks at jobs that are still in play
+    op.create_index(
+        'ix_export_jobs_active_status',
+        'export_jobs',
+        ['status'],
+        postgresql_where=sa.text("status IN ('queued', 'running', 'cancelling', 'failed')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_export_jobs_active_status', table_name='export_jobs')
+    op.drop_index('ix_export_jobs_tenant_created_at', table_name='export_jobs')
+    op.drop_index('ix_export_jobs_created_at_id', table_name='export_jobs')
@@ -0,0 +1,42 @@
+"""add export schedules table
+
+Revision ID: 7906a64362ad
+Revises: 1bcc2606b54e
+Create Date: 2026-10-19 09:50:31.864199
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7906a64362ad'
+down_revision: Union[str, Sequence[str], None] = '1bcc2606b54e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('export_schedules',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('cron', sa.String(), nullable=False),
+        sa.Column('period', sa.String(), server_default='last_month', nullable=False),
+        sa.Column('mode', sa.String(), server_default='export', nullable=False),
+        sa.Column('tenant_id', sa.String(), nullable=True),
+        sa.Column('format', sa.String(), server_default='xlsx', nullable=False),
+        sa.Column('enabled', sa.Boolean(), server_default=sa.text('true'), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(), nullable=True),
+        sa.Column('last_run_at', sa.DateTime(), nullable=True),
+        sa.Column('last_job_id', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('export_schedules')
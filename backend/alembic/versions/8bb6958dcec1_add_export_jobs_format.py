@@ -0,0 +1,31 @@
+"""add export jobs format
+
+Revision ID: 8bb6958dcec1
+Revises: f60f1e44882c
+Create Date: 2026-10-19 09:28:52.493828
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8bb6958dcec1'
+down_revision: Union[str, Sequence[str], None] = 'f60f1e44882c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'export_jobs',
+        sa.Column('format', sa.String(), nullable=False, server_default='xlsx'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('export_jobs', 'format')
@@ -0,0 +1,30 @@
+"""add export jobs completed at
+
+Revision ID: c3e1a9d4b7f2
+Revises: 7906a64362ad
+Create Date: 2026-10-19 14:12:47.308215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e1a9d4b7f2'
+down_revision: Union[str, Sequence[str], None] = '7906a64362ad'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('export_jobs', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    # Best we know for existing rows; they age out of reuse soon anyway
+    op.execute("UPDATE export_jobs SET completed_at = created_at WHERE status = 'completed'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('export_jobs', 'completed_at')
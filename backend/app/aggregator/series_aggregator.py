@@ -0,0 +1,172 @@
+# app/aggregator/series_aggregator.py
+
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+BUCKETS = ("day", "week", "month")
+
+
+def _parse_time(ts: str) -> datetime:
+    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
+
+# -----------------------------
+# Per-record (timestamp, seconds)
+# Same rules as the window aggregators; None skips the record.
+# -----------------------------
+def _alert_point(alert: Dict[str, Any]):
+    raised_at = alert.get("raisedAt")
+    return (raised_at, None) if raised_at else None
+
+
+def _sla_point(case: Dict[str, Any]):
+    # CaseTelemetryAggregator: resolved cases, createdAt -> resolvedAt
+    if case.get("status") != "resolved" or not case.get("resolvedAt") or not case.get("createdAt"):
+        return None
+    seconds = (_parse_time(case["resolvedAt"]) - _parse_time(case["createdAt"])).total_seconds()
+    return case["createdAt"], seconds
+
+
+def _mtta_point(case: Dict[str, Any]):
+    # MTTAAggregator: initial detection -> created, else created <-> assigned
+    created_at = case.get("createdAt")
+    if created_at is None:
+        return None
+    detection_time = case.get("initialDetection", {}).get("time")
+    if detection_time is not None:
+        seconds = (_parse_time(created_at) - _parse_time(detection_time)).total_seconds()
+    elif case.get("assignedAt") is not None:
+        seconds = abs((_parse_time(case["assignedAt"]) - _parse_time(created_at)).total_seconds())
+    else:
+        return None
+    return (created_at, seconds) if seconds >= 0 else None
+
+
+def _mttr_point(case: Dict[str, Any]):
+    # MTTRAggregator over resolved cases: initial detection -> resolved,
+    # else assigned <-> resolved
+    resolved_at = case.get("resolvedAt")
+    if case.get("status") != "resolved" or resolved_at is None or not case.get("createdAt"):
+        return None
+    detection_time = case.get("initialDetection", {}).get("time")
+    if detection_time is not None:
+        seconds = (_parse_time(resolved_at) - _parse_time(detection_time)).total_seconds()
+    elif case.get("assignedAt") is not None:
+        seconds = abs((_parse_time(case["assignedAt"]) - _parse_time(resolved_at)).total_seconds())
+    else:
+        return None
+    return (case["createdAt"], seconds) if seconds >= 0 else None
+
+
+def _mttd_point(record: Dict[str, Any]):
+    # MTTDAggregator.aggregate2: sensor generated -> detected
+    detection = record.get("detection") or {}
+    sensor_time = detection.get("sensorGeneratedAt")
+    detected_time = detection.get("time")
+    if not sensor_time or not detected_time:
+        return None
+    seconds = (_parse_time(detected_time) - _parse_time(sensor_time)).total_seconds()
+    return (detected_time, seconds) if seconds >= 0 else None
+
+
+# metric -> (record kind from TelemetrySummaryService.fetch_tenant, point)
+SERIES_METRICS: Dict[str, Tuple[str, Callable]] = {
+    "alerts": ("alerts", _alert_point),
+    "sla": ("cases", _sla_point),
+    "mttd": ("detections", _mttd_point),
+    "mtta": ("cases", _mtta_point),
+    "mttr": ("cases", _mttr_point),
+}
+
+
+class TelemetrySeriesAggregator:
+    @staticmethod
+    def bucket_start(day: date, bucket: str) -> date:
+        if bucket == "week":
+            return day - timedelta(days=day.weekday())  # Monday
+        if bucket == "month":
+            return day.replace(day=1)
+        return day
+
+    @staticmethod
+    def bucket_starts(date_from: date, date_to: date, bucket: str) -> List[date]:
+        """
+        Every bucket overlapping [date_from, date_to), so empty ones show.
+        """
+        starts = []
+        current = TelemetrySeriesAggregator.bucket_start(date_from, bucket)
+        while current < date_to:
+            starts.append(current)
+            if bucket == "month":
+                current = (current + timedelta(days=32)).replace(day=1)
+            else:
+                current += timedelta(days=7 if bucket == "week" else 1)
+        return starts
+
+    @staticmethod
+    def aggregate(
+        metric: str,
+        bucket: str,
+        date_from: date,
+        date_to: date,
+        records_by_tenant: Dict[tuple, Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Columnar series: one "buckets" axis, then per-bucket count (and
+        mean_seconds for time metrics) per tenant and in total. One pass
+        over the records; empty buckets have count 0 and mean null.
+        """
+        kind, point = SERIES_METRICS[metric]
+        timed = metric != "alerts"
+
+        starts = TelemetrySeriesAggregator.bucket_starts(date_from, date_to, bucket)
+        index = {start: i for i, start in enumerate(starts)}
+        bucket_of = TelemetrySeriesAggregator.bucket_start
+
+        total_count = [0] * len(starts)
+        total_seconds = [0.0] * len(starts)
+        tenants = []
+
+        for (tenant_id, tenant_name), records in records_by_tenant.items():
+            count = [0] * len(starts)
+            seconds = [0.0] * len(starts)
+
+            for record in records.get(kind) or []:
+                found = point(record)
+                if found is None:
+                    continue
+                ts, value = found
+                i = index.get(bucket_of(_parse_time(ts).date(), bucket))
+                if i is None:
+                    continue  # outside the window
+
+                count[i] += 1
+                if value is not None:
+                    seconds[i] += value
+
+            for i in range(len(starts)):
+                total_count[i] += count[i]
+                total_seconds[i] += seconds[i]
+
+            tenants.append({
+                "tenantId": tenant_id,
+                "tenantName": tenant_name,
+                **TelemetrySeriesAggregator._columns(count, seconds, timed),
+            })
+
+        return {
+            "metric": metric,
+            "bucket": bucket,
+            "buckets": [start.isoformat() for start in starts],
+            "total": TelemetrySeriesAggregator._columns(total_count, total_seconds, timed),
+            "tenants": tenants,
+        }
+
+    @staticmethod
+    def _columns(count: List[int], seconds: List[float], timed: bool) -> Dict[str, Any]:
+        columns: Dict[str, Any] = {"count": count}
+        if timed:
+            columns["mean_seconds"] = [
+                round(s / c, 1) if c else None for s, c in zip(seconds, count)
+            ]
+        return columns
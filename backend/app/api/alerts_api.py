@@ -3,8 +3,10 @@
 from typing import List, Dict, Any
 from datetime import date
 from app.api.base import BaseApiClient
+from app.core.data_cache import cached
 
 class AlertsApiClient(BaseApiClient):
+    @cached("alerts", until="date_to")
     async def list_alerts(
         self,
         api_host: str,
@@ -1,15 +1,31 @@
 # app/api/base.py
 
+import asyncio
 import logging
 import time
-import httpx
+import weakref
 from typing import Dict, Any
 from app.api.oauth_api import TokenManager
+from app.core.config import settings
 from app.core.http_client import create_async_http_client
+from app.core.work_meter import record_request
 from app.utils.retry import with_retries
 
 logger = logging.getLogger("app.api")
 
+# One cap on in-flight upstream requests per event loop, shared by every
+# client (and so every export job) on it
+_upstream_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def upstream_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _upstream_slots.get(loop)
+    if slots is None:
+        slots = _upstream_slots[loop] = asyncio.Semaphore(settings.UPSTREAM_MAX_IN_FLIGHT)
+    return slots
+
+
 class BaseApiClient:
     def __init__(self, token_manager: TokenManager):
         self.token_manager = token_manager
@@ -22,8 +38,10 @@ class BaseApiClient:
         headers["Authorization"] = f"Bearer {access_token}"
 
         start_time = time.time()
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url, headers=headers, params=params)
+        # Pooled client: keeps connections (and TLS sessions) alive between calls
+        async with upstream_slots():
+            response = await self.client.get(url, headers=headers, params=params, timeout=30)
+        record_request(headers.get("X-Tenant-ID"))  # work units of the running export
         duration = (time.time() - start_time) * 1000
         logger.info(f"GET {url} status={response.status_code} duration={duration:.2f}ms")
 
@@ -50,9 +68,13 @@ class BaseApiClient:
         headers["Authorization"] = f"Bearer {access_token}"
 
         start_time = time.time()
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.post(url, headers=headers, json=json)
+        async with upstream_slots():
+            response = await self.client.post(url, headers=headers, json=json, timeout=15)
+        record_request(headers.get("X-Tenant-ID"))
         duration = (time.time() - start_time) * 1000
         logger.info(f"POST {url} status={response.status_code} duration={duration:.2f}ms")
         response.raise_for_status()
         return response.json()
+
+    async def aclose(self):
+        await self.client.aclose()
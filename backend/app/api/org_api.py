@@ -1,16 +1,22 @@
 # app/api/org_api.py
 
+import time
 from typing import List, Dict, Any
 from app.api.base import BaseApiClient
 from app.api.oauth_api import TokenManager
+from app.core.data_cache import cached
 
 class OrgApiClient(BaseApiClient):
     """
     Org API client that leverages TokenManager cached org info.
     """
 
-    def __init__(self, token_manager: TokenManager):
+    def __init__(self, token_manager: TokenManager, tenant_cache_seconds: int = 0):
         super().__init__(token_manager)
+        # Tenant directory is re-used for this long (0 = always list)
+        self.tenant_cache_seconds = tenant_cache_seconds
+        self._tenants: List[Dict[str, Any]] | None = None
+        self._tenants_at = 0.0
 
     async def get_organization_id(self) -> str:
         """
@@ -23,6 +29,21 @@ class OrgApiClient(BaseApiClient):
         """
         List all tenants for the organization.
         """
+        if (
+            self._tenants is not None
+            and time.monotonic() - self._tenants_at < self.tenant_cache_seconds
+        ):
+            return list(self._tenants)
+
+        tenants = await self._fetch_tenants()
+
+        if self.tenant_cache_seconds:
+            self._tenants = tenants
+            self._tenants_at = time.monotonic()
+        return list(tenants)
+
+    @cached("tenants", cache_empty=False)
+    async def _fetch_tenants(self) -> List[Dict[str, Any]]:
         org_info = await self.token_manager.get_org_info()
         org_id = org_info["id"]
         global_url = org_info["apiHosts"]["global"]
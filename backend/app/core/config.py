@@ -12,6 +12,13 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_NAME: str
 
+    # Connection pool, one per process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800
+    DB_ECHO: bool = False  # log every SQL statement
+
     ENV: str = "development"
     PORT: int = 3001
     CLIENT_ID: str
@@ -21,6 +28,27 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
 
+    # Exports
+    EXPORT_CACHE_TTL_SECONDS: int = 6 * 60 * 60  # completed exports are re-used for 6h
+    EXPORT_FANOUT_SHARD_SIZE: int = 0  # tenants per sub-job for all-tenant exports, 0 = single job
+    EXPORT_PROGRESS_MIN_INTERVAL_SECONDS: float = 2.0  # min gap between progress row writes
+    EXPORT_TENANT_CACHE_SECONDS: int = 300  # worker re-uses the tenant directory for 5 min
+    EXPORT_WORKER_CONCURRENCY: int = 1  # export jobs one worker runs at once (AsyncExportWorker)
+    UPSTREAM_MAX_IN_FLIGHT: int = 20  # Sophos API requests in flight per process, all jobs together
+    EXPORT_LANE_FAST_MAX_SECONDS: int = 5 * 60  # estimated cost below this -> telemetry-high
+    EXPORT_LANE_BULK_MIN_SECONDS: int = 30 * 60  # estimated cost above this -> telemetry-low
+    EXPORT_QUEUE_AGING_SECONDS: int = 15 * 60  # waiting this long in a lane moves a job up one
+    EXPORT_QUEUE_REFRESH_SECONDS: int = 30  # how often queued jobs get position / ETA updates
+    EXPORT_DATA_CACHE_TTL_SECONDS: int = 16 * 60 * 60  # exports' tenant lists and closed-period alerts cached in Redis, 0 = off
+    EXPORT_LEASE_SECONDS: int = 30  # a running job whose worker stops renewing is requeued after this
+    EXPORT_LEASE_HEARTBEAT_SECONDS: int = 10  # how often workers renew their leases
+    EXPORT_LEASE_WATCH_SECONDS: int = 5  # how often the API looks for expired leases
+
+    # Live /telemetry responses (app/core/response_cache.py)
+    TELEMETRY_CACHE_FRESH_SECONDS: int = 60  # served without recomputing, 0 = cache off
+    TELEMETRY_CACHE_STALE_SECONDS: int = 15 * 60  # served while a background refresh runs
+    TELEMETRY_CACHE_MAX_ENTRIES: int = 512  # in-memory entries per API process
+
     # class Config:
     #     env_file = ".env"
     model_config = SettingsConfigDict(
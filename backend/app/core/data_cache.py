@@ -0,0 +1,147 @@
+# app/core/data_cache.py
+#
+# Redis cache for upstream (Sophos) list calls: tenants and alerts. Keys are
+# the call's arguments, so an export for the same period and tenant reads
+# what an earlier export or an off-peak pre-warm
+# (app/workers/scheduled_exports.py) already fetched.
+#
+# Cases and case detections are never cached: a case from a closed window
+# still changes afterwards (it gets assigned, resolved, gains detections),
+# and SLA / MTTA / MTTR / MTTD are computed from exactly those changes.
+#
+# Entries live for EXPORT_DATA_CACHE_TTL_SECONDS (0 turns the cache off).
+# The cache is best effort: any Redis error just means a fetch.
+#
+# Only export work uses it, opted in per task with use_data_cache():
+#
+#   "use"      exports: read, fetch and write on a miss
+#   "refresh"  force=true exports and pre-warms: always fetch, then write
+#
+# Everything else (the live /telemetry routes) always fetches. Alert windows
+# that reach into today are never cached, their alerts are still coming in.
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import weakref
+import zlib
+from contextvars import ContextVar
+from datetime import date, datetime, time, timezone
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.work_meter import record_cache_hit
+
+logger = logging.getLogger("app.data_cache")
+
+CACHE_PREFIX = "telemetry:cache"
+
+DATA_CACHE_MODES = ("use", "refresh")
+
+_mode: ContextVar[str | None] = ContextVar("data_cache_mode", default=None)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = weakref.WeakKeyDictionary()
+
+
+def _redis() -> aioredis.Redis:
+    # One client per event loop (API loop, worker runtime loop, asyncio.run)
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = aioredis.Redis(
+            host=os.getenv("REDIS_HOST", "redis"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            db=0,
+        )
+    return client
+
+
+def cache_key(kind: str, *parts) -> str:
+    digest = hashlib.sha1(
+        json.dumps(parts, default=str, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return f"{CACHE_PREFIX}:{kind}:{digest}"
+
+
+async def cache_get(key: str):
+    try:
+        raw = await _redis().get(key)
+    except Exception as exc:
+        logger.warning("Data cache read failed: %s", exc)
+        return None
+    if raw is None:
+        return None
+    return json.loads(zlib.decompress(raw))
+
+
+async def cache_set(key: str, value, ttl: int):
+    try:
+        raw = zlib.compress(json.dumps(value, default=str).encode("utf-8"))
+        await _redis().set(key, raw, ex=ttl)
+    except Exception as exc:
+        logger.warning("Data cache write failed: %s", exc)
+
+
+def use_data_cache(mode: str = "use"):
+    """
+    Let this task (and everything it spawns) use the data cache.
+    """
+    if mode not in DATA_CACHE_MODES:
+        raise ValueError(f"Unknown data cache mode {mode!r}")
+    return _mode.set(mode)
+
+
+def window_closed(end: date | datetime) -> bool:
+    """
+    True if a window ending at `end` (exclusive) ends by today's start (UTC).
+    """
+    if isinstance(end, datetime):
+        start_of_today = datetime.combine(datetime.now(timezone.utc).date(), time.min)
+        if end.tzinfo is not None:
+            start_of_today = start_of_today.replace(tzinfo=timezone.utc)
+        return end <= start_of_today
+    return end <= datetime.now(timezone.utc).date()
+
+
+def cached(kind: str, cache_empty: bool = True, until: str | None = None):
+    """
+    Cache an async API client method's result under its arguments.
+    cache_empty=False for calls that return [] on upstream errors.
+    until names the argument holding the window end: open windows skip
+    the cache.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            mode = _mode.get()
+            ttl = settings.EXPORT_DATA_CACHE_TTL_SECONDS
+            if mode is None or ttl <= 0:
+                return await func(self, *args, **kwargs)
+
+            if until is not None:
+                end = signature.bind(self, *args, **kwargs).arguments[until]
+                if not window_closed(end):
+                    return await func(self, *args, **kwargs)
+
+            key = cache_key(kind, args, kwargs)
+            if mode == "use":
+                value = await cache_get(key)
+                if value is not None:
+                    record_cache_hit()
+                    return value
+
+            value = await func(self, *args, **kwargs)
+            if value or cache_empty:
+                await cache_set(key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
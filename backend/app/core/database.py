@@ -1,4 +1,5 @@
 # app/core/database.py
+import time
 from typing import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -8,6 +9,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
@@ -21,13 +23,25 @@ DATABASE_URL = (
 # ---------------------------------
 # Engine / Session factory (CRITICAL)
 # ---------------------------------
+# One engine (and pool) per process. The API creates it in the lifespan,
+# workers around each job's event loop (asyncpg connections belong to the
+# loop that opened them). Both dispose of it on the way out. The long-lived
+# worker (app/workers/async_worker.py) keeps one loop, so one engine, for
+# its whole lifetime.
+_engine: AsyncEngine | None = None
+_SessionLocal: sessionmaker | None = None
+
+
 def create_engine_and_session() -> tuple[AsyncEngine, sessionmaker]:
     engine = create_async_engine(
         DATABASE_URL,
-        echo=True,               # turn on only when debugging
+        echo=settings.DB_ECHO,   # turn on only when debugging
         pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        poolclass=InstrumentedPool,
     )
 
     SessionLocal = sessionmaker(
@@ -38,11 +52,113 @@ def create_engine_and_session() -> tuple[AsyncEngine, sessionmaker]:
 
     return engine, SessionLocal
 
+
+def init_engine() -> AsyncEngine:
+    """
+    Create the process-wide engine if there isn't one yet.
+    """
+    global _engine, _SessionLocal
+
+    if _engine is None:
+        _engine, _SessionLocal = create_engine_and_session()
+        pool_stats.reset()
+    return _engine
+
+
+async def dispose_engine():
+    global _engine, _SessionLocal
+
+    if _engine is not None:
+        await _engine.dispose()
+    _engine, _SessionLocal = None, None
+
+
+def get_engine() -> AsyncEngine:
+    return init_engine()
+
+
+def get_sessionmaker() -> sessionmaker:
+    init_engine()
+    return _SessionLocal
+
+
+async def run_with_engine(coro):
+    """
+    Run a worker coroutine with the engine set up for its event loop and
+    disposed of afterwards, e.g. asyncio.run(run_with_engine(run_export(...))).
+    """
+    init_engine()
+    try:
+        return await coro
+    finally:
+        await dispose_engine()
+
+
+# -----------------------------
+# Pool metrics
+# -----------------------------
+class PoolStats:
+    """
+    Time spent waiting for a pooled connection, per session checkout.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.last_wait_ms = 0.0
+
+    def record(self, wait_ms: float):
+        self.checkouts += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.last_wait_ms = wait_ms
+
+    def snapshot(self) -> dict:
+        pool = _engine.pool if _engine is not None else None
+        size = pool.size() if pool else settings.DB_POOL_SIZE
+        checked_out = pool.checkedout() if pool else 0
+        capacity = size + settings.DB_MAX_OVERFLOW
+
+        return {
+            "pool_size": size,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin() if pool else 0,
+            "overflow": pool.overflow() if pool else 0,
+            "utilisation": round(checked_out / capacity, 3) if capacity else 0,
+            "checkouts": self.checkouts,
+            "avg_checkout_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0,
+            "max_checkout_ms": round(self.max_wait_ms, 3),
+            "last_checkout_ms": round(self.last_wait_ms, 3),
+        }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited (including
+    opening a new connection when the pool has none idle).
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.record((time.perf_counter() - start) * 1000)
+
+
 # -----------------------------
 # FastAPI dependency
 # -----------------------------
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    engine, SessionLocal = create_engine_and_session()
+    SessionLocal = get_sessionmaker()
 
     async with SessionLocal() as session:
         yield session
@@ -53,7 +169,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 # -----------------------------
 @asynccontextmanager
 async def get_worker_db() -> AsyncGenerator[AsyncSession, None]:
-    engine, SessionLocal = create_engine_and_session()
+    SessionLocal = get_sessionmaker()
 
     async with SessionLocal() as session:
         yield session
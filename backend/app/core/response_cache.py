@@ -0,0 +1,142 @@
+# app/core/response_cache.py
+#
+# Stale-while-revalidate cache for the live /telemetry endpoints.
+#
+# Responses are cached per metric / date range / tenant, in memory (LRU,
+# per API process) and in Redis (shared between processes, survives
+# restarts). An entry is:
+#
+#   fresh  for TELEMETRY_CACHE_FRESH_SECONDS -> served as is
+#   stale  until TELEMETRY_CACHE_STALE_SECONDS -> served as is, and one
+#          background refresh is started
+#   gone   after that -> the request waits for a recompute
+#
+# Recomputes are single-flight: concurrent requests for the same key share
+# one task (one Sophos fan-out), and a client hanging up doesn't cancel it.
+# TELEMETRY_CACHE_FRESH_SECONDS=0 turns the cache off.
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.core.data_cache import cache_get, cache_key, cache_set
+
+logger = logging.getLogger("app.response_cache")
+
+
+class ResponseCache:
+    """
+    In-memory + Redis SWR cache with single-flight recomputes.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(
+        self,
+        metric: str,
+        parts: Tuple,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, str]:
+        """
+        Cached value for (metric, *parts) and how it was served:
+        "hit", "stale", "miss" or "off".
+        """
+        if settings.TELEMETRY_CACHE_FRESH_SECONDS <= 0:
+            return jsonable_encoder(await compute()), "off"
+
+        found = await self.lookup(metric, parts, compute)
+        if found is not None:
+            return found
+
+        # shield: the recompute is shared, one caller going away mustn't stop it
+        key = self._key(metric, parts)
+        value = await asyncio.shield(self._refresh(key, metric, compute))
+        return value, "miss"
+
+    async def lookup(
+        self,
+        metric: str,
+        parts: Tuple,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, str] | None:
+        """
+        A fresh or stale value without waiting for a recompute (a stale one
+        starts the background refresh). None on a miss or with the cache off.
+        """
+        fresh_for = settings.TELEMETRY_CACHE_FRESH_SECONDS
+        if fresh_for <= 0:
+            return None
+
+        key = self._key(metric, parts)
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = await cache_get(key)
+            if entry is not None:
+                self._remember(key, entry)
+        else:
+            self._memory.move_to_end(key)
+
+        age = time.time() - entry["stored_at"] if entry else None
+        if age is not None and age < fresh_for:
+            return entry["value"], "hit"
+        if age is not None and age < settings.TELEMETRY_CACHE_STALE_SECONDS:
+            self._refresh(key, metric, compute)
+            return entry["value"], "stale"
+        return None
+
+    async def store(self, metric: str, parts: Tuple, value: Any):
+        """
+        Cache a value computed elsewhere (e.g. a complete deadline-bounded run).
+        """
+        if settings.TELEMETRY_CACHE_FRESH_SECONDS <= 0:
+            return
+        key = self._key(metric, parts)
+        entry = {"value": jsonable_encoder(value), "stored_at": time.time()}
+        self._remember(key, entry)
+        await cache_set(key, entry, settings.TELEMETRY_CACHE_STALE_SECONDS)
+
+    def _key(self, metric: str, parts: Tuple) -> str:
+        return cache_key(f"{self.namespace}:{metric}", *parts)
+
+    def _refresh(self, key: str, metric: str, compute) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(self._recompute(key, metric, compute))
+            # Background refreshes may have nobody awaiting them; already logged
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _recompute(self, key: str, metric: str, compute):
+        started = time.perf_counter()
+        try:
+            value = jsonable_encoder(await compute())
+            entry = {"value": value, "stored_at": time.time()}
+            self._remember(key, entry)
+            await cache_set(key, entry, settings.TELEMETRY_CACHE_STALE_SECONDS)
+            logger.info(
+                "Recomputed %s:%s in %.0f ms",
+                self.namespace,
+                metric,
+                (time.perf_counter() - started) * 1000,
+            )
+            return value
+        except Exception:
+            # Waiting callers get the error; stale callers already got a value
+            logger.exception("Recompute of %s:%s failed", self.namespace, metric)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > settings.TELEMETRY_CACHE_MAX_ENTRIES:
+            self._memory.popitem(last=False)
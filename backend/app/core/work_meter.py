@@ -0,0 +1,143 @@
+# app/core/work_meter.py
+#
+# Counts the work one export actually does: upstream requests per stage and
+# tenant (alert pages, case pages, detection calls, ...) plus tenant sheets
+# written, and how long each stage took.
+#
+# The meter for the running export lives in a context variable, so the API
+# clients can count requests without being passed anything: every task an
+# export spawns (asyncio.gather, run_cancellable) inherits it, and exports
+# running side by side on one worker loop each see their own.
+#
+# Given the estimate the job started with (app/services/export_estimator.py)
+# it turns completed units into a real percent and ETA.
+#
+# The xlsx build records from a worker thread (export_service._build_workbook)
+# while the loop's ticker reads snapshots, so every method holds the lock.
+
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Any, Dict
+
+_current_meter: ContextVar["WorkMeter | None"] = ContextVar("work_meter", default=None)
+
+# A stage never reports more than this share done until it is finished
+# (volumes can be higher than predicted)
+STAGE_CAP = 0.95
+
+
+class WorkMeter:
+    """
+    Work units done by one export, per stage and tenant.
+    """
+
+    def __init__(self, estimate: Dict[str, Any] | None = None):
+        self.estimate = estimate or {"stages": {}, "total_seconds": 0}
+        self.started = time.monotonic()
+
+        self.stage: str | None = None
+        self.stage_label: str | None = None
+        self._stage_started = 0.0
+        self.finished_stages: list[str] = []
+
+        self.units: Counter = Counter()  # stage -> units
+        self.tenant_units: Dict[str, Counter] = defaultdict(Counter)  # tenant -> stage -> units
+        self.stage_seconds: Dict[str, float] = {}
+        self.cache_hits = 0  # calls served by app/core/data_cache.py
+
+        self._last_percent = 0
+        self._lock = threading.RLock()
+
+    # -----------------------------
+    # Recording
+    # -----------------------------
+    def begin_stage(self, stage: str, label: str | None = None):
+        with self._lock:
+            self.end_stage()
+            self.stage = stage
+            self.stage_label = label or stage
+            self._stage_started = time.monotonic()
+
+    def end_stage(self):
+        with self._lock:
+            if self.stage is None:
+                return
+            self.stage_seconds[self.stage] = time.monotonic() - self._stage_started
+            self.finished_stages.append(self.stage)
+            self.stage = None
+
+    def record(self, tenant_id: str | None = None, units: int = 1):
+        with self._lock:
+            if self.stage is None:
+                return
+            self.units[self.stage] += units
+            if tenant_id:
+                self.tenant_units[tenant_id][self.stage] += units
+
+    def record_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    # -----------------------------
+    # Progress
+    # -----------------------------
+    def progress(self) -> Dict[str, Any]:
+        """
+        Percent done (weighted by predicted stage time) and ETA in seconds.
+        """
+        stages = self.estimate["stages"]
+        total = sum(s["seconds"] for s in stages.values()) or 1.0
+
+        with self._lock:
+            done = sum(stages[s]["seconds"] for s in self.finished_stages if s in stages)
+            if self.stage in stages:
+                planned = stages[self.stage]
+                share = self.units[self.stage] / planned["units"] if planned["units"] else 0
+                done += planned["seconds"] * min(share, STAGE_CAP)
+
+            # Never go backwards, never claim 100 before the job says so
+            percent = min(max(int(100 * done / total), self._last_percent), 99)
+            self._last_percent = percent
+            units_done = sum(self.units.values())
+
+        elapsed = time.monotonic() - self.started
+        if percent >= 5:
+            eta = elapsed * (100 - percent) / percent
+        else:
+            eta = max(self.estimate["total_seconds"] - elapsed, 0)
+
+        return {
+            "percent": percent,
+            "eta_seconds": int(eta),
+            "units_done": units_done,
+            "units_expected": int(sum(s["units"] for s in stages.values())),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"stage": self.stage_label, **self.progress()}
+
+
+def activate_meter(meter: WorkMeter):
+    """
+    Make meter the current one for this task and everything it spawns.
+    """
+    return _current_meter.set(meter)
+
+
+def current_meter() -> WorkMeter | None:
+    return _current_meter.get()
+
+
+def record_request(tenant_id: str | None = None):
+    meter = _current_meter.get()
+    if meter is not None:
+        meter.record(tenant_id)
+
+
+def record_cache_hit():
+    meter = _current_meter.get()
+    if meter is not None:
+        meter.record_cache_hit()
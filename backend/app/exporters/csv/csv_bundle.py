@@ -0,0 +1,115 @@
+# app/exporters/csv/csv_bundle.py
+
+import csv
+import io
+import zipfile
+from typing import Any, Callable, Iterable, List
+
+from app.aggregator.case_aggregator import CaseTelemetryAggregator
+from app.exporters.dataset import ExportDataset, TenantMetrics
+
+TENANT_COLUMNS = ["tenant_id", "tenant_name"]
+
+
+def _counter_rows(key: str) -> Callable[[TenantMetrics], Iterable[List[Any]]]:
+    def rows(tenant: TenantMetrics):
+        for name, count in tenant.alerts[key].items():
+            yield [name, count]
+    return rows
+
+
+def _sla_rows(tenant: TenantMetrics):
+    metrics = tenant.sla["sla_metrics"]
+    yield [
+        *(metrics.get(bucket, 0) for bucket in CaseTelemetryAggregator.SLA_BUCKETS),
+        tenant.sla["total_incidents"],
+    ]
+
+
+def _endpoint_rows(tenant: TenantMetrics):
+    for detail in tenant.endpoint.get("details", []):
+        yield [
+            detail.get("type"),
+            detail.get("notFullyProtected", 0),
+            detail.get("tamperProtectionDisabled", 0),
+        ]
+
+
+# (file name, metric columns, per-tenant row generator)
+TENANT_TABLES = [
+    ("alerts_by_severity.csv", ["severity", "incidents"], _counter_rows("severity")),
+    ("alerts_by_category.csv", ["category", "incidents"], _counter_rows("category")),
+    ("alerts_by_month.csv", ["month", "incidents"], _counter_rows("monthly")),
+    (
+        "sla.csv",
+        [*CaseTelemetryAggregator.SLA_BUCKETS, "total_incidents"],
+        _sla_rows,
+    ),
+    (
+        "mttd.csv",
+        ["mttd_seconds", "total_detections"],
+        lambda t: [[t.mttd["mttd_seconds"], t.mttd["total_detections"]]],
+    ),
+    (
+        "mtta.csv",
+        ["mtta_seconds", "total_cases"],
+        lambda t: [[t.mtta["mtta_seconds"], t.mtta["total_cases"]]],
+    ),
+    (
+        "mttr.csv",
+        ["mttr_seconds", "total_cases"],
+        lambda t: [[t.mttr["mttr_seconds"], t.mttr["total_cases"]]],
+    ),
+    (
+        "endpoint_health.csv",
+        ["type", "not_fully_protected", "tamper_protection_disabled"],
+        _endpoint_rows,
+    ),
+]
+
+
+def _all_tenants_rows(dataset: ExportDataset):
+    for key, value in dataset.alerts["total_incident_severity"].items():
+        yield ["incidents_per_severity", key, value]
+    for key, value in dataset.alerts["total_incident_category"].items():
+        yield ["incidents_per_category", key, value]
+    for key, value in dataset.alerts["total_tenant_monthly"].items():
+        yield ["incidents_per_month", key, value]
+    yield ["incidents", "total", dataset.alerts["total_incident_count"]]
+
+    for key, value in dataset.sla["total_incident_sla_metrics"].items():
+        yield ["sla", key, value]
+    yield ["sla", "total_incidents", dataset.sla["total_incident_count"]]
+
+    yield ["mttd", "mttd_seconds", dataset.mttd["all_tenants_mttd_seconds"]]
+    yield ["mttd", "total_detections", dataset.mttd["total_detections"]]
+    yield ["mtta", "mtta_seconds", dataset.mtta["mtta_seconds"]]
+    yield ["mtta", "total_cases", dataset.mtta["total_cases"]]
+    yield ["mttr", "mttr_seconds", dataset.mttr["mttr_seconds"]]
+    yield ["mttr", "total_cases", dataset.mttr["total_cases"]]
+
+    for key, value in dataset.endpoint["global"].items():
+        yield ["endpoint_health", key, value]
+
+
+def write_csv_bundle(dataset: ExportDataset, file_path: str, include_totals: bool = True):
+    """
+    Write a zip with one CSV per metric. Each member is streamed row by row
+    straight into the (deflated) archive, nothing is built up in memory.
+    """
+    with zipfile.ZipFile(file_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        if include_totals:
+            with zf.open("all_tenants.csv", "w") as raw:
+                with io.TextIOWrapper(raw, encoding="utf-8", newline="") as fh:
+                    writer = csv.writer(fh)
+                    writer.writerow(["metric", "key", "value"])
+                    writer.writerows(_all_tenants_rows(dataset))
+
+        for file_name, columns, tenant_rows in TENANT_TABLES:
+            with zf.open(file_name, "w") as raw:
+                with io.TextIOWrapper(raw, encoding="utf-8", newline="") as fh:
+                    writer = csv.writer(fh)
+                    writer.writerow([*TENANT_COLUMNS, *columns])
+                    for tenant in dataset.tenants():
+                        for row in tenant_rows(tenant):
+                            writer.writerow([tenant.tenant_id, tenant.tenant_name, *row])
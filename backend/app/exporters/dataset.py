@@ -0,0 +1,147 @@
+# app/exporters/dataset.py
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List
+
+
+@dataclass
+class TenantMetrics:
+    """
+    Every metric for a single tenant, as produced by the aggregators.
+    """
+    tenant_id: str
+    tenant_name: str
+    alerts: Dict[str, Any]
+    sla: Dict[str, Any]
+    mttd: Dict[str, Any]
+    mtta: Dict[str, Any]
+    mttr: Dict[str, Any]
+    endpoint: Dict[str, Any]
+
+
+def _index_by_tenant(items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {item["tenantId"]: item for item in items}
+
+
+@dataclass
+class ExportDataset:
+    """
+    Aggregator results for one export, indexed by tenant ID so that each
+    tenant's metrics are an O(1) lookup instead of a scan per metric.
+    """
+    alerts: Dict[str, Any]
+    sla: Dict[str, Any]
+    mttd: Dict[str, Any]
+    mtta: Dict[str, Any]
+    mttr: Dict[str, Any]
+    endpoint: Dict[str, Any]
+
+    _sla_by_tenant: Dict[str, Dict[str, Any]] = field(init=False, repr=False)
+    _mttd_by_tenant: Dict[str, Dict[str, Any]] = field(init=False, repr=False)
+    _mtta_by_tenant: Dict[str, Dict[str, Any]] = field(init=False, repr=False)
+    _mttr_by_tenant: Dict[str, Dict[str, Any]] = field(init=False, repr=False)
+    _endpoint_by_tenant: Dict[str, Dict[str, Any]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._sla_by_tenant = _index_by_tenant(self.sla["incidents"])
+        self._mttd_by_tenant = _index_by_tenant(self.mttd["incidents"])
+        self._mtta_by_tenant = _index_by_tenant(self.mtta["incidents"])
+        self._mttr_by_tenant = _index_by_tenant(self.mttr["incidents"])
+        self._endpoint_by_tenant = _index_by_tenant(self.endpoint["tenants"])
+
+    def __len__(self) -> int:
+        return len(self.alerts["incidents"])
+
+    def tenants(self) -> Iterator[TenantMetrics]:
+        """
+        Yields tenants in the order the alerts aggregator returned them.
+        """
+        for tenant_alerts in self.alerts["incidents"]:
+            tenant_id = tenant_alerts["tenantId"]
+            yield TenantMetrics(
+                tenant_id=tenant_id,
+                tenant_name=tenant_alerts["tenantName"],
+                alerts=tenant_alerts,
+                sla=self._sla_by_tenant[tenant_id],
+                mttd=self._mttd_by_tenant[tenant_id],
+                mtta=self._mtta_by_tenant[tenant_id],
+                mttr=self._mttr_by_tenant[tenant_id],
+                endpoint=self._endpoint_by_tenant[tenant_id],
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Plain aggregator results, e.g. for a fan-out shard's partial file.
+        """
+        return {
+            "alerts": self.alerts,
+            "sla": self.sla,
+            "mttd": self.mttd,
+            "mtta": self.mtta,
+            "mttr": self.mttr,
+            "endpoint": self.endpoint,
+        }
+
+
+def _sum_counts(parts: List[Dict[str, Any]], key: str) -> Dict[str, int]:
+    total = Counter()
+    for part in parts:
+        total.update(part[key])
+    return dict(total)
+
+
+def _weighted_mean(parts: List[Dict[str, Any]], mean_key: str, count_key: str) -> float:
+    # Every aggregator mean is total_seconds / count, so weighting each
+    # shard's mean by its count gives back the exact all-tenant mean
+    count = sum(part[count_key] for part in parts)
+    if count == 0:
+        return 0
+    return sum(part[mean_key] * part[count_key] for part in parts) / count
+
+
+def merge_datasets(parts: List[ExportDataset]) -> ExportDataset:
+    """
+    Combine datasets collected for disjoint tenant subsets into one, as if
+    the aggregators had run over every tenant at once.
+    """
+    alerts = [p.alerts for p in parts]
+    sla = [p.sla for p in parts]
+    mttd = [p.mttd for p in parts]
+    mtta = [p.mtta for p in parts]
+    mttr = [p.mttr for p in parts]
+    endpoint = [p.endpoint for p in parts]
+
+    return ExportDataset(
+        alerts={
+            "incidents": [i for a in alerts for i in a["incidents"]],
+            "total_incident_count": sum(a["total_incident_count"] for a in alerts),
+            "total_incident_severity": _sum_counts(alerts, "total_incident_severity"),
+            "total_incident_category": _sum_counts(alerts, "total_incident_category"),
+            "total_tenant_monthly": _sum_counts(alerts, "total_tenant_monthly"),
+        },
+        sla={
+            "incidents": [i for s in sla for i in s["incidents"]],
+            "total_incident_count": sum(s["total_incident_count"] for s in sla),
+            "total_incident_sla_metrics": _sum_counts(sla, "total_incident_sla_metrics"),
+        },
+        mttd={
+            "incidents": [i for m in mttd for i in m["incidents"]],
+            "all_tenants_mttd_seconds": _weighted_mean(mttd, "all_tenants_mttd_seconds", "total_detections"),
+            "total_detections": sum(m["total_detections"] for m in mttd),
+        },
+        mtta={
+            "incidents": [i for m in mtta for i in m["incidents"]],
+            "mtta_seconds": _weighted_mean(mtta, "mtta_seconds", "total_cases"),
+            "total_cases": sum(m["total_cases"] for m in mtta),
+        },
+        mttr={
+            "incidents": [i for m in mttr for i in m["incidents"]],
+            "mttr_seconds": _weighted_mean(mttr, "mttr_seconds", "total_cases"),
+            "total_cases": sum(m["total_cases"] for m in mttr),
+        },
+        endpoint={
+            "tenants": [t for e in endpoint for t in e["tenants"]],
+            "global": _sum_counts(endpoint, "global"),
+        },
+    )
@@ -1,50 +1,46 @@
 # app/exporters/excel/all_tenants_sheet.py
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
+from app.exporters.dataset import ExportDataset
+from app.exporters.excel.writer import SheetWriter
+from app.utils.helper import SheetTitleRegistry
 
 def build_all_tenants_sheet(
     wb: Workbook,
-    alerts,
-    sla,
-    # mttd,
-    mttd2,
-    mtta,
-    mttr,
-    endpoint,
+    dataset: ExportDataset,
+    titles: SheetTitleRegistry,
 ):
-    ws = wb.create_sheet("All Tenants")
+    alerts = dataset.alerts
+    sla = dataset.sla
+    # mttd = dataset.mttd
+    mttd2 = dataset.mttd
+    mtta = dataset.mtta
+    mttr = dataset.mttr
+    endpoint = dataset.endpoint
+
+    ws = SheetWriter(wb, titles.claim("All Tenants"))
 
     # ALERTS
     ws.append(["Number of Security Incidents"])
 
-    current_row = 2  # Start after title
-
-    def add_horizontal_section(ws, label, data, start_row):
+    def add_horizontal_section(ws, label, data):
         """
         label: str -> section name, goes in column A
         data: dict -> keys and values to show horizontally
-        start_row: int -> row to start writing
         """
-        # Section label in column A of the first row
-        ws.cell(row=start_row, column=1, value=label)
-        
-        # Keys in columns B onward (same row as label)
-        for col_idx, key in enumerate(data.keys(), start=2):
-            ws.cell(row=start_row, column=col_idx, value=key.title() if label=="Incidents per Severity" else key)
-        
+        # Section label in column A, keys in columns B onward (same row)
+        ws.append([
+            label,
+            *(key.title() if label=="Incidents per Severity" else key for key in data.keys()),
+        ])
+
         # Values row (row below keys)
-        values_row = start_row + 1
-        for col_idx, value in enumerate(data.values(), start=2):
-            ws.cell(row=values_row, column=col_idx, value=value)
-        
-        # Return the next row to start for next section
-        return values_row + 1
+        ws.append([None, *data.values()])
 
     # Add sections
-    current_row = add_horizontal_section(ws, "Incidents per Severity", alerts["total_incident_severity"], current_row)
-    current_row = add_horizontal_section(ws, "Incidents per Category", alerts["total_incident_category"], current_row)
-    current_row = add_horizontal_section(ws, "Incidents per Month", alerts["total_tenant_monthly"], current_row)
+    add_horizontal_section(ws, "Incidents per Severity", alerts["total_incident_severity"])
+    add_horizontal_section(ws, "Incidents per Category", alerts["total_incident_category"])
+    add_horizontal_section(ws, "Incidents per Month", alerts["total_tenant_monthly"])
     # END ALERTS
 
     # SLA
@@ -91,19 +87,5 @@ def build_all_tenants_sheet(
         global_data["tamperProtectionDisabled"],
     ])
 
-    # Optional: bold the section labels
-    # for row in ws.iter_rows(min_row=2, max_row=30, min_col=1, max_col=1):
-    #     for cell in row:
-    #         cell.font = Font(bold=True)
-    #         cell.alignment = Alignment(vertical="center")
-    for cell in ws["A"]:
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(vertical="center")
-
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter  # Get the column name, e.g., 'A'
-        for cell in col:
-            if cell.value:
-                max_length = max(max_length, len(str(cell.value)))
-        ws.column_dimensions[column].width = max_length + 2  # extra padding
+    # Column A is styled bold and widths are set when the sheet is flushed
+    ws.flush()
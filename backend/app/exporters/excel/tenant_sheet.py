@@ -2,33 +2,27 @@
 
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment
-from app.utils.helper import unique_sheet_title
+from app.exporters.dataset import TenantMetrics
+from app.exporters.excel.writer import SheetWriter
+from app.utils.helper import SheetTitleRegistry
 
 def build_tenant_sheet(
     wb: Workbook,
-    tenant,
-    alerts,
-    sla,
-    # mttd,
-    mttd2,
-    mtta,
-    mttr,
-    endpoint,
+    tenant: TenantMetrics,
+    titles: SheetTitleRegistry,
 ):
-    ws = wb.create_sheet(
-        unique_sheet_title(wb, tenant["tenantName"])
+    ws = SheetWriter(
+        wb, titles.claim(tenant.tenant_name)
     )
 
     # ws.append(["Tenant", tenant["tenantName"]])
     # ws.append([])
 
-    tenant_alerts = next(
-        i for i in alerts["incidents"] if i["tenantId"] == tenant["tenantId"]
-    )
+    tenant_alerts = tenant.alerts
     # write_incidents_sheet(ws, tenant_alerts)
 
-    current_row = 1  # Start from row 1
-    ws.append(["Number of Security Incidents"])
+    # Title row was always overwritten by the first section, sections start at row 1
+    # ws.append(["Number of Security Incidents"])
     # Title
     # ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=5)
     # ws.cell(row=current_row, column=1, value="Number of Security Incidents")
@@ -36,36 +30,27 @@ def build_tenant_sheet(
     # ws["A1"].alignment = Alignment(horizontal="center")
     # current_row += 1  # Next row
 
-    def add_horizontal_section(ws, label, data, start_row):
+    def add_horizontal_section(ws, label, data):
         """
         label: str -> section name, goes in column A
         data: dict -> keys and values to show horizontally
-        start_row: int -> row to start writing
         """
-        # Section label in column A of the first row
-        ws.cell(row=start_row, column=1, value=label)
-        
-        # Keys in columns B onward (same row as label)
-        for col_idx, key in enumerate(data.keys(), start=2):
-            ws.cell(row=start_row, column=col_idx, value=key.title() if label=="Incidents per Severity" else key)
-        
+        # Section label in column A, keys in columns B onward (same row)
+        ws.append([
+            label,
+            *(key.title() if label=="Incidents per Severity" else key for key in data.keys()),
+        ])
+
         # Values row (row below keys)
-        values_row = start_row + 1
-        for col_idx, value in enumerate(data.values(), start=2):
-            ws.cell(row=values_row, column=col_idx, value=value)
-        
-        # Return the next row to start for next section
-        return values_row + 1
+        ws.append([None, *data.values()])
 
     # Add sections
-    current_row = add_horizontal_section(ws, "Incidents per Severity", tenant_alerts["severity"], current_row)
-    current_row = add_horizontal_section(ws, "Incidents per Category", tenant_alerts["category"], current_row)
-    current_row = add_horizontal_section(ws, "Incidents per Month", tenant_alerts["monthly"], current_row)
+    add_horizontal_section(ws, "Incidents per Severity", tenant_alerts["severity"])
+    add_horizontal_section(ws, "Incidents per Category", tenant_alerts["category"])
+    add_horizontal_section(ws, "Incidents per Month", tenant_alerts["monthly"])
     # END ALERTS
 
-    tenant_sla = next(
-        i for i in sla["incidents"] if i["tenantId"] == tenant["tenantId"]
-    )
+    tenant_sla = tenant.sla
 
     # SLA
     ws.append([])
@@ -83,31 +68,23 @@ def build_tenant_sheet(
     # ws.append(["Mean Time to Detect (seconds)", mttd_cases["mttd_seconds"]])
     # ws.append(["Total Detections", mttd_cases["total_detections"]])
 
-    mttd_cases2 = next(
-        i for i in mttd2["incidents"] if i["tenantId"] == tenant["tenantId"]
-    )
+    mttd_cases2 = tenant.mttd
     ws.append([])
     ws.append(["Mean Time to Detect (seconds)", mttd_cases2["mttd_seconds"]])
     ws.append(["Total Detections", mttd_cases2["total_detections"]])
 
-    mtta_cases = next(
-        i for i in mtta["incidents"] if i["tenantId"] == tenant["tenantId"]
-    )
+    mtta_cases = tenant.mtta
     ws.append([])
     ws.append(["Mean Time to Acknowledge (seconds)", mtta_cases["mtta_seconds"]])
     ws.append(["Total Detections", mtta_cases["total_cases"]])
 
-    mttr_cases = next(
-        i for i in mttr["incidents"] if i["tenantId"] == tenant["tenantId"]
-    )
+    mttr_cases = tenant.mttr
     ws.append([])
     ws.append(["Mean Time to Recover (seconds)", mttr_cases["mttr_seconds"]])
     ws.append(["Cases", mttr_cases["total_cases"]])
 
     ws.append([])
-    endpoint_data = next(
-        i for i in endpoint["tenants"] if i["tenantId"] == tenant["tenantId"]
-    )
+    endpoint_data = tenant.endpoint
     # ws.append(["Endpoints Not Protected"])
 
     # ep = endpoint["by_tenant"][tenant["tenantId"]]
@@ -127,19 +104,8 @@ def build_tenant_sheet(
         #     endpoint_data.get("tamperProtectionDisabled", 0),
         # ])
     
-    # Set Col A to bold
-    for cell in ws["A"]:
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(vertical="center")
-
-    # Set column widths
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter  # Get the column name, e.g., 'A'
-        for cell in col:
-            if cell.value:
-                max_length = max(max_length, len(str(cell.value)))
-        ws.column_dimensions[column].width = max_length + 2  # extra padding
+    # Col A bold and column widths are applied when the sheet is flushed
+    ws.flush()
 
 
 def write_incidents_sheet(ws, tenant_alerts):
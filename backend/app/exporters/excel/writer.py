@@ -0,0 +1,69 @@
+# app/exporters/excel/writer.py
+
+from typing import Any, Dict, Iterable, List
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle
+from openpyxl.utils import get_column_letter
+
+LABEL_STYLE = "section_label"
+WIDTH_PADDING = 2
+
+
+def create_streaming_workbook() -> Workbook:
+    """
+    Write-only workbook: every sheet is serialised to a temp file as soon
+    as it is closed, so memory does not grow with the number of sheets.
+    """
+    wb = Workbook(write_only=True)
+
+    # Shared style for column A labels (registered once, referenced by name)
+    wb.add_named_style(
+        NamedStyle(
+            name=LABEL_STYLE,
+            font=Font(bold=True),
+            alignment=Alignment(vertical="center"),
+        )
+    )
+    return wb
+
+
+class SheetWriter:
+    """
+    Collects the rows of one sheet and tracks column widths as they are
+    appended. Write-only sheets need their column widths before the first
+    row is written, so rows are held until flush() streams them out.
+    """
+
+    def __init__(self, wb: Workbook, title: str):
+        self.wb = wb
+        self.title = title
+        self.rows: List[List[Any]] = []
+        self.widths: Dict[int, int] = {}
+
+    def append(self, row: Iterable[Any]):
+        row = list(row)
+        for col_idx, value in enumerate(row, start=1):
+            length = len(str(value)) if value else 0
+            if length >= self.widths.get(col_idx, 0):
+                self.widths[col_idx] = length
+        self.rows.append(row)
+
+    def flush(self):
+        ws = self.wb.create_sheet(self.title)
+
+        for col_idx, width in self.widths.items():
+            ws.column_dimensions[get_column_letter(col_idx)].width = width + WIDTH_PADDING
+
+        for row in self.rows:
+            if row and row[0] is not None:
+                # Column A holds the section labels
+                label = WriteOnlyCell(ws, value=row[0])
+                label.style = LABEL_STYLE
+                row = [label, *row[1:]]
+            ws.append(row)
+
+        # Write the sheet out now instead of at wb.save()
+        ws.close()
+        self.rows = []
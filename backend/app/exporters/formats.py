@@ -0,0 +1,23 @@
+# app/exporters/formats.py
+
+from typing import NamedTuple
+
+
+class ExportFormat(NamedTuple):
+    extension: str
+    media_type: str
+
+
+DEFAULT_EXPORT_FORMAT = "xlsx"
+
+EXPORT_FORMATS = {
+    # Excel workbook: All Tenants sheet + one sheet per tenant
+    "xlsx": ExportFormat(
+        extension="xlsx",
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+    # Zip with one CSV file per metric
+    "csv": ExportFormat(extension="zip", media_type="application/zip"),
+    # One JSON record per tenant, followed by an all-tenants totals record
+    "ndjson": ExportFormat(extension="ndjson", media_type="application/x-ndjson"),
+}
@@ -0,0 +1,79 @@
+# app/exporters/ndjson/ndjson_export.py
+
+import json
+
+from app.exporters.dataset import ExportDataset
+
+
+def write_ndjson(dataset: ExportDataset, file_path: str, include_totals: bool = True):
+    """
+    One JSON record per line: a "tenant" record for every tenant, followed
+    by a single "all_tenants" record with the roll-ups. Records are written
+    as they are produced so memory stays flat with tenant count.
+    """
+    with open(file_path, "w", encoding="utf-8") as fh:
+        for tenant in dataset.tenants():
+            record = {
+                "type": "tenant",
+                "tenantId": tenant.tenant_id,
+                "tenantName": tenant.tenant_name,
+                "incidents": {
+                    "severity": tenant.alerts["severity"],
+                    "category": tenant.alerts["category"],
+                    "monthly": tenant.alerts["monthly"],
+                    "total_incidents": tenant.alerts["total_incidents"],
+                },
+                "sla": {
+                    "sla_metrics": tenant.sla["sla_metrics"],
+                    "total_incidents": tenant.sla["total_incidents"],
+                },
+                "mttd": {
+                    "mttd_seconds": tenant.mttd["mttd_seconds"],
+                    "total_detections": tenant.mttd["total_detections"],
+                },
+                "mtta": {
+                    "mtta_seconds": tenant.mtta["mtta_seconds"],
+                    "total_cases": tenant.mtta["total_cases"],
+                },
+                "mttr": {
+                    "mttr_seconds": tenant.mttr["mttr_seconds"],
+                    "total_cases": tenant.mttr["total_cases"],
+                },
+                "endpoint_health": {
+                    "notFullyProtected": tenant.endpoint["notFullyProtected"],
+                    "tamperProtectionDisabled": tenant.endpoint["tamperProtectionDisabled"],
+                    "details": tenant.endpoint.get("details", []),
+                },
+            }
+            fh.write(json.dumps(record, default=str))
+            fh.write("\n")
+
+        if include_totals:
+            totals = {
+                "type": "all_tenants",
+                "incidents": {
+                    "severity": dataset.alerts["total_incident_severity"],
+                    "category": dataset.alerts["total_incident_category"],
+                    "monthly": dataset.alerts["total_tenant_monthly"],
+                    "total_incidents": dataset.alerts["total_incident_count"],
+                },
+                "sla": {
+                    "sla_metrics": dataset.sla["total_incident_sla_metrics"],
+                    "total_incidents": dataset.sla["total_incident_count"],
+                },
+                "mttd": {
+                    "mttd_seconds": dataset.mttd["all_tenants_mttd_seconds"],
+                    "total_detections": dataset.mttd["total_detections"],
+                },
+                "mtta": {
+                    "mtta_seconds": dataset.mtta["mtta_seconds"],
+                    "total_cases": dataset.mtta["total_cases"],
+                },
+                "mttr": {
+                    "mttr_seconds": dataset.mttr["mttr_seconds"],
+                    "total_cases": dataset.mttr["total_cases"],
+                },
+                "endpoint_health": dataset.endpoint["global"],
+            }
+            fh.write(json.dumps(totals, default=str))
+            fh.write("\n")
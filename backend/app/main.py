@@ -12,10 +12,14 @@ import sys
 
 from fastapi.responses import JSONResponse
 from app.core.config import settings
+from app.core.database import dispose_engine, init_engine, pool_stats
 from app.core.logging import setup_logging
+from app.utils.exceptions import JobStatusConflict
 
-from app.routers import tenants, telemetry, exports
-from app.workers.reconcile_jobs import reconcile_jobs
+from app.routers import tenants, telemetry, exports, schedules
+from app.workers.reconcile_jobs import reconcile_jobs, recover_expired_leases
+from app.services.export_scheduling import refresh_queue_progress
+from app.services.export_schedules import sync_schedules
 
 # Initialize logging
 setup_logging()
@@ -27,32 +31,70 @@ RECONCILE_INTERVAL = 3600 # run every hour
 async def lifespan(app: FastAPI):
     stop_event = asyncio.Event()
 
+    # One DB engine / pool for the whole API process
+    init_engine()
+
     # Periodic background task
     async def periodic_reconcile():
         while not stop_event.is_set():
             try:
                 await reconcile_jobs()
+                await sync_schedules()
             except Exception as e:
                 logger.exception("Error in periodic reconciliation", e)
             await asyncio.wait_for(
                 stop_event.wait(), timeout=RECONCILE_INTERVAL
             )
 
-    # Start the background task
+    # Queue aging + position / estimated start of queued exports
+    async def periodic_queue_refresh():
+        while not stop_event.is_set():
+            try:
+                await refresh_queue_progress()
+            except Exception:
+                logger.exception("Error refreshing export queue")
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    stop_event.wait(), timeout=settings.EXPORT_QUEUE_REFRESH_SECONDS
+                )
+
+    # Requeue jobs whose worker lease expired (crashed worker), within
+    # seconds; the hourly reconcile is the safety net behind it
+    async def periodic_lease_watch():
+        while not stop_event.is_set():
+            try:
+                await recover_expired_leases()
+            except Exception:
+                logger.exception("Error checking export leases")
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    stop_event.wait(), timeout=settings.EXPORT_LEASE_WATCH_SECONDS
+                )
+
+    # Start the background tasks
     task = asyncio.create_task(periodic_reconcile())
+    queue_task = asyncio.create_task(periodic_queue_refresh())
+    lease_task = asyncio.create_task(periodic_lease_watch())
 
     # Run initial reconciliation immediately
     await reconcile_jobs()
+    try:
+        await sync_schedules()
+    except Exception:
+        logger.exception("Error syncing export schedules")
 
     yield  # FastAPI runs app here
 
     # Shutdown: stop background task
     stop_event.set()
-    task.cancel()
-    with contextlib.suppress(asyncio.CancelledError):
-        await task
+    for background in (task, queue_task, lease_task):
+        background.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await background
     print("App shutting down, periodic reconcile stopped")
 
+    await dispose_engine()
+
 app = FastAPI(title="Telemetry Collector", lifespan=lifespan)
 app.description = "Backend service for collecting telemetry data."
 
@@ -83,6 +125,18 @@ async def log_requests(request: Request, call_next):
     )
     return response
 
+@app.exception_handler(JobStatusConflict)
+async def job_status_conflict_handler(request: Request, exc: JobStatusConflict):
+    # e.g. a cancel that lost the race against the worker completing the job
+    return JSONResponse(
+        {
+            "detail": f"Job is already {exc.current_status}",
+            "job_id": exc.job_id,
+            "status": exc.current_status,
+        },
+        status_code=409,
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.exception(f"Unhandled error: {exc}")
@@ -94,7 +148,15 @@ async def health_check():
     logger.info("Health check endpoint called")
     return {"status": "ok", "env": settings.ENV}
 
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """
+    Connection pool utilisation and checkout wait times for this process.
+    """
+    return pool_stats.snapshot()
+
 # Include routers
 app.include_router(tenants.router, prefix="/tenants", tags=["tenants"])
 app.include_router(telemetry.router, prefix="/telemetry", tags=["telemetry"])
 app.include_router(exports.router, prefix="/exports", tags=["exports"])
+app.include_router(schedules.router, prefix="/schedules", tags=["schedules"])
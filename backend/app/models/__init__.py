@@ -1,9 +1,11 @@
 from app.models.base import Base
 from app.models.export_job import ExportJob
+from app.models.export_schedule import ExportSchedule
 from app.models.tenant import Tenant
 
 __all__ = [
     "Base", 
     "ExportJob", 
+    "ExportSchedule",
     "Tenant"
 ]
@@ -1,5 +1,5 @@
 # app/models/export_job.py
-from sqlalchemy import Column, Date, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Date, Index, Integer, String, DateTime, JSON, text
 from app.core.database_sync import engine
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
@@ -8,18 +8,32 @@ from app.models.base import Base
 
 class ExportJob(Base):
     __tablename__ = "export_jobs"
-    __table_args__ = {"extend_existing": True}
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     job_id = Column(String, unique=True, nullable=False)
     date_from = Column(Date)
     date_to = Column(Date)
     tenant_id = Column(String, nullable=True)
+    format = Column(String, nullable=False, default="xlsx", server_default="xlsx")
+    cache_key = Column(String, nullable=True, index=True)
     status = Column(String, nullable=False)
     progress = Column(JSON, nullable=True)
     file_path = Column(String, nullable=True)
     error = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)  # set when status becomes "completed"
+
+    # Keyset listing (newest first) and reconciliation, see migration 1bcc2606b54e
+    __table_args__ = (
+        Index("ix_export_jobs_created_at_id", created_at.desc(), id.desc()),
+        Index("ix_export_jobs_tenant_created_at", tenant_id, created_at.desc(), id.desc()),
+        Index(
+            "ix_export_jobs_active_status",
+            status,
+            postgresql_where=text("status IN ('queued', 'running', 'cancelling', 'failed')"),
+        ),
+        {"extend_existing": True},
+    )
 
 
 # Base.metadata.create_all(bind=engine)
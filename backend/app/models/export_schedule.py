@@ -0,0 +1,28 @@
+# app/models/export_schedule.py
+from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from datetime import datetime
+
+from app.models.base import Base
+
+
+class ExportSchedule(Base):
+    """
+    Recurring export definition, triggered by the RQ scheduler.
+
+    mode "export" queues a normal export of `period`; mode "prewarm" only
+    collects it, filling the data caches ahead of the expected exports.
+    """
+    __tablename__ = "export_schedules"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False)
+    cron = Column(String, nullable=False)  # UTC, e.g. "0 2 1 * *"
+    period = Column(String, nullable=False, default="last_month", server_default="last_month")
+    mode = Column(String, nullable=False, default="export", server_default="export")
+    tenant_id = Column(String, nullable=True)
+    format = Column(String, nullable=False, default="xlsx", server_default="xlsx")
+    enabled = Column(Boolean, nullable=False, default=True, server_default="true")
+    next_run_at = Column(DateTime, nullable=True)
+    last_run_at = Column(DateTime, nullable=True)
+    last_job_id = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
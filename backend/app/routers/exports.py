@@ -1,23 +1,37 @@
 # app/routers/exports.py
 
+import base64
+import json
 import os
 from pathlib import Path
-from typing import Optional
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import FileResponse
+from typing import List, Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from datetime import datetime
 from app.core.database import get_db
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import uuid4
-from app.services.redis_queue import telemetry_queue, started, finished, failed, serialize_job
+from app.services.redis_queue import LANES, REGISTRIES, inspect_registries, remove_from_lanes, telemetry_queue
 from app.models.export_job import ExportJob
-from sqlalchemy import insert, select
+from sqlalchemy import insert, select, tuple_
 import logging
 from rq.job import Job
 from rq.exceptions import NoSuchJobError
-from app.services.export_job_service import update_job_status, _apply_job_status_update
-from app.workers.telemetry_export_sync import run_export_sync
+from app.services.export_job_service import submit_export, update_job_status, _apply_job_status_update
+from app.services.export_estimator import estimate_export
+from app.services.export_scheduling import lane_for
+from app.exporters.formats import DEFAULT_EXPORT_FORMAT, EXPORT_FORMATS
+from app.services.export_fanout import cancel_fanout, is_fanned_out
+from app.services.export_signals import publish_cancel
+from app.services.export_events import (
+    TERMINAL_STATUSES,
+    format_sse,
+    job_event_stream,
+    latest_event_id,
+    publish_job_event,
+)
 
 logger = logging.getLogger("app.exports")
 
@@ -28,95 +42,103 @@ async def export_telemetry(
     date_from: str, 
     date_to: str, 
     tenant_id: Optional[str] = Query(default=None), 
+    format: str = Query(default=DEFAULT_EXPORT_FORMAT),
+    force: bool = Query(default=False),
     db: AsyncSession = Depends(get_db)
 ):
     date_from_new = datetime.strptime(date_from, "%Y-%m-%d").date()
     date_to_new = datetime.strptime(date_to, "%Y-%m-%d").date()
 
-    ##
-    # Comment out the blocking check to allow multiple exports for the same date range
-    #
-
-    # # Block re-submission only when an active or successful job already exists
-    # # for the same (date_from, date_to, tenant_id) tuple. "failed" and
-    # # "cancelled" are intentionally excluded so users can retry from the UI.
-    # BLOCKING_STATUSES = ("queued", "running", "cancelling", "completed")
-
-    # tenant_filter = (
-    #     ExportJob.tenant_id == tenant_id
-    #     if tenant_id
-    #     else ExportJob.tenant_id.is_(None)
-    # )
-
-    # exists = await db.execute(
-    #     ExportJob.__table__.select().where(
-    #         ExportJob.date_from == date_from_new,
-    #         ExportJob.date_to == date_to_new,
-    #         tenant_filter,
-    #         ExportJob.status.in_(BLOCKING_STATUSES),
-    #     )
-    # )
-    # existing = exists.first()
-    # if existing:
-    #     existing_status = existing._mapping["status"]
-    #     if existing_status == "completed":
-    #         detail = (
-    #             "An export for this date range has already been completed. "
-    #             "Delete it from the Jobs Queue to re-run."
-    #         )
-    #     else:
-    #         detail = (
-    #             "An export for this date range is already queued/running. "
-    #             "Delete it from the Jobs Queue to re-run."
-    #         )
-    #     raise HTTPException(status_code=409, detail=detail)
-
-    # End
-    ##
-
-    # Enqueue RQ job (sync wrapper handles async)
-    job = telemetry_queue.enqueue(
-        run_export_sync, 
-        date_from, 
-        date_to,
-        tenant_id,
-        job_timeout=60 * 60 * 2,  # example: 2h
-        result_ttl=0,
-        failure_ttl=0,
-    )
-
-    # Insert job in DB
-    await db.execute(
-        insert(ExportJob).values(
-            job_id=job.id,
-            date_from=date_from_new,
-            date_to=date_to_new,
-            tenant_id=tenant_id,
-            status=job._status,
-            progress={
-                "stage": "Queued",
-            },
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}",
         )
+
+    return await submit_export(db, date_from_new, date_to_new, tenant_id, format, force=force)
+
+@router.get("/estimate")
+async def estimate_export_cost(
+    date_from: str,
+    date_to: str,
+    tenant_id: Optional[str] = Query(default=None),
+):
+    """
+    Predicted duration and work units of an export, per stage, from past
+    jobs. Lets the UI warn before a long export is queued.
+    """
+    date_from_new = datetime.strptime(date_from, "%Y-%m-%d").date()
+    date_to_new = datetime.strptime(date_to, "%Y-%m-%d").date()
+
+    # Sync Redis reads of the learned volumes
+    estimate = await run_in_threadpool(
+        estimate_export, date_from_new, date_to_new, [tenant_id] if tenant_id else None
     )
-    await db.commit()
+    return {**estimate, "lane": lane_for(estimate["total_seconds"]).name}
+
+
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 500
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    return {
-        # "id": job_id, 
-        "job_id": job.id,
-        "status": job._status,
-    }
 
 @router.get("/")
-async def get_exports(tenant_id: Optional[str] = Query(default=None), db: AsyncSession = Depends(get_db)):
+async def get_exports(
+    response: Response,
+    tenant_id: Optional[str] = Query(default=None),
+    limit: int = Query(default=LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    before: Optional[str] = Query(default=None, description="X-Next-Cursor of the previous page"),
+    summary: bool = Query(default=False, description="Leave out progress and error"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Export jobs, newest first, one page at a time. Pages are keyset
+    paginated on (created_at, id) so each one costs the same however long
+    the job history is. The cursor for the next page is returned in the
+    X-Next-Cursor header (absent on the last page).
+    """
+    table = ExportJob.__table__
+    columns = [
+        table.c.id,
+        table.c.job_id,
+        table.c.date_from,
+        table.c.date_to,
+        table.c.tenant_id,
+        table.c.format,
+        table.c.status,
+        table.c.file_path,
+        table.c.created_at,
+    ]
+    if not summary:
+        columns += [table.c.progress, table.c.error]
+
+    query = select(*columns)
     if tenant_id:
-        result = await db.execute(
-            ExportJob.__table__.select().where(ExportJob.tenant_id == tenant_id).order_by(ExportJob.created_at.desc())
-        )
-    else:
-        result = await db.execute(
-            ExportJob.__table__.select().order_by(ExportJob.created_at.desc())
-        )
-    jobs = result.all()
+        query = query.where(table.c.tenant_id == tenant_id)
+    if before:
+        created_at, row_id = decode_cursor(before)
+        query = query.where(tuple_(table.c.created_at, table.c.id) < tuple_(created_at, row_id))
+
+    # One extra row tells us whether there is a next page
+    query = query.order_by(table.c.created_at.desc(), table.c.id.desc()).limit(limit + 1)
+    jobs = (await db.execute(query)).all()
+
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        last = jobs[-1]._mapping
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
 
     return [
         {
@@ -125,46 +147,125 @@ async def get_exports(tenant_id: Optional[str] = Query(default=None), db: AsyncS
             "date_from": job._mapping["date_from"],
             "date_to": job._mapping["date_to"],
             "tenant_id": job._mapping["tenant_id"],
+            "format": job._mapping["format"],
             "status": job._mapping["status"],
-            "progress": job._mapping.get("progress"),
+            **(
+                {}
+                if summary
+                else {
+                    "progress": job._mapping.get("progress"),
+                    "error": job._mapping.get("error"),
+                }
+            ),
             "file_path": job._mapping.get("file_path"),
-            "error": job._mapping.get("error"),
             "created_at": job._mapping.get("created_at"),
         }
         for job in jobs
     ]
 
+REDIS_LIST_DEFAULT_LIMIT = 100
+REDIS_LIST_MAX_LIMIT = 1000
+
+
 @router.get("/jobs/redis")
-async def get_export_jobs_in_redis():
+async def get_export_jobs_in_redis(
+    response: Response,
+    registry: List[str] = Query(default=list(REGISTRIES), description="queued, started, scheduled, deferred, finished, failed"),
+    lane: Optional[str] = Query(default=None, description="One lane (queue name), default all"),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=REDIS_LIST_DEFAULT_LIMIT, ge=1, le=REDIS_LIST_MAX_LIMIT),
+):
     """
-    Get all export jobs currently in the RQ queue.
+    Export jobs in RQ, one page at a time: by registry, then lane, newest
+    first. The page is read with pipelined Redis calls in a worker thread,
+    so big registries neither cost a round trip per job nor block the
+    event loop. Total in X-Total-Count, next page's offset in X-Next-Offset
+    (absent on the last page).
     """
+    unknown = [name for name in registry if name not in REGISTRIES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown registry '{unknown[0]}'. Use any of: {', '.join(REGISTRIES)}",
+        )
+
+    lanes = [q for q in LANES if lane is None or q.name == lane]
+    if not lanes:
+        raise HTTPException(status_code=400, detail=f"Unknown lane '{lane}'")
 
-    all_jobs = []
+    page, total = await run_in_threadpool(inspect_registries, registry, lanes, offset, limit)
 
-    # Jobs still in queue
-    for job in telemetry_queue.get_jobs():
-        all_jobs.append(serialize_job(job))
+    response.headers["X-Total-Count"] = str(total)
+    if offset + limit < total:
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return page
 
-    # Jobs currently running
-    for job_id in started.get_job_ids():
-        job = telemetry_queue.fetch_job(job_id)
-        all_jobs.append(serialize_job(job))
 
-    # Jobs finished
-    for job_id in finished.get_job_ids():
-        job = telemetry_queue.fetch_job(job_id)
-        all_jobs.append(serialize_job(job))
+# ---------- Live progress (server-sent events) ----------
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # don't let a proxy buffer the stream
+}
 
-    # Jobs failed
-    for job_id in failed.get_job_ids():
-        job = telemetry_queue.fetch_job(job_id)
-        all_jobs.append(serialize_job(job))
 
-    # Order by enqueued_at descending
-    all_jobs.sort(key=lambda x: x["enqueued_at"] or datetime.min, reverse=True)
+@router.get("/events")
+async def stream_export_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(default=None),
+):
+    """
+    Progress and status events for every export job. A reconnecting
+    EventSource resumes after Last-Event-ID.
+    """
+    last_id = last_event_id or await latest_event_id()
+    return StreamingResponse(
+        job_event_stream(request, last_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
 
-    return all_jobs
+
+@router.get("/{job_id}/events")
+async def stream_export_job_events(
+    job_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Events for a single job: a "snapshot" of the current row first, then
+    its progress events. The stream ends once the job is finished.
+    """
+    last_id = last_event_id or await latest_event_id()
+
+    result = await db.execute(
+        ExportJob.__table__.select().where(ExportJob.job_id == job_id)
+    )
+    job_row = result.first()
+    if not job_row:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job = job_row._mapping
+    snapshot = json.dumps(
+        {
+            "job_id": job_id,
+            "status": job["status"],
+            "progress": job.get("progress"),
+            "file_path": job.get("file_path"),
+            "error": job.get("error"),
+        },
+        default=str,
+    )
+    await db.close()  # don't hold a DB connection for the life of the stream
+
+    async def events():
+        yield format_sse(snapshot, "snapshot")
+        if job["status"] in TERMINAL_STATUSES:
+            return
+        async for event in job_event_stream(request, last_id, job_id):
+            yield event
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
 # ---------- Get status of a job ----------
@@ -184,6 +285,7 @@ async def get_export_status(job_id: str, db: AsyncSession = Depends(get_db)):
         "date_from": job["date_from"],
         "date_to": job["date_to"],
         "tenant_id": job["tenant_id"],
+        "format": job["format"],
         "status": job["status"],
         "progress": job.get("progress"),
         "file_path": job.get("file_path"),
@@ -197,7 +299,8 @@ async def cancel_export(job_id: str, db: AsyncSession = Depends(get_db)):
     """
     Cancel an export job.
     - Queued: removed immediately
-    - Running: cooperative cancel (worker checks DB)
+    - Running: cancel published over Redis, worker interrupts the export
+    - Fanned out: queued shards cancelled, the merge finalizes the job
     - Missing: treated as cancelled
     """
     # Fetch job from DB
@@ -211,6 +314,21 @@ async def cancel_export(job_id: str, db: AsyncSession = Depends(get_db)):
     if not job_row:
         raise HTTPException(status_code=404, detail="Job not found or not cancellable")
 
+    # Fanned-out export: the parent RQ job is long gone. Queued shards are
+    # cancelled, running shards / merge stop themselves, and the merge moves
+    # the job to cancelled and removes the partials once nothing reads them
+    if is_fanned_out(job_id):
+        job = await update_job_status(
+            db,
+            job_id,
+            new_status="cancelling",
+            progress={"stage": "Cancelling..."},
+        )
+        await db.commit()
+        publish_cancel(job_id)
+        cancel_fanout(job_id)
+        return job
+
     # Attempt to fetch RQ job
     try:
         rq_job = Job.fetch(job_id, connection=telemetry_queue.connection)
@@ -221,7 +339,7 @@ async def cancel_export(job_id: str, db: AsyncSession = Depends(get_db)):
         status = rq_job.get_status()
         if status == "queued":
             # Remove immediately
-            telemetry_queue.remove(job_id)
+            remove_from_lanes(job_id)
             job = await update_job_status(
                 db,
                 job_id,
@@ -229,13 +347,17 @@ async def cancel_export(job_id: str, db: AsyncSession = Depends(get_db)):
                 progress={"stage": "Cancelled"},
             )
         elif status == "started":
-            # Running: cooperative cancel
+            # Running: the worker hears the published cancel and stops its
+            # export task, then moves the job to cancelled itself
             job = await update_job_status(
                 db,
                 job_id,
                 new_status="cancelling",
                 progress={"stage": "Cancelling..."},
             )
+            await db.commit()  # worker moves cancelling -> cancelled
+            publish_cancel(job_id)
+            return job
         else:
             # Other states cannot cancel
             raise HTTPException(
@@ -272,10 +394,12 @@ async def download_export(job_id: str, db: AsyncSession = Depends(get_db)):
     if not file_path or not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found")
 
+    export_format = EXPORT_FORMATS.get(job_row._mapping["format"], EXPORT_FORMATS[DEFAULT_EXPORT_FORMAT])
+
     return FileResponse(
         path=file_path, 
         filename=os.path.basename(file_path),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        media_type=export_format.media_type
     )
 
 @router.delete("/{job_id}")
@@ -298,7 +422,7 @@ async def delete_export(job_id: str, db: AsyncSession = Depends(get_db)):
 
     # Delete from RQ queue
     try:
-        telemetry_queue.remove(job_row._mapping["job_id"])
+        remove_from_lanes(job_row._mapping["job_id"])
     except Exception:
         # Queue might not have it, ignore safely
         pass
@@ -320,5 +444,6 @@ async def delete_export(job_id: str, db: AsyncSession = Depends(get_db)):
         ExportJob.__table__.delete().where(ExportJob.job_id == job_id)
     )
     await db.commit()
+    publish_job_event(job_id, status="deleted")
 
     return {"status": "deleted"}
@@ -0,0 +1,167 @@
+# app/routers/schedules.py
+#
+# CRUD for recurring exports / pre-warms, see app/services/export_schedules.py.
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.exporters.formats import DEFAULT_EXPORT_FORMAT, EXPORT_FORMATS
+from app.models.export_schedule import ExportSchedule
+from app.services.export_schedules import (
+    MODES,
+    PERIODS,
+    cancel_schedule_runs,
+    enqueue_schedule_run,
+    is_valid_cron,
+    next_run_at,
+    period_range,
+)
+from app.services.redis_queue import telemetry_queue
+
+router = APIRouter()
+
+
+class ScheduleIn(BaseModel):
+    name: str
+    cron: str
+    period: str = "last_month"
+    mode: str = "export"
+    tenant_id: Optional[str] = None
+    format: str = DEFAULT_EXPORT_FORMAT
+    enabled: bool = True
+
+
+class ScheduleUpdate(BaseModel):
+    name: Optional[str] = None
+    cron: Optional[str] = None
+    period: Optional[str] = None
+    mode: Optional[str] = None
+    tenant_id: Optional[str] = None
+    format: Optional[str] = None
+    enabled: Optional[bool] = None
+
+
+def _validate(values: dict):
+    if "cron" in values and not is_valid_cron(values["cron"]):
+        raise HTTPException(status_code=400, detail=f"Invalid cron expression '{values['cron']}'")
+    if "period" in values and values["period"] not in PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported period '{values['period']}'. Use one of: {', '.join(PERIODS)}",
+        )
+    if "mode" in values and values["mode"] not in MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported mode '{values['mode']}'. Use one of: {', '.join(MODES)}",
+        )
+    if "format" in values and values["format"] not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format '{values['format']}'. Use one of: {', '.join(EXPORT_FORMATS)}",
+        )
+
+
+def _serialize(schedule: ExportSchedule) -> dict:
+    date_from, date_to = period_range(schedule.period)
+    return {
+        "id": schedule.id,
+        "name": schedule.name,
+        "cron": schedule.cron,
+        "period": schedule.period,
+        "mode": schedule.mode,
+        "tenant_id": schedule.tenant_id,
+        "format": schedule.format,
+        "enabled": schedule.enabled,
+        "next_run_at": schedule.next_run_at.isoformat() if schedule.next_run_at else None,
+        "last_run_at": schedule.last_run_at.isoformat() if schedule.last_run_at else None,
+        "last_job_id": schedule.last_job_id,
+        # what a run right now would cover
+        "current_period": {"date_from": date_from.isoformat(), "date_to": date_to.isoformat()},
+    }
+
+
+async def _get_schedule(db: AsyncSession, schedule_id: int) -> ExportSchedule:
+    schedule = await db.get(ExportSchedule, schedule_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return schedule
+
+
+async def _reschedule(db: AsyncSession, schedule: ExportSchedule):
+    # Drop whatever run was waiting and queue the one for the current cron
+    cancel_schedule_runs(schedule.id)
+    if schedule.enabled:
+        schedule.next_run_at = next_run_at(schedule.cron)
+        enqueue_schedule_run(schedule, schedule.next_run_at)
+    else:
+        schedule.next_run_at = None
+    await db.commit()
+
+
+@router.get("/")
+async def list_schedules(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(ExportSchedule).order_by(ExportSchedule.id))
+    return [_serialize(s) for s in result.scalars().all()]
+
+
+@router.post("/")
+async def create_schedule(body: ScheduleIn, db: AsyncSession = Depends(get_db)):
+    values = body.model_dump()
+    _validate(values)
+
+    schedule = ExportSchedule(**values)
+    db.add(schedule)
+    await db.flush()  # id for the job ids
+    await _reschedule(db, schedule)
+    return _serialize(schedule)
+
+
+@router.get("/{schedule_id}")
+async def get_schedule(schedule_id: int, db: AsyncSession = Depends(get_db)):
+    return _serialize(await _get_schedule(db, schedule_id))
+
+
+@router.patch("/{schedule_id}")
+async def update_schedule(schedule_id: int, body: ScheduleUpdate, db: AsyncSession = Depends(get_db)):
+    schedule = await _get_schedule(db, schedule_id)
+    values = body.model_dump(exclude_unset=True)
+    _validate(values)
+
+    for field, value in values.items():
+        setattr(schedule, field, value)
+    await _reschedule(db, schedule)
+    return _serialize(schedule)
+
+
+@router.delete("/{schedule_id}")
+async def delete_schedule(schedule_id: int, db: AsyncSession = Depends(get_db)):
+    schedule = await _get_schedule(db, schedule_id)
+    cancel_schedule_runs(schedule.id)
+    await db.delete(schedule)
+    await db.commit()
+    return {"id": schedule_id, "deleted": True}
+
+
+@router.post("/{schedule_id}/run")
+async def run_schedule_now(schedule_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Run a schedule now, on top of its regular runs.
+    """
+    schedule = await _get_schedule(db, schedule_id)
+    if not schedule.enabled:
+        raise HTTPException(status_code=409, detail="Schedule is disabled")
+
+    job = telemetry_queue.enqueue(
+        "app.workers.telemetry_export_sync.run_schedule_sync",
+        schedule.id,
+        job_id=f"schedule-{schedule.id}-manual-{int(datetime.utcnow().timestamp())}",
+        result_ttl=0,
+        failure_ttl=0,
+    )
+    return {"id": schedule.id, "job_id": job.id}
@@ -1,8 +1,10 @@
 # app/routers/telemetry.py
 
+import asyncio
 import os
-from typing import Optional
-from fastapi import APIRouter, Query
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from datetime import date, datetime, time, timezone
 from app.api.alerts_api import AlertsApiClient
 from app.services.alert_service import AlertTelemetryService
@@ -13,10 +15,21 @@ from app.core.constants import oauth_url, global_url
 from app.api.org_api import OrgApiClient
 from app.api.case_detections_api import CaseDetectionsApiClient
 from app.services.mttd_service import MTTDService
+from app.services.mttd_service2 import MTTDService2
+from app.services.summary_service import SUMMARY_METRICS, TelemetrySummaryService
 from app.services.mtta_service import MTTAService
 from app.services.mttr_service import MTTRService
 from app.api.health_check_api import HealthCheckApiClient
 from app.services.endpoint_health_service import EndpointHealthService
+from app.core.response_cache import ResponseCache
+from app.services.tenant_stream import collect_tenants, ndjson_lines, stream_tenants
+from app.aggregator.alert_aggregator import AlertTelemetryAggregator
+from app.aggregator.case_aggregator import CaseTelemetryAggregator
+from app.aggregator.mttd_aggregator import MTTDAggregator
+from app.aggregator.mtta_aggregator import MTTAAggregator
+from app.aggregator.mttr_aggregator import MTTRAggregator
+from app.aggregator.endpoint_health_aggregator import EndpointHealthAggregator
+from app.aggregator.series_aggregator import BUCKETS, SERIES_METRICS, TelemetrySeriesAggregator
 
 router = APIRouter()
 
@@ -53,23 +66,119 @@ endpoint_health_service = EndpointHealthService(
     endpoint_health_client=endpoint_health_client,
 )
 
+summary_service = TelemetrySummaryService(
+    org_client=org_client,
+    alerts_client=alerts_client,
+    cases_client=cases_client,
+    mttd_service=MTTDService2(
+        org_client=org_client,
+        cases_client=cases_client,
+        detections_client=detections_client,
+    ),
+    endpoint_health_client=endpoint_health_client,
+)
+
+# Stale-while-revalidate, per metric / range / tenant
+response_cache = ResponseCache("response")
+
+
+async def live(
+    response: Response,
+    metric: str,
+    parts: tuple,
+    *,
+    tenant_id: str | None,
+    fetch,
+    aggregate,
+    collect,
+    stream: bool,
+    deadline_ms: int | None,
+):
+    """
+    Serve one live metric:
+    - default: the response cache (app/core/response_cache.py)
+    - stream=true: NDJSON, one record per tenant as it finishes, then
+      totals (app/services/tenant_stream.py). Not cached.
+    - deadline_ms: a cached value if there is one, else whatever tenants
+      finish in time, with per-tenant status. Only complete results are
+      cached.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if deadline_ms is None else loop.time() + deadline_ms / 1000
+
+    if not stream:
+        if deadline is None:
+            value, served = await response_cache.get(metric, parts, collect)
+            response.headers["X-Cache"] = served
+            return value
+
+        found = await response_cache.lookup(metric, parts, collect)
+        if found is not None:
+            response.headers["X-Cache"] = found[1]
+            return found[0]
+
+    try:
+        if tenant_id:
+            tenants_call = org_client.list_tenant(tenant_id=tenant_id)
+        else:
+            tenants_call = org_client.list_tenants()
+        timeout = None if deadline is None else max(deadline - loop.time(), 0)
+        tenants = await asyncio.wait_for(tenants_call, timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Deadline exceeded listing tenants")
+
+    timeout = None if deadline is None else max(deadline - loop.time(), 0)
+    if stream:
+        return StreamingResponse(
+            ndjson_lines(stream_tenants(tenants, fetch, aggregate, timeout)),
+            media_type="application/x-ndjson",
+            headers={"X-Accel-Buffering": "no"},
+        )
+
+    body = await collect_tenants(tenants, fetch, aggregate, timeout)
+    response.headers["X-Cache"] = "miss"
+    if not body["partial"]:
+        await response_cache.store(metric, parts, aggregate_only(body))
+    return body
+
+
+def aggregate_only(body: dict) -> dict:
+    # What the un-bounded route returns for the same request
+    return {k: v for k, v in body.items() if k not in ("tenant_status", "partial")}
+
 
 @router.get("/alerts")
 async def alert_telemetry(
+    response: Response,
     date_from: date = Query(...),
     date_to: date = Query(...),
-    tenant_id: Optional[str] = Query(default=None)
+    tenant_id: Optional[str] = Query(default=None),
+    stream: bool = Query(default=False),
+    deadline_ms: Optional[int] = Query(default=None, ge=1, description="Answer within this budget, with partial results"),
 ):
     """
     Collects alert telemetry between date_from and date_to.
     Returns Number of Security Incidents.
     """
-    return await alerts_service.collect(date_from, date_to, tenant_id)
+    return await live(
+        response,
+        "alerts",
+        (date_from, date_to, tenant_id),
+        tenant_id=tenant_id,
+        fetch=lambda t: alerts_service.fetch_tenant(t, date_from, date_to),
+        aggregate=AlertTelemetryAggregator.aggregate,
+        collect=lambda: alerts_service.collect(date_from, date_to, tenant_id),
+        stream=stream,
+        deadline_ms=deadline_ms,
+    )
 
 @router.get("/cases/sla")
 async def cases_sla_telemetry(
+    response: Response,
     date_from: date = Query(...),
-    date_to: date = Query(...)
+    date_to: date = Query(...),
+    stream: bool = Query(default=False),
+    deadline_ms: Optional[int] = Query(default=None, ge=1, description="Answer within this budget, with partial results"),
 ):
     created_after = datetime.combine(
         date_from, time.min, tzinfo=timezone.utc
@@ -79,14 +188,25 @@ async def cases_sla_telemetry(
         date_to, time.min, tzinfo=timezone.utc
     )
     
-    return await case_service.collect_sla_metrics(
-            created_after, created_before
-        )
+    return await live(
+        response,
+        "sla",
+        (date_from, date_to),
+        tenant_id=None,
+        fetch=lambda t: case_service.fetch_tenant_sla(t, created_after, created_before),
+        aggregate=CaseTelemetryAggregator.aggregate,
+        collect=lambda: case_service.collect_sla_metrics(created_after, created_before, None),
+        stream=stream,
+        deadline_ms=deadline_ms,
+    )
 
 @router.get("/mttd")
 async def mean_time_to_detect(
+    response: Response,
     date_from: date = Query(...),
-    date_to: date = Query(...)
+    date_to: date = Query(...),
+    stream: bool = Query(default=False),
+    deadline_ms: Optional[int] = Query(default=None, ge=1, description="Answer within this budget, with partial results"),
 ):
     created_after = datetime.combine(
         date_from, time.min, tzinfo=timezone.utc
@@ -96,12 +216,25 @@ async def mean_time_to_detect(
         date_to, time.min, tzinfo=timezone.utc
     )
 
-    return await mttd_service.collect_mttd(created_after, created_before)
+    return await live(
+        response,
+        "mttd",
+        (date_from, date_to),
+        tenant_id=None,
+        fetch=lambda t: mttd_service.fetch_tenant(t, created_after, created_before),
+        aggregate=MTTDAggregator.aggregate,
+        collect=lambda: mttd_service.collect_mttd(created_after, created_before, None),
+        stream=stream,
+        deadline_ms=deadline_ms,
+    )
 
 @router.get("/mtta")
 async def mean_time_to_acknowledge(
+    response: Response,
     date_from: date = Query(...),
-    date_to: date = Query(...)
+    date_to: date = Query(...),
+    stream: bool = Query(default=False),
+    deadline_ms: Optional[int] = Query(default=None, ge=1, description="Answer within this budget, with partial results"),
 ):
     created_after = datetime.combine(
         date_from, time.min, tzinfo=timezone.utc
@@ -111,12 +244,25 @@ async def mean_time_to_acknowledge(
         date_to, time.min, tzinfo=timezone.utc
     )
 
-    return await mtta_service.collect_mtta(created_after, created_before)
+    return await live(
+        response,
+        "mtta",
+        (date_from, date_to),
+        tenant_id=None,
+        fetch=lambda t: mtta_service.fetch_tenant(t, created_after, created_before),
+        aggregate=MTTAAggregator.aggregate,
+        collect=lambda: mtta_service.collect_mtta(created_after, created_before, None),
+        stream=stream,
+        deadline_ms=deadline_ms,
+    )
 
 @router.get("/mttr")
 async def mean_time_to_recover(
+    response: Response,
     date_from: date = Query(...),
-    date_to: date = Query(...)
+    date_to: date = Query(...),
+    stream: bool = Query(default=False),
+    deadline_ms: Optional[int] = Query(default=None, ge=1, description="Answer within this budget, with partial results"),
 ):
     created_after = datetime.combine(
         date_from, time.min, tzinfo=timezone.utc
@@ -126,8 +272,118 @@ async def mean_time_to_recover(
         date_to, time.min, tzinfo=timezone.utc
     )
 
-    return await mttr_service.collect_mttr(created_after, created_before)
+    return await live(
+        response,
+        "mttr",
+        (date_from, date_to),
+        tenant_id=None,
+        fetch=lambda t: mttr_service.fetch_tenant(t, created_after, created_before),
+        aggregate=MTTRAggregator.aggregate,
+        collect=lambda: mttr_service.collect_mttr(created_after, created_before, None),
+        stream=stream,
+        deadline_ms=deadline_ms,
+    )
 
 @router.get("/endpoint-health")
-async def endpoint_health():
-    return await endpoint_health_service.collect_endpoint_health()
+async def endpoint_health(
+    response: Response,
+    stream: bool = Query(default=False),
+    deadline_ms: Optional[int] = Query(default=None, ge=1, description="Answer within this budget, with partial results"),
+):
+    return await live(
+        response,
+        "endpoint-health",
+        (),
+        tenant_id=None,
+        fetch=endpoint_health_service.fetch_tenant,
+        aggregate=EndpointHealthAggregator.aggregate,
+        collect=lambda: endpoint_health_service.collect_endpoint_health(None),
+        stream=stream,
+        deadline_ms=deadline_ms,
+    )
+
+@router.get("/summary")
+async def telemetry_summary(
+    response: Response,
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    tenant_id: Optional[str] = Query(default=None),
+    metrics: List[str] = Query(default=list(SUMMARY_METRICS), description="alerts, sla, mttd, mtta, mttr, endpoint"),
+    stream: bool = Query(default=False),
+    deadline_ms: Optional[int] = Query(default=None, ge=1, description="Answer within this budget, with partial results"),
+):
+    """
+    The selected metrics in one payload, {metric: aggregate}, from one fetch
+    of each tenant's alerts, cases, initial detections and health. Every
+    metric has the same body as its own route except MTTD: it is computed
+    from each case's initial detection (MTTDAggregator.aggregate2, like
+    exports), while /mttd uses every detection of each case.
+    """
+    unknown = [m for m in metrics if m not in SUMMARY_METRICS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown metric '{unknown[0]}'. Use any of: {', '.join(SUMMARY_METRICS)}",
+        )
+    selected = [m for m in SUMMARY_METRICS if m in metrics]
+
+    return await live(
+        response,
+        "summary",
+        (date_from, date_to, tenant_id, selected),
+        tenant_id=tenant_id,
+        fetch=lambda t: summary_service.fetch_tenant(t, date_from, date_to, selected),
+        aggregate=lambda records: summary_service.aggregate(records, selected),
+        collect=lambda: summary_service.collect_summary(date_from, date_to, tenant_id, selected),
+        stream=stream,
+        deadline_ms=deadline_ms,
+    )
+
+
+@router.get("/series")
+async def telemetry_series(
+    response: Response,
+    metric: str = Query(..., description="alerts, sla, mttd, mtta, mttr"),
+    bucket: str = Query(default="day", description="day, week or month"),
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    tenant_id: Optional[str] = Query(default=None),
+    stream: bool = Query(default=False),
+    deadline_ms: Optional[int] = Query(default=None, ge=1, description="Answer within this budget, with partial results"),
+):
+    """
+    One metric per day / week (Monday) / month bucket, per tenant and in
+    total, as columns: {"buckets": [...], "total": {"count": [...],
+    "mean_seconds": [...]}, "tenants": [...]}. Records are bucketed by
+    raisedAt (alerts), detection time (mttd) or case createdAt.
+    """
+    if metric not in SERIES_METRICS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown metric '{metric}'. Use one of: {', '.join(SERIES_METRICS)}",
+        )
+    if bucket not in BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown bucket '{bucket}'. Use one of: {', '.join(BUCKETS)}",
+        )
+    if date_to <= date_from:
+        raise HTTPException(status_code=400, detail="date_to must be after date_from")
+
+    def aggregate(records):
+        return TelemetrySeriesAggregator.aggregate(metric, bucket, date_from, date_to, records)
+
+    async def collect():
+        return aggregate(await summary_service.collect_records(date_from, date_to, tenant_id, [metric]))
+
+    return await live(
+        response,
+        "series",
+        (metric, bucket, date_from, date_to, tenant_id),
+        tenant_id=tenant_id,
+        fetch=lambda t: summary_service.fetch_tenant(t, date_from, date_to, [metric]),
+        aggregate=aggregate,
+        collect=collect,
+        stream=stream,
+        deadline_ms=deadline_ms,
+    )
@@ -2,7 +2,7 @@
 
 import asyncio
 from datetime import date
-from typing import Dict
+from typing import Any, Dict, List
 
 from app.api.alerts_api import AlertsApiClient
 from app.api.org_api import OrgApiClient
@@ -14,24 +14,22 @@ class AlertTelemetryService:
         self.org_client = org_client
         self.alerts_client = alerts_client
 
-    async def collect(self, date_from: date, date_to: date, tenant_id: str | None) -> Dict:
-        if not tenant_id:
+    async def collect(
+        self,
+        date_from: date,
+        date_to: date,
+        tenant_id: str | None,
+        tenants: List[Dict[str, Any]] | None = None,
+    ) -> Dict:
+        if tenants is not None:
+            pass  # explicit tenant subset (fan-out shards)
+        elif not tenant_id:
             tenants = await self.org_client.list_tenants()
         else:
             tenants = await self.org_client.list_tenant(tenant_id=tenant_id)
 
-        async def fetch_alerts(tenant):
-            alerts = await self.alerts_client.list_alerts(
-                api_host=tenant["apiHost"],
-                tenant_id=tenant["id"],
-                date_from=date_from,
-                date_to=date_to,
-            )
-            return tenant["id"], tenant["showAs"], alerts
-
-        
         results = await asyncio.gather(
-            *[fetch_alerts(t) for t in tenants]
+            *[self.fetch_tenant(t, date_from, date_to) for t in tenants]
         )
 
         # print("ALERT FETCH RESULTS:", results)
@@ -42,3 +40,16 @@ class AlertTelemetryService:
         # print("ALERTS BY TENANT:", alerts_by_tenant)
 
         return AlertTelemetryAggregator.aggregate(alerts_by_tenant)
+
+    async def fetch_tenant(self, tenant: Dict[str, Any], date_from: date, date_to: date):
+        """
+        One tenant's alerts as (tenant id, name, alerts). Also used on its
+        own to stream tenants as they finish (app/services/tenant_stream.py).
+        """
+        alerts = await self.alerts_client.list_alerts(
+            api_host=tenant["apiHost"],
+            tenant_id=tenant["id"],
+            date_from=date_from,
+            date_to=date_to,
+        )
+        return tenant["id"], tenant["showAs"], alerts
@@ -2,7 +2,7 @@
 
 import asyncio
 from datetime import date, datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from app.api.org_api import OrgApiClient
 from app.api.cases_api import CasesApiClient
@@ -22,28 +22,20 @@ class CaseTelemetryService:
         self,
         created_after: datetime,
         created_before: datetime,
-        tenant_id: str | None
+        tenant_id: str | None,
         # date_from: date,
         # date_to: date,
+        tenants: List[Dict[str, Any]] | None = None,
     ) -> Dict[str, Any]:
-        if not tenant_id:
+        if tenants is not None:
+            pass  # explicit tenant subset (fan-out shards)
+        elif not tenant_id:
             tenants = await self.org_client.list_tenants()
         else:
             tenants = await self.org_client.list_tenant(tenant_id=tenant_id)
 
-        async def fetch_cases(tenant):
-            return tenant["id"], tenant["showAs"], await self.cases_client.list_cases(
-                api_host=tenant["apiHost"],
-                tenant_id=tenant["id"],
-                # created_after=(date_from and datetime.combine(date_from, datetime.min.time())),
-                # created_before=(date_to and datetime.combine(date_to, datetime.max.time())),
-                created_after=created_after,
-                created_before=created_before,
-                status="resolved",
-            )
-
         results = await asyncio.gather(
-            *[fetch_cases(t) for t in tenants]
+            *[self.fetch_tenant_sla(t, created_after, created_before) for t in tenants]
         )
 
         cases_by_tenant = {
@@ -52,6 +44,20 @@ class CaseTelemetryService:
         }
 
         return CaseTelemetryAggregator.aggregate(cases_by_tenant)
+
+    async def fetch_tenant_sla(self, tenant: Dict[str, Any], created_after: datetime, created_before: datetime):
+        """
+        One tenant's resolved cases as (tenant id, name, cases).
+        """
+        return tenant["id"], tenant["showAs"], await self.cases_client.list_cases(
+            api_host=tenant["apiHost"],
+            tenant_id=tenant["id"],
+            # created_after=(date_from and datetime.combine(date_from, datetime.min.time())),
+            # created_before=(date_to and datetime.combine(date_to, datetime.max.time())),
+            created_after=created_after,
+            created_before=created_before,
+            status="resolved",
+        )
     
     async def collect_case_metrics(
         self,
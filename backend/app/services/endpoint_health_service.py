@@ -1,7 +1,7 @@
 # app/services/endpoint_health_service.py
 
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, List
 from app.api.org_api import OrgApiClient
 from app.api.health_check_api import HealthCheckApiClient
 from app.aggregator.endpoint_health_aggregator import EndpointHealthAggregator
@@ -16,22 +16,21 @@ class EndpointHealthService:
         self.org_client = org_client
         self.endpoint_health_client = endpoint_health_client
 
-    async def collect_endpoint_health(self, tenant_id: str | None) -> Dict[str, Any]:
-        if not tenant_id:
+    async def collect_endpoint_health(
+        self,
+        tenant_id: str | None,
+        tenants: List[Dict[str, Any]] | None = None,
+    ) -> Dict[str, Any]:
+        if tenants is not None:
+            pass  # explicit tenant subset (fan-out shards)
+        elif not tenant_id:
             tenants = await self.org_client.list_tenants()
         else:
             tenants = await self.org_client.list_tenant(tenant_id=tenant_id)
 
 
-        async def fetch_health_check(tenant):
-            health_check = await self.endpoint_health_client.get_endpoint_health(
-                api_host=tenant["apiHost"],
-                tenant_id=tenant["id"],
-            )
-            return tenant["id"], tenant["showAs"], health_check
-        
         results = await asyncio.gather(
-            *[fetch_health_check(t) for t in tenants]
+            *[self.fetch_tenant(t) for t in tenants]
         )
 
         health_by_tenant = {
@@ -54,3 +53,13 @@ class EndpointHealthService:
             # )
 
         return EndpointHealthAggregator.aggregate(health_by_tenant)
+
+    async def fetch_tenant(self, tenant: Dict[str, Any]):
+        """
+        One tenant's endpoint health as (tenant id, name, health).
+        """
+        health_check = await self.endpoint_health_client.get_endpoint_health(
+            api_host=tenant["apiHost"],
+            tenant_id=tenant["id"],
+        )
+        return tenant["id"], tenant["showAs"], health_check
@@ -0,0 +1,74 @@
+# app/services/export_cache.py
+
+import hashlib
+import os
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.export_job import ExportJob
+
+# Jobs a new identical request attaches to instead of starting another export
+IN_FLIGHT_STATUSES = ("queued", "running")
+
+
+def export_cache_key(
+    date_from: date,
+    date_to: date,
+    tenant_id: str | None,
+    fmt: str,
+) -> str:
+    """
+    Content address of an export: same normalised parameters, same file.
+    """
+    tenant = (tenant_id or "").strip().lower() or "*"
+    normalised = f"{date_from.isoformat()}|{date_to.isoformat()}|{tenant}|{fmt}"
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+
+async def lock_cache_key(db: AsyncSession, cache_key: str):
+    """
+    Serialise submissions for the same key until the current transaction
+    ends, so two identical requests cannot both start an export.
+    """
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(cache_key))))
+
+
+async def find_reusable_job(db: AsyncSession, cache_key: str) -> ExportJob | None:
+    """
+    Return a queued/running job for the key, or a completed one that is
+    still fresh and whose file is still on disk.
+    """
+    result = await db.execute(
+        select(ExportJob)
+        .where(
+            ExportJob.cache_key == cache_key,
+            ExportJob.status.in_(IN_FLIGHT_STATUSES),
+        )
+        .order_by(ExportJob.created_at.desc())
+        .limit(1)
+    )
+    in_flight = result.scalar_one_or_none()
+    if in_flight:
+        return in_flight
+
+    # Fresh means recently finished: a long export's data is as old as its
+    # completion, not its submission
+    fresh_after = datetime.utcnow() - timedelta(seconds=settings.EXPORT_CACHE_TTL_SECONDS)
+    result = await db.execute(
+        select(ExportJob)
+        .where(
+            ExportJob.cache_key == cache_key,
+            ExportJob.status == "completed",
+            ExportJob.completed_at >= fresh_after,
+        )
+        .order_by(ExportJob.completed_at.desc())
+        .limit(1)
+    )
+    completed = result.scalar_one_or_none()
+    if completed and completed.file_path and os.path.exists(completed.file_path):
+        return completed
+
+    return None
@@ -0,0 +1,164 @@
+# app/services/export_estimator.py
+#
+# Export duration / volume model, learned from past jobs.
+#
+# Every export runs with a WorkMeter (app/core/work_meter.py) that counts its
+# work units per stage and tenant: upstream requests for the collection
+# stages (alert pages, case pages, detection calls, ...), sheets for "write".
+# When a job finishes its volumes and stage timings are folded into moving
+# averages in Redis:
+#
+#   export:volume      "<tenant id>:<stage>" -> units per day (per job for
+#                      stages that don't depend on the date range)
+#   export:stage_rate  "<stage>"             -> wall seconds per unit
+#   export:cost        "tenants"             -> tenant count last seen
+#
+# estimate_export() turns that into predicted units and seconds per stage.
+# The scheduler uses it to pick a lane, the API exposes it for admission
+# checks, and the WorkMeter uses it for live percent / ETA.
+
+import logging
+from datetime import date
+from typing import Any, Dict, List
+
+from app.core.work_meter import WorkMeter
+from app.services.redis_queue import redis_client
+
+logger = logging.getLogger("app.export_estimator")
+
+VOLUME_KEY = "export:volume"
+RATE_KEY = "export:stage_rate"
+COST_KEY = "export:cost"
+
+# In the order TelemetryExportService runs them
+EXPORT_STAGES = ["alerts", "sla", "mttd", "mtta", "mttr", "endpoint", "write"]
+
+# Stages whose volume grows with the date range
+DATE_SCALED_STAGES = {"alerts", "sla", "mttd", "mtta", "mttr"}
+
+# Until a tenant / stage has history
+DEFAULT_UNITS = {
+    "alerts": 0.2,
+    "sla": 0.1,
+    "mttd": 1.0,
+    "mtta": 0.1,
+    "mttr": 0.1,
+    "endpoint": 1,
+    "write": 1,
+}
+DEFAULT_SECONDS_PER_UNIT = 0.25
+MIN_SECONDS_PER_UNIT = 0.001  # keeps every stage weighted in the percent
+DEFAULT_TENANT_COUNT = 50
+
+EXPORT_OVERHEAD_SECONDS = 20
+ALPHA = 0.3  # weight of the newest job in the moving averages
+
+
+def _read_model() -> tuple[Dict[tuple[str, str], float], Dict[str, float], Dict[str, float]]:
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hgetall(VOLUME_KEY)
+    pipe.hgetall(RATE_KEY)
+    pipe.hgetall(COST_KEY)
+    raw_volumes, raw_rates, raw_cost = pipe.execute()
+
+    volumes = {}
+    for field, value in raw_volumes.items():
+        tenant_id, _, stage = field.decode().rpartition(":")
+        volumes[(tenant_id, stage)] = float(value)
+
+    rates = {k.decode(): float(v) for k, v in raw_rates.items()}
+    cost = {k.decode(): float(v) for k, v in raw_cost.items()}
+    return volumes, rates, cost
+
+
+def _ewma(old: float | None, sample: float) -> float:
+    return sample if old is None else ALPHA * sample + (1 - ALPHA) * old
+
+
+def estimate_export(
+    date_from: date,
+    date_to: date,
+    tenant_ids: List[str] | None = None,
+    stages: List[str] = EXPORT_STAGES,
+) -> Dict[str, Any]:
+    """
+    Predicted work units and seconds per stage for an export. tenant_ids
+    None means all tenants: every tenant with history, plus the average
+    tenant for any the model hasn't seen yet.
+    """
+    days = max((date_to - date_from).days, 1)
+    volumes, rates, cost = _read_model()
+
+    if tenant_ids is None:
+        tenant_ids = sorted({tenant for tenant, _ in volumes})
+        tenant_count = max(int(cost.get("tenants", DEFAULT_TENANT_COUNT)), len(tenant_ids))
+    else:
+        tenant_count = len(tenant_ids)
+    unknown = tenant_count - len(tenant_ids)
+
+    planned = {}
+    for stage in stages:
+        per_tenant = [volumes.get((tenant, stage)) for tenant in tenant_ids]
+        known = [v for v in per_tenant if v is not None]
+        fallback = sum(known) / len(known) if known else DEFAULT_UNITS[stage]
+
+        units = sum(fallback if v is None else v for v in per_tenant) + unknown * fallback
+        if stage in DATE_SCALED_STAGES:
+            units *= days
+        units = max(units, tenant_count)  # at least one request / sheet per tenant
+
+        seconds = units * max(rates.get(stage, DEFAULT_SECONDS_PER_UNIT), MIN_SECONDS_PER_UNIT)
+        planned[stage] = {"units": round(units, 1), "seconds": round(seconds, 1)}
+
+    total = EXPORT_OVERHEAD_SECONDS + sum(s["seconds"] for s in planned.values())
+    return {
+        "tenants": tenant_count,
+        "days": days,
+        "stages": planned,
+        "total_seconds": round(total, 1),
+    }
+
+
+def record_export_volumes(meter: WorkMeter, date_from: date, date_to: date):
+    """
+    Fold a finished export's volumes and stage timings into the model.
+    Jobs served partly from the data cache are skipped: their request
+    counts and timings would understate a cold export.
+    """
+    if meter.cache_hits:
+        logger.info("Export volumes not recorded, %d calls were cached", meter.cache_hits)
+        return
+
+    days = max((date_to - date_from).days, 1)
+    volumes, rates, _ = _read_model()
+
+    new_volumes = {}
+    for tenant_id, counts in meter.tenant_units.items():
+        for stage, units in counts.items():
+            sample = units / days if stage in DATE_SCALED_STAGES else units
+            new_volumes[f"{tenant_id}:{stage}"] = round(
+                _ewma(volumes.get((tenant_id, stage)), sample), 4
+            )
+
+    new_rates = {}
+    for stage, seconds in meter.stage_seconds.items():
+        units = meter.units.get(stage)
+        if units:
+            new_rates[stage] = round(_ewma(rates.get(stage), seconds / units), 4)
+
+    pipe = redis_client.pipeline(transaction=False)
+    if new_volumes:
+        pipe.hset(VOLUME_KEY, mapping=new_volumes)
+    if new_rates:
+        pipe.hset(RATE_KEY, mapping=new_rates)
+    pipe.execute()
+
+    logger.info(
+        "Recorded export volumes: %d tenant/stage volumes, stage seconds %s",
+        len(new_volumes),
+        {stage: round(s, 1) for stage, s in meter.stage_seconds.items()},
+    )
+
+
+def record_tenant_count(tenants: int):
+    redis_client.hset(COST_KEY, "tenants", tenants)
@@ -0,0 +1,86 @@
+# app/services/export_events.py
+#
+# Export job progress as a Redis stream (export:events), relayed to the
+# browser as server-sent events by /exports/events and
+# /exports/{job_id}/events.
+#
+# Every entry is {"job_id": ..., "data": <json>} where data carries whatever
+# changed: status, progress, file_path, error.
+
+import json
+import logging
+
+import redis.asyncio as aioredis
+
+from app.services.redis_queue import REDIS_HOST, REDIS_PORT, redis_client
+
+logger = logging.getLogger("app.export_events")
+
+EVENTS_STREAM = "export:events"
+EVENTS_STREAM_MAXLEN = 10000  # approximate, trimmed by XADD
+KEEPALIVE_MS = 15000
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Blocking XREADs each hold a pooled connection for up to KEEPALIVE_MS
+async_redis = aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0)
+
+
+def publish_job_event(job_id: str, **data) -> None:
+    """
+    Append a job event to the stream. Never raises: progress events are
+    best effort and must not fail the export.
+    """
+    payload = {"job_id": job_id, **data}
+    try:
+        redis_client.xadd(
+            EVENTS_STREAM,
+            {"job_id": job_id, "data": json.dumps(payload, default=str)},
+            maxlen=EVENTS_STREAM_MAXLEN,
+            approximate=True,
+        )
+    except Exception:
+        logger.warning("Could not publish event for job %s", job_id, exc_info=True)
+
+
+async def latest_event_id() -> str:
+    """
+    ID of the newest entry, so a snapshot taken after this call plus the
+    entries after it never miss an update.
+    """
+    entries = await async_redis.xrevrange(EVENTS_STREAM, count=1)
+    return entries[0][0].decode() if entries else "0-0"
+
+
+def format_sse(data: str, event: str, event_id: str | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def job_event_stream(request, last_id: str, job_id: str | None = None):
+    """
+    Relay stream entries after last_id as SSE until the client goes away,
+    or, for a single job, until it reaches a terminal status.
+    """
+    while not await request.is_disconnected():
+        entries = await async_redis.xread(
+            {EVENTS_STREAM: last_id}, block=KEEPALIVE_MS, count=100
+        )
+        if not entries:
+            yield ": keep-alive\n\n"
+            continue
+
+        for _, messages in entries:
+            for entry_id, fields in messages:
+                last_id = entry_id.decode()
+                if job_id and fields[b"job_id"].decode() != job_id:
+                    continue
+
+                data = fields[b"data"].decode()
+                yield format_sse(data, "progress", last_id)
+
+                if job_id and json.loads(data).get("status") in TERMINAL_STATUSES:
+                    return
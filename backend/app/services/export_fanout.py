@@ -0,0 +1,232 @@
+# app/services/export_fanout.py
+#
+# Splits an all-tenant export into shard sub-jobs on the telemetry queue:
+#
+#   parent job  -> lists tenants, enqueues N shard jobs + 1 merge job, returns
+#   shard job   -> collects its tenant slice, writes a partial JSON file
+#   merge job   -> runs once every shard is done, merges partials, writes file
+#
+# The parent ExportJob row stays "running" for the whole fan-out and carries
+# the combined progress. Fan-out state lives in Redis under
+# export:fanout:<parent job id>.
+
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List
+
+from rq.exceptions import NoSuchJobError
+from rq.job import Dependency, Job
+
+from app.exporters.dataset import ExportDataset
+from app.services.export_service import EXPORT_DIR
+from app.services.redis_queue import redis_client, telemetry_queue
+
+logger = logging.getLogger("app.export_fanout")
+
+FANOUT_TTL_SECONDS = 60 * 60 * 4  # outlives the 2h job timeout of every member
+SHARD_JOB_TIMEOUT = 60 * 60 * 2
+
+# Shards report collection progress; the merge owns 90-100%
+COLLECT_PERCENT_SHARE = 90
+
+
+def fanout_key(parent_id: str) -> str:
+    return f"export:fanout:{parent_id}"
+
+
+def fanout_progress_key(parent_id: str) -> str:
+    return f"export:fanout:{parent_id}:progress"
+
+
+def partials_dir(parent_id: str) -> Path:
+    return EXPORT_DIR / "partials" / parent_id
+
+
+def partial_path(parent_id: str, shard_index: int) -> Path:
+    return partials_dir(parent_id) / f"shard-{shard_index:04d}.json"
+
+
+def chunk_tenants(tenants: List[Dict[str, Any]], size: int) -> List[List[Dict[str, Any]]]:
+    return [tenants[i:i + size] for i in range(0, len(tenants), size)]
+
+
+def start_fanout(
+    parent_id: str,
+    date_from: str,
+    date_to: str,
+    fmt: str,
+    tenants: List[Dict[str, Any]],
+    shard_size: int,
+    force: bool = False,
+) -> int:
+    """
+    Enqueue one shard job per tenant slice plus a merge job that depends on
+    all of them. Returns the number of shards.
+    """
+    partials_dir(parent_id).mkdir(parents=True, exist_ok=True)
+
+    # Register before enqueueing so a shard that starts immediately can
+    # already report progress against the right shard count
+    shards = chunk_tenants(tenants, shard_size)
+    redis_client.hset(fanout_key(parent_id), mapping={"shards": len(shards)})
+    redis_client.expire(fanout_key(parent_id), FANOUT_TTL_SECONDS)
+
+    # Enqueued by import path: the sync wrappers import the workers, which
+    # import this module
+    shard_jobs = []
+    for idx, shard in enumerate(shards):
+        shard_jobs.append(
+            telemetry_queue.enqueue(
+                "app.workers.telemetry_export_sync.run_export_shard_sync",
+                parent_id,
+                idx,
+                date_from,
+                date_to,
+                shard,
+                force,
+                job_timeout=SHARD_JOB_TIMEOUT,
+                failure_ttl=FANOUT_TTL_SECONDS,
+            )
+        )
+
+    # allow_failure: the merge still runs when a shard fails, and marks the
+    # parent failed instead of leaving it "running" forever
+    merge_job = telemetry_queue.enqueue(
+        "app.workers.telemetry_export_sync.run_export_merge_sync",
+        parent_id,
+        len(shards),
+        date_from,
+        date_to,
+        fmt,
+        depends_on=Dependency(jobs=shard_jobs, allow_failure=True),
+        job_timeout=SHARD_JOB_TIMEOUT,
+        result_ttl=0,
+        failure_ttl=FANOUT_TTL_SECONDS,
+    )
+
+    redis_client.hset(
+        fanout_key(parent_id),
+        mapping={
+            "children": json.dumps([job.id for job in shard_jobs]),
+            "merge": merge_job.id,
+        },
+    )
+    redis_client.expire(fanout_key(parent_id), FANOUT_TTL_SECONDS)
+
+    logger.info(
+        "Export %s fanned out into %d shards (merge job %s)",
+        parent_id,
+        len(shards),
+        merge_job.id,
+    )
+    return len(shards)
+
+
+def is_fanned_out(parent_id: str) -> bool:
+    return bool(redis_client.exists(fanout_key(parent_id)))
+
+
+def fanned_out_many(parent_ids: List[str]) -> List[bool]:
+    """
+    is_fanned_out for many jobs in one pipelined round-trip.
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    for parent_id in parent_ids:
+        pipe.exists(fanout_key(parent_id))
+    return [bool(found) for found in pipe.execute()]
+
+
+def record_shard_progress(parent_id: str, shard_index: int, percent: int) -> Dict[str, int]:
+    """
+    Store one shard's percent (0-100) and return the combined progress
+    across all shards, scaled into the parent's collection share.
+    """
+    progress_key = fanout_progress_key(parent_id)
+    pipe = redis_client.pipeline()
+    pipe.hset(progress_key, str(shard_index), percent)
+    pipe.expire(progress_key, FANOUT_TTL_SECONDS)
+    pipe.hgetall(progress_key)
+    pipe.hget(fanout_key(parent_id), "shards")
+    _, _, per_shard, shards = pipe.execute()
+
+    shards = int(shards or len(per_shard) or 1)
+    values = [int(v) for v in per_shard.values()]
+
+    return {
+        "percent": COLLECT_PERCENT_SHARE * sum(values) // (100 * shards),
+        "shards": shards,
+        "shards_done": sum(1 for v in values if v >= 100),
+    }
+
+
+def write_partial(parent_id: str, shard_index: int, dataset: ExportDataset):
+    path = partial_path(parent_id, shard_index)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(dataset.to_dict(), fh, default=str)
+    tmp.replace(path)  # merge never sees a half-written shard
+
+
+def read_partials(parent_id: str, shards: int) -> List[ExportDataset]:
+    """
+    Load every shard's partial in shard order. Raises FileNotFoundError
+    naming the missing shards if any did not finish.
+    """
+    missing = [idx for idx in range(shards) if not partial_path(parent_id, idx).exists()]
+    if missing:
+        raise FileNotFoundError(f"Missing export shards: {missing}")
+
+    parts = []
+    for idx in range(shards):
+        with open(partial_path(parent_id, idx), encoding="utf-8") as fh:
+            parts.append(ExportDataset(**json.load(fh)))
+    return parts
+
+
+def _member_job_ids(parent_id: str) -> tuple[List[str], str | None]:
+    state = redis_client.hgetall(fanout_key(parent_id))
+    children = state.get(b"children")
+    merge = state.get(b"merge")
+    return (json.loads(children) if children else []), (merge.decode() if merge else None)
+
+
+def cancel_fanout(parent_id: str) -> int:
+    """
+    Cancel the shards of a fanned-out export that have not started yet.
+    Running shards hear the published cancel and return early. The merge
+    job is left alone: once every shard has stopped it runs, sees the
+    parent "cancelling", marks it cancelled and cleans up.
+    Returns the number of shards cancelled.
+    """
+    shard_ids, merge_id = _member_job_ids(parent_id)
+    merge_dependencies = Job(merge_id, connection=redis_client).dependencies_key if merge_id else None
+
+    touched = 0
+    for job_id in shard_ids:
+        try:
+            job = Job.fetch(job_id, connection=redis_client)
+        except NoSuchJobError:
+            continue
+
+        status = job.get_status()
+        if status not in ("queued", "scheduled"):
+            continue
+        try:
+            # Out of the merge's dependencies first (RQ never counts a
+            # cancelled dependency as met), then cancel; the last shard
+            # to go enqueues the merge
+            if merge_dependencies:
+                redis_client.srem(merge_dependencies, job_id)
+            job.cancel(enqueue_dependents=True)
+            touched += 1
+        except Exception:
+            logger.warning("Could not cancel fan-out shard %s (%s)", job_id, status)
+
+    return touched
+
+
+def cleanup_fanout(parent_id: str):
+    redis_client.delete(fanout_key(parent_id), fanout_progress_key(parent_id))
+    shutil.rmtree(partials_dir(parent_id), ignore_errors=True)
@@ -1,8 +1,16 @@
 # app/services/export_job_service.py
 
-from sqlalchemy import select, update
+from datetime import date, datetime
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app.models.export_job import ExportJob
+from app.services.export_cache import export_cache_key, find_reusable_job, lock_cache_key
+from app.services.export_events import publish_job_event
+from app.services.export_scheduling import enqueue_export, queue_positions, queued_progress
+from app.utils.exceptions import JobStatusConflict
 
 ALLOWED_TRANSITIONS = {
     "queued": ["running", "cancelled", "failed"],
@@ -13,6 +21,78 @@ ALLOWED_TRANSITIONS = {
     "cancelled": ["queued"],
 }
 
+async def submit_export(
+    db: AsyncSession,
+    date_from: date,
+    date_to: date,
+    tenant_id: str | None,
+    fmt: str,
+    *,
+    force: bool = False,
+) -> dict:
+    """
+    Queue an export (POST /exports/ and scheduled exports). Commits.
+    """
+    # Identical (date_from, date_to, tenant_id, format) requests share one
+    # export: attach to a queued/running job or return a fresh completed one.
+    # force=true always starts a new export.
+    cache_key = export_cache_key(date_from, date_to, tenant_id, fmt)
+    await lock_cache_key(db, cache_key)
+
+    if not force:
+        existing = await find_reusable_job(db, cache_key)
+        if existing:
+            await db.commit()  # release the advisory lock
+            if existing.status == "completed":
+                return {
+                    "job_id": existing.job_id,
+                    "status": existing.status,
+                    "file_path": existing.file_path,
+                    "cached": True,
+                }
+            return {
+                "job_id": existing.job_id,
+                "status": existing.status,
+                "attached": True,
+            }
+
+    # Enqueue RQ job (sync wrapper handles async) on the lane that fits
+    # its estimated cost, see app/services/export_scheduling.py. Blocking
+    # Redis calls, kept off the event loop
+    job, position = await run_in_threadpool(
+        _enqueue_with_position, date_from.isoformat(), date_to.isoformat(), tenant_id, fmt, force
+    )
+    progress = queued_progress(position)
+
+    # Insert job in DB
+    await db.execute(
+        insert(ExportJob).values(
+            job_id=job.id,
+            date_from=date_from,
+            date_to=date_to,
+            tenant_id=tenant_id,
+            format=fmt,
+            cache_key=cache_key,
+            status=job._status,
+            progress=progress,
+        )
+    )
+    await db.commit()
+    publish_job_event(job.id, status=job._status, progress=progress)
+
+    return {
+        # "id": job_id, 
+        "job_id": job.id,
+        "status": job._status,
+        "progress": progress,
+    }
+
+
+def _enqueue_with_position(date_from: str, date_to: str, tenant_id: str | None, fmt: str, force: bool):
+    job = enqueue_export(date_from, date_to, tenant_id, fmt, force=force)
+    return job, queue_positions().get(job.id, {})
+
+
 async def update_job_status(
     db: AsyncSession,
     job_id: str,
@@ -22,14 +102,54 @@ async def update_job_status(
     error: str | None = None,
     file_path: str | None = None,
 ):
+    # The event is published once the change is committed, never for a
+    # rollback (the caller's commit, or ours when there is no transaction)
     if not db.in_transaction():
         async with db.begin():
             job = await _update_job_status_inner(db, job_id, new_status, progress, error, file_path)
+            _queue_job_event(db, job)
     else:
         job = await _update_job_status_inner(db, job_id, new_status, progress, error, file_path)
+        _queue_job_event(db, job)
 
     return job
 
+
+PENDING_EVENTS_KEY = "pending_job_events"
+
+
+def _queue_job_event(db: AsyncSession, job: ExportJob | None):
+    if job is None:
+        return
+    db.info.setdefault(PENDING_EVENTS_KEY, []).append(
+        dict(
+            job_id=job.job_id,
+            status=job.status,
+            progress=job.progress,
+            error=job.error,
+            file_path=job.file_path,
+        )
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_events(session: Session):
+    for data in session.info.pop(PENDING_EVENTS_KEY, []):
+        publish_job_event(**data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back_events(session: Session):
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+def allowed_from(new_status: str) -> list[str]:
+    """
+    Statuses a job may move to new_status from.
+    """
+    return [status for status, targets in ALLOWED_TRANSITIONS.items() if new_status in targets]
+
+
 async def _update_job_status_inner(
     db: AsyncSession,
     job_id: str,
@@ -38,28 +158,39 @@ async def _update_job_status_inner(
     error: str | None,
     file_path: str | None,
 ):
-    result = await db.execute(select(ExportJob).where(ExportJob.job_id == job_id))
-    job = result.scalar_one_or_none()
-    if not job:
-        return None
-
-    if job.status == new_status:
-        return job
-
-    if new_status not in ALLOWED_TRANSITIONS[job.status]:
-        raise ValueError(f"Invalid status transition: {job.status} to {new_status}")
-
-    job.status = new_status
+    # Compare-and-set: the transition check and the write are one
+    # statement, so a concurrent cancel and complete cannot both apply
+    values = {"status": new_status}
     if progress is not None:
-        job.progress = progress
+        values["progress"] = progress
     if error is not None:
-        job.error = error
+        values["error"] = error
     if file_path is not None:
-        job.file_path = file_path
+        values["file_path"] = file_path
+    if new_status == "completed":
+        values["completed_at"] = datetime.utcnow()  # export reuse freshness
 
-    # Force flush so the change is persisted immediately
-    await db.flush()
-    return job
+    result = await db.execute(
+        update(ExportJob)
+        .where(
+            ExportJob.job_id == job_id,
+            ExportJob.status.in_(allowed_from(new_status)),
+        )
+        .values(**values)
+        .returning(ExportJob)
+        .execution_options(populate_existing=True)
+    )
+    job = result.scalar_one_or_none()
+    if job is not None:
+        return job
+
+    # Nothing matched: missing job, already in new_status, or a conflict
+    result = await db.execute(select(ExportJob).where(ExportJob.job_id == job_id))
+    job = result.scalar_one_or_none()
+    if job is None or job.status == new_status:
+        return job
+
+    raise JobStatusConflict(job_id, job.status, new_status)
 
 
 async def update_job_progress_only(
@@ -83,28 +214,8 @@ async def _apply_job_status_update(
     error: str | None = None,
     file_path: str | None = None,
 ):
-    result = await db.execute(
-        select(ExportJob).where(ExportJob.job_id == job_id)
-    )
-    job = result.scalar_one_or_none()
-
-    if not job:
-        return None
-
-    if job.status == new_status:
-        return job
-
-    if new_status not in ALLOWED_TRANSITIONS[job.status]:
-        raise ValueError(
-            f"Invalid status transition: {job.status} to {new_status}"
-        )
-
-    job.status = new_status
-    if progress is not None:
-        job.progress = progress
-    if error is not None:
-        job.error = error
-    if file_path is not None:
-        job.file_path = file_path
-
-    return job
+    """
+    Same compare-and-set as update_job_status, inside the caller's
+    transaction and without publishing an event.
+    """
+    return await _update_job_status_inner(db, job_id, new_status, progress, error, file_path)
@@ -0,0 +1,234 @@
+# app/services/export_leases.py
+#
+# Leases for running exports.
+#
+# A worker takes the lease on a job before it touches it:
+#
+#   export:lease:<job id>  -> owner token, expires after EXPORT_LEASE_SECONDS
+#   export:leases          -> zset job id -> lease expiry (unix time)
+#
+# A heartbeat thread per worker process (LeaseKeeper) renews every lease the
+# process holds each EXPORT_LEASE_HEARTBEAT_SECONDS. It is a thread, not a
+# task, so a busy event loop (Excel writing, a big merge) can't miss a beat:
+# an expired lease really means the process is gone (or lost Redis).
+#
+# The API's lease watcher (app/workers/reconcile_jobs.recover_expired_leases)
+# requeues jobs whose lease ran out within seconds, instead of waiting for
+# the hourly reconcile.
+#
+# Ownership: the lease is taken with SET NX and renewed / released only by
+# its owner token. A worker that finds the lease taken doesn't run the job;
+# a worker whose renewal fails (lease expired and the job was requeued) has
+# its export cancelled and writes no more status.
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, List
+
+from app.core.config import settings
+from app.services.redis_queue import redis_client
+
+logger = logging.getLogger("app.export_leases")
+
+LEASES_KEY = "export:leases"
+
+# SET NX + index, atomically
+_ACQUIRE = redis_client.register_script("""
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+    return 1
+end
+return 0
+""")
+
+# Only the owner renews
+_RENEW = redis_client.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+    return 1
+end
+return 0
+""")
+
+# Only the owner releases
+_RELEASE = redis_client.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('ZREM', KEYS[2], ARGV[2])
+    return 1
+end
+return 0
+""")
+
+# Drop an expired lease's index entry, unless it was re-taken
+_FORGET = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[1])
+end
+return 0
+""")
+
+
+def lease_key(job_id: str) -> str:
+    return f"export:lease:{job_id}"
+
+
+class Lease:
+    """
+    A held lease. `lost` is set by the heartbeat when renewal fails.
+    """
+
+    def __init__(self, job_id: str, token: str, task: asyncio.Task | None):
+        self.job_id = job_id
+        self.token = token
+        self.task = task
+        self.loop = task.get_loop() if task else None
+        self.lost = False
+
+    def held(self) -> bool:
+        """
+        Still ours, checked in Redis (fence for status writes).
+        """
+        if self.lost:
+            return False
+        owner = redis_client.get(lease_key(self.job_id))
+        return owner is not None and owner.decode() == self.token
+
+
+# -----------------------------
+# Heartbeat
+# -----------------------------
+class LeaseKeeper:
+    """
+    Renews every lease this process holds, from its own thread.
+    """
+
+    def __init__(self):
+        self._leases: Dict[str, Lease] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def add(self, lease: Lease):
+        with self._lock:
+            self._leases[lease.job_id] = lease
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="export-lease-keeper", daemon=True
+                )
+                self._thread.start()
+
+    def discard(self, lease: Lease):
+        with self._lock:
+            if self._leases.get(lease.job_id) is lease:
+                del self._leases[lease.job_id]
+
+    def _run(self):
+        while True:
+            time.sleep(settings.EXPORT_LEASE_HEARTBEAT_SECONDS)
+            with self._lock:
+                leases = list(self._leases.values())
+            if leases:
+                try:
+                    self.renew(leases)
+                except Exception:
+                    # Redis down: keep trying, the leases may still be valid
+                    logger.warning("Lease heartbeat failed", exc_info=True)
+
+    def renew(self, leases: List[Lease]):
+        ttl_ms = settings.EXPORT_LEASE_SECONDS * 1000
+        expires = time.time() + settings.EXPORT_LEASE_SECONDS
+
+        pipe = redis_client.pipeline(transaction=False)
+        for lease in leases:
+            _RENEW(
+                keys=[lease_key(lease.job_id), LEASES_KEY],
+                args=[lease.token, ttl_ms, expires, lease.job_id],
+                client=pipe,
+            )
+
+        for lease, renewed in zip(leases, pipe.execute()):
+            if not renewed:
+                self._lose(lease)
+
+    def _lose(self, lease: Lease):
+        logger.warning("Lease on %s lost, stopping this run of it", lease.job_id)
+        lease.lost = True
+        self.discard(lease)
+        if lease.task is not None and not lease.task.done():
+            lease.loop.call_soon_threadsafe(lease.task.cancel)
+
+
+_keeper = LeaseKeeper()
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+def acquire_lease(job_id: str) -> Lease | None:
+    """
+    Take the lease on job_id for the current task. None if another worker
+    holds it.
+    """
+    token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    acquired = _ACQUIRE(
+        keys=[lease_key(job_id), LEASES_KEY],
+        args=[
+            token,
+            settings.EXPORT_LEASE_SECONDS * 1000,
+            time.time() + settings.EXPORT_LEASE_SECONDS,
+            job_id,
+        ],
+    )
+    if not acquired:
+        return None
+
+    lease = Lease(job_id, token, asyncio.current_task())
+    _keeper.add(lease)
+    return lease
+
+
+def release_lease(lease: Lease):
+    _keeper.discard(lease)
+    if lease.lost:
+        return
+    try:
+        _RELEASE(keys=[lease_key(lease.job_id), LEASES_KEY], args=[lease.token, lease.job_id])
+    except Exception:
+        # Expires on its own; the watcher then finds a finished job
+        logger.warning("Could not release lease on %s", lease.job_id, exc_info=True)
+
+
+# -----------------------------
+# Watcher side
+# -----------------------------
+def expired_leases() -> List[str]:
+    """
+    Jobs whose lease ran out without being released.
+    """
+    job_ids = [j.decode() for j in redis_client.zrangebyscore(LEASES_KEY, "-inf", time.time())]
+    if not job_ids:
+        return []
+
+    # Re-taken meanwhile (new owner) -> not expired
+    return [job_id for job_id, live in zip(job_ids, leases_held(job_ids)) if not live]
+
+
+def leases_held(job_ids: List[str]) -> List[bool]:
+    pipe = redis_client.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.exists(lease_key(job_id))
+    return [bool(live) for live in pipe.execute()]
+
+
+def forget_leases(job_ids: List[str]):
+    # Leaves the entry of a job that a new owner has leased meanwhile
+    pipe = redis_client.pipeline(transaction=False)
+    for job_id in job_ids:
+        _FORGET(keys=[lease_key(job_id), LEASES_KEY], args=[job_id], client=pipe)
+    pipe.execute()
@@ -0,0 +1,164 @@
+# app/services/export_schedules.py
+#
+# Recurring exports (app/models/export_schedule.py) on the RQ scheduler.
+#
+# Each enabled schedule has exactly one run waiting in a lane's
+# ScheduledJobRegistry, with a deterministic job id (schedule-<id>-<ts>).
+# When that run starts it queues the next one from the cron expression
+# (app/workers/scheduled_exports.py), so schedules chain themselves. The
+# workers need --with-scheduler for the runs to be picked up.
+#
+# sync_schedules() repairs the chain (new / edited / disabled schedules,
+# a flushed Redis) and runs at API startup and with every reconcile.
+#
+# Cron expressions are UTC. Periods are [date_from, date_to) like exports.
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Tuple
+
+from croniter import croniter
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+from rq.registry import ScheduledJobRegistry
+from sqlalchemy import select
+
+from app.models.export_schedule import ExportSchedule
+from app.services.export_scheduling import EXPORT_JOB_TIMEOUT
+from app.services.redis_queue import LANES, redis_client, telemetry_low_queue, telemetry_queue
+
+logger = logging.getLogger("app.export_schedules")
+
+MODES = ("export", "prewarm")
+
+
+# -----------------------------
+# Periods
+# -----------------------------
+def _last_month(today: date) -> Tuple[date, date]:
+    end = today.replace(day=1)
+    return (end - timedelta(days=1)).replace(day=1), end
+
+
+PERIODS = {
+    "yesterday": lambda today: (today - timedelta(days=1), today),
+    "last_7_days": lambda today: (today - timedelta(days=7), today),
+    "last_week": lambda today: (
+        today - timedelta(days=today.weekday() + 7),
+        today - timedelta(days=today.weekday()),
+    ),
+    "last_month": _last_month,
+    "month_to_date": lambda today: (today.replace(day=1), today),
+}
+
+
+def period_range(period: str, today: date | None = None) -> Tuple[date, date]:
+    """
+    (date_from, date_to) of a schedule period, date_to exclusive.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    date_from, date_to = PERIODS[period](today)
+    # month_to_date on the 1st: still export something
+    return date_from, max(date_to, date_from + timedelta(days=1))
+
+
+# -----------------------------
+# Cron
+# -----------------------------
+def is_valid_cron(cron: str) -> bool:
+    return croniter.is_valid(cron)
+
+
+def next_run_at(cron: str, after: datetime | None = None) -> datetime:
+    """
+    Next cron fire time after `after` (naive UTC, like the DB columns).
+    """
+    after = after or datetime.utcnow()
+    return croniter(cron, after).get_next(datetime)
+
+
+# -----------------------------
+# RQ scheduler
+# -----------------------------
+def schedule_job_id(schedule_id: int, run_at: datetime) -> str:
+    return f"schedule-{schedule_id}-{int(run_at.replace(tzinfo=timezone.utc).timestamp())}"
+
+
+def _lane(schedule: ExportSchedule):
+    # Pre-warms are background work, exports queue where a normal export
+    # would (the run itself only submits it)
+    return telemetry_low_queue if schedule.mode == "prewarm" else telemetry_queue
+
+
+def enqueue_schedule_run(schedule: ExportSchedule, run_at: datetime) -> str:
+    """
+    Put the run of `schedule` at `run_at` in the RQ scheduler, unless it
+    is already there. Returns the job id.
+    """
+    job_id = schedule_job_id(schedule.id, run_at)
+    try:
+        Job.fetch(job_id, connection=redis_client)
+        return job_id
+    except NoSuchJobError:
+        pass
+
+    # By import path: the sync wrappers import the workers
+    _lane(schedule).enqueue_at(
+        run_at.replace(tzinfo=timezone.utc),
+        "app.workers.telemetry_export_sync.run_schedule_sync",
+        schedule.id,
+        job_id=job_id,
+        job_timeout=EXPORT_JOB_TIMEOUT,
+        result_ttl=0,
+        failure_ttl=0,
+    )
+    logger.info("Schedule %s: next run %s at %s", schedule.id, job_id, run_at.isoformat())
+    return job_id
+
+
+def cancel_schedule_runs(schedule_id: int, keep: str | None = None) -> int:
+    """
+    Remove the scheduled runs of a schedule (except `keep`). Returns the
+    number removed.
+    """
+    prefix = f"schedule-{schedule_id}-"
+    removed = 0
+    for lane in LANES:
+        registry = ScheduledJobRegistry(queue=lane)
+        for job_id in registry.get_job_ids():
+            if job_id.startswith(prefix) and job_id != keep:
+                registry.remove(job_id, delete_job=True)
+                removed += 1
+    return removed
+
+
+async def sync_schedules() -> int:
+    """
+    Make sure every enabled schedule has its next run scheduled (and only
+    that one), and disabled schedules have none. Returns the number of
+    enabled schedules.
+    """
+    from app.core.database import get_worker_db
+
+    now = datetime.utcnow()
+    enabled = 0
+
+    async with get_worker_db() as db:
+        schedules = (await db.execute(select(ExportSchedule))).scalars().all()
+
+        for schedule in schedules:
+            if not schedule.enabled:
+                cancel_schedule_runs(schedule.id)
+                continue
+
+            enabled += 1
+            # A missed run (API / scheduler down) is skipped, not caught up
+            if schedule.next_run_at is None or schedule.next_run_at < now:
+                schedule.next_run_at = next_run_at(schedule.cron, now)
+
+            job_id = enqueue_schedule_run(schedule, schedule.next_run_at)
+            cancel_schedule_runs(schedule.id, keep=job_id)
+
+        await db.commit()
+
+    return enabled
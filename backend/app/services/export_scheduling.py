@@ -0,0 +1,219 @@
+# app/services/export_scheduling.py
+#
+# Cost-aware scheduling for export jobs.
+#
+# Exports go into one of three RQ queues ("lanes"), picked from an estimated
+# cost. Workers listen on all of them, highest lane first, so a two-minute
+# single-tenant export no longer waits behind a two-hour all-tenant one:
+#
+#   telemetry-high  -> estimated cost below EXPORT_LANE_FAST_MAX_SECONDS
+#   telemetry       -> everything in between (and fan-out shards / merges)
+#   telemetry-low   -> estimated cost above EXPORT_LANE_BULK_MIN_SECONDS
+#
+# Aging: a job that has waited EXPORT_QUEUE_AGING_SECONDS in a lane moves up
+# one lane, so big exports still run when the fast lane is never empty.
+#
+# Cost is the predicted run time from app/services/export_estimator.py.
+
+import heapq
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from rq import Worker
+from rq.job import Job
+from rq.registry import StartedJobRegistry
+from sqlalchemy import bindparam, update
+
+from app.core.config import settings
+from app.models.export_job import ExportJob
+from app.services.export_estimator import EXPORT_OVERHEAD_SECONDS, estimate_export
+from app.services.export_events import publish_job_event
+from app.services.redis_queue import (
+    LANES,
+    redis_client,
+    telemetry_high_queue,
+    telemetry_low_queue,
+    telemetry_queue,
+)
+
+logger = logging.getLogger("app.export_scheduling")
+
+EXPORT_JOB_TIMEOUT = 60 * 60 * 2
+
+
+# -----------------------------
+# Cost
+# -----------------------------
+def estimate_cost(date_from: date, date_to: date, tenant_id: str | None) -> float:
+    """
+    Estimated run time of an export, in seconds.
+    """
+    estimate = estimate_export(date_from, date_to, [tenant_id] if tenant_id else None)
+    return estimate["total_seconds"]
+
+
+def lane_for(cost: float):
+    if cost < settings.EXPORT_LANE_FAST_MAX_SECONDS:
+        return telemetry_high_queue
+    if cost > settings.EXPORT_LANE_BULK_MIN_SECONDS:
+        return telemetry_low_queue
+    return telemetry_queue
+
+
+# -----------------------------
+# Enqueue
+# -----------------------------
+def enqueue_export(
+    date_from: str,
+    date_to: str,
+    tenant_id: str | None,
+    fmt: str,
+    job_id: str | None = None,
+    force: bool = False,
+) -> Job:
+    """
+    Enqueue an export on the lane that matches its estimated cost.
+    force=True refetches instead of reading the data cache.
+    """
+    cost = estimate_cost(
+        datetime.strptime(date_from, "%Y-%m-%d").date(),
+        datetime.strptime(date_to, "%Y-%m-%d").date(),
+        tenant_id,
+    )
+    lane = lane_for(cost)
+
+    # By import path, like the fan-out jobs: the sync wrappers import the
+    # workers, which import this module
+    job = lane.enqueue(
+        "app.workers.telemetry_export_sync.run_export_sync",
+        date_from,
+        date_to,
+        tenant_id,
+        fmt,
+        force,
+        job_timeout=EXPORT_JOB_TIMEOUT,
+        result_ttl=0,
+        failure_ttl=0,
+        job_id=job_id,
+        meta={"estimated_cost": cost},
+    )
+    logger.info("Export %s queued on %s (estimated %ss)", job.id, lane.name, cost)
+    return job
+
+
+# -----------------------------
+# Aging
+# -----------------------------
+def promote_aged_jobs() -> int:
+    """
+    Move jobs that waited EXPORT_QUEUE_AGING_SECONDS in a lane up one lane.
+    Their wait starts over in the new lane. Returns the number moved.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.EXPORT_QUEUE_AGING_SECONDS)
+    moved = 0
+
+    for lower, higher in zip(LANES[1:], LANES[:-1]):
+        for job in lower.get_jobs():
+            enqueued_at = job.enqueued_at
+            if enqueued_at is None:
+                continue
+            if enqueued_at.tzinfo is None:
+                enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)
+            if enqueued_at > cutoff:
+                continue  # not FIFO: requeued jobs go back in at the front
+
+            lower.remove(job.id)
+            higher.enqueue_job(job)
+            moved += 1
+            logger.info("Export %s aged from %s to %s", job.id, lower.name, higher.name)
+
+    return moved
+
+
+# -----------------------------
+# Queue position / ETA
+# -----------------------------
+def queue_positions() -> Dict[str, Dict[str, Any]]:
+    """
+    Position and estimated start of every queued job, in the order workers
+    will pick them up. Start times come from handing the queue out to the
+    worker slots, starting with what the running jobs have left.
+    """
+    now = datetime.now(timezone.utc)
+
+    queued: List[tuple[Job, str]] = []
+    for lane in LANES:
+        queued.extend((job, lane.name) for job in lane.get_jobs())
+
+    running = []
+    for lane in LANES:
+        running.extend(StartedJobRegistry(queue=lane).get_job_ids())
+
+    # Free-at offsets (seconds from now) per worker slot
+    slots = [0.0] * max(Worker.count(connection=redis_client), 1)
+    for job in Job.fetch_many(running, connection=redis_client) if running else []:
+        if job is None or job.started_at is None:
+            continue
+        started_at = job.started_at
+        if started_at.tzinfo is None:
+            started_at = started_at.replace(tzinfo=timezone.utc)
+        elapsed = (now - started_at).total_seconds()
+        remaining = max(job.meta.get("estimated_cost", 0) - elapsed, 0)
+
+        # Each running job occupies the soonest-free slot
+        slots.sort()
+        slots[0] += remaining
+    heapq.heapify(slots)
+
+    positions = {}
+    for position, (job, lane_name) in enumerate(queued, start=1):
+        start = heapq.heappop(slots)
+        cost = job.meta.get("estimated_cost", EXPORT_OVERHEAD_SECONDS)
+        heapq.heappush(slots, start + cost)
+
+        positions[job.id] = {
+            "queue_position": position,
+            "lane": lane_name,
+            "estimated_cost_seconds": cost,
+            "estimated_start": (now + timedelta(seconds=start)).isoformat(),
+        }
+    return positions
+
+
+def queued_progress(position: Dict[str, Any]) -> Dict[str, Any]:
+    return {"stage": "Queued", **position}
+
+
+async def refresh_queue_progress() -> Dict[str, int]:
+    """
+    Age the lanes, then write position / estimated start into the progress
+    of every queued job (one executemany) and publish it. Run periodically
+    by the API.
+    """
+    from app.core.database import get_worker_db
+
+    moved = promote_aged_jobs()
+    positions = queue_positions()
+
+    if positions:
+        table = ExportJob.__table__
+        async with get_worker_db() as db:
+            await db.execute(
+                update(table)
+                .where(
+                    table.c.job_id == bindparam("b_job_id"),
+                    table.c.status == "queued",
+                )
+                .values(progress=bindparam("b_progress")),
+                [
+                    {"b_job_id": job_id, "b_progress": queued_progress(position)}
+                    for job_id, position in positions.items()
+                ],
+            )
+            await db.commit()
+
+        for job_id, position in positions.items():
+            publish_job_event(job_id, progress=queued_progress(position))
+
+    return {"queued": len(positions), "aged": moved}
@@ -1,6 +1,5 @@
 from datetime import date, datetime, time, timezone
 from pathlib import Path
-from openpyxl import Workbook
 from app.services.alert_service import AlertTelemetryService
 from app.services.case_service import CaseTelemetryService
 # from app.services.mttd_service import MTTDService
@@ -10,7 +9,16 @@ from app.services.mttr_service import MTTRService
 from app.services.endpoint_health_service import EndpointHealthService
 from app.exporters.excel.all_tenants_sheet import build_all_tenants_sheet
 from app.exporters.excel.tenant_sheet import build_tenant_sheet
+from app.exporters.excel.writer import create_streaming_workbook
+from app.exporters.dataset import ExportDataset
+from app.exporters.formats import DEFAULT_EXPORT_FORMAT, EXPORT_FORMATS
+from app.exporters.csv.csv_bundle import write_csv_bundle
+from app.exporters.ndjson.ndjson_export import write_ndjson
+from app.utils.helper import SheetTitleRegistry
+from app.core.work_meter import current_meter
+import asyncio
 import os
+import threading
 import time as time2
 
 EXPORT_DIR = Path("/code/exports")  # <-- Docker-mounted volume for persistence
@@ -52,10 +60,97 @@ class TelemetryExportService:
         Export telemetry to Excel and return the full file path.
         Returns None if export was cancelled.
         """
+        return await self.export(date_from, date_to, tenant_id, "xlsx")
+
+    async def export(
+        self,
+        date_from: date,
+        date_to: date,
+        tenant_id: str | None,
+        fmt: str = DEFAULT_EXPORT_FORMAT,
+    ) -> str | None:
+        """
+        Export telemetry in the given format (see EXPORT_FORMATS) and
+        return the full file path. Returns None if export was cancelled.
+        """
+        dataset = await self.collect_dataset(date_from, date_to, tenant_id)
+        if dataset is None:
+            return None
+
+        return await self.write_export(dataset, date_from, date_to, tenant_id, fmt)
+
+    async def write_export(
+        self,
+        dataset: ExportDataset,
+        date_from: date,
+        date_to: date,
+        tenant_id: str | None,
+        fmt: str = DEFAULT_EXPORT_FORMAT,
+    ) -> str | None:
+        """
+        Write an already collected dataset to EXPORT_DIR and return the
+        full file path. Returns None if export was cancelled.
+        """
+        # Build path
+        file_name = f"{date_from}_to_{date_to}.{EXPORT_FORMATS[fmt].extension}"
+        if tenant_id:
+            tenant_name = dataset.alerts.get("incidents")[0]["tenantName"]
+            file_path = f"{EXPORT_DIR}/{tenant_name}_{file_name}"
+        else:
+            file_path = EXPORT_DIR / file_name
+
+        if fmt == "csv":
+            await self._begin_stage("write", "Writing CSV Bundle", 60)
+            # Off the loop: other jobs on a shared worker loop keep running
+            await asyncio.to_thread(
+                write_csv_bundle, dataset, file_path, include_totals=not tenant_id
+            )
+        elif fmt == "ndjson":
+            await self._begin_stage("write", "Writing NDJSON", 60)
+            await asyncio.to_thread(
+                write_ndjson, dataset, file_path, include_totals=not tenant_id
+            )
+        else:
+            if not await self._write_excel(dataset, tenant_id, file_path):
+                return None
+
+        meter = current_meter()
+        if meter is not None:
+            meter.end_stage()
+        await self.progress_cb({"stage": "Done", "percent": 100})
+
+        return str(file_path)
+
+    async def _begin_stage(self, stage: str, label: str, percent: int):
+        """
+        Report the start of a stage. Under a work meter (worker jobs) the
+        percent / ETA come from completed work units, otherwise the fixed
+        stage percent is reported.
+        """
+        meter = current_meter()
+        if meter is None:
+            await self.progress_cb({"stage": label, "percent": percent})
+            return
+
+        meter.begin_stage(stage, label)
+        await self.progress_cb(meter.snapshot())
+
+    async def collect_dataset(
+        self,
+        date_from: date,
+        date_to: date,
+        tenant_id: str | None,
+        tenants: list | None = None,
+    ) -> ExportDataset | None:
+        """
+        Run every collector and return the results indexed by tenant.
+        `tenants` restricts collection to an explicit subset (fan-out shards).
+        Returns None if export was cancelled.
+        """
 
         # Collect telemetry
-        await self.progress_cb({"stage": "Collecting Number of Security Incidents", "percent": 5})
-        alerts = await self.alerts.collect(date_from, date_to, tenant_id)
+        await self._begin_stage("alerts", "Collecting Number of Security Incidents", 5)
+        alerts = await self.alerts.collect(date_from, date_to, tenant_id, tenants)
 
         if await self.is_cancelled_cb():
             return None
@@ -68,14 +163,14 @@ class TelemetryExportService:
             date_to, time.min, tzinfo=timezone.utc
         )
 
-        await self.progress_cb({"stage": "Collecting Cases Resolved within an SLA", "percent": 15})
-        sla = await self.sla.collect_sla_metrics(created_after, created_before, tenant_id)
+        await self._begin_stage("sla", "Collecting Cases Resolved within an SLA", 15)
+        sla = await self.sla.collect_sla_metrics(created_after, created_before, tenant_id, tenants)
         if await self.is_cancelled_cb():
             return None
 
         start_time = time2.perf_counter()
-        await self.progress_cb({"stage": "Collecting MTTD 2", "percent": 25})
-        mttd2 = await self.mttd2.collect_mttd(date_from, date_to, tenant_id)
+        await self._begin_stage("mttd", "Collecting MTTD 2", 25)
+        mttd2 = await self.mttd2.collect_mttd(date_from, date_to, tenant_id, tenants)
         if await self.is_cancelled_cb():
             return None
         process_time = round(time2.perf_counter() - start_time, 3)  # seconds
@@ -90,54 +185,109 @@ class TelemetryExportService:
         # process_time = round(time2.perf_counter() - start_time, 3)  # seconds
         # print("MTTD ORIG TIME:", process_time)
         
-        await self.progress_cb({"stage": "Collecting Mean Time to Acknowledge", "percent": 35})
-        mtta = await self.mtta.collect_mtta(created_after, created_before, tenant_id)
+        await self._begin_stage("mtta", "Collecting Mean Time to Acknowledge", 35)
+        mtta = await self.mtta.collect_mtta(created_after, created_before, tenant_id, tenants)
         if await self.is_cancelled_cb():
             return None
 
-        await self.progress_cb({"stage": "Collecting Mean Time to Recover", "percent": 45})
-        mttr = await self.mttr.collect_mttr(created_after, created_before, tenant_id)
+        await self._begin_stage("mttr", "Collecting Mean Time to Recover", 45)
+        mttr = await self.mttr.collect_mttr(created_after, created_before, tenant_id, tenants)
         if await self.is_cancelled_cb():
             return None
 
-        await self.progress_cb({"stage": "Collecting Endpoint Health", "percent": 55})
-        endpoint = await self.endpoint_health.collect_endpoint_health(tenant_id=tenant_id)
+        await self._begin_stage("endpoint", "Collecting Endpoint Health", 55)
+        endpoint = await self.endpoint_health.collect_endpoint_health(tenant_id=tenant_id, tenants=tenants)
         if await self.is_cancelled_cb():
             return None
 
-        # Create workbook
-        wb = Workbook()
-        wb.remove(wb.active)
+        return ExportDataset(
+            alerts=alerts,
+            sla=sla,
+            mttd=mttd2,
+            mtta=mtta,
+            mttr=mttr,
+            endpoint=endpoint,
+        )
 
+    async def _write_excel(self, dataset: ExportDataset, tenant_id: str | None, file_path) -> bool:
+        """
+        Build and save the workbook in a thread, so other jobs on a shared
+        worker loop keep running. Returns False if export was cancelled.
+        """
+        meter = current_meter()
         if not tenant_id:
-            await self.progress_cb({"stage": "Building All Tenants Sheet", "percent": 60})
-            # build_all_tenants_sheet(wb, alerts, sla, mttd, mttd2, mtta, mttr, endpoint)
-            build_all_tenants_sheet(wb, alerts, sla, mttd2, mtta, mttr, endpoint)
-            if await self.is_cancelled_cb():
-                return None
+            await self._begin_stage("write", "Building All Tenants Sheet", 60)
+        else:
+            await self._begin_stage("write", "Building Tenant Sheets", 60)
+        if meter is not None:
+            # Create the stage's counter here, the thread only increments it
+            meter.record(units=0)
 
-        # Build per-tenant sheets
-        total_tenants = len(alerts.get("incidents", {}))
-        for idx, tenant in enumerate(alerts.get("incidents", {}), start=1):
-            if await self.is_cancelled_cb():
-                return None
-            await self.progress_cb(
-                {"stage": f"Building Sheet {tenant}", "percent": 60 + int(30 * idx / total_tenants)}
+        stop = threading.Event()
+        try:
+            return await asyncio.to_thread(
+                self._build_workbook,
+                dataset,
+                tenant_id,
+                file_path,
+                meter,
+                asyncio.get_running_loop(),
+                stop,
             )
-            # build_tenant_sheet(wb, tenant, alerts, sla, mttd, mttd2, mtta, mttr, endpoint)
-            build_tenant_sheet(wb, tenant, alerts, sla, mttd2, mtta, mttr, endpoint)
+        finally:
+            # Cancelled while building: the thread stops at the next tenant
+            stop.set()
 
-        # Save file
-        file_name = f"{date_from}_to_{date_to}.xlsx"
-        # Build path
-        if tenant_id:
-            tenant_name = alerts.get("incidents")[0]["tenantName"]
-            file_path = f"{EXPORT_DIR}/{tenant_name}_{file_name}"
-        else:
-            file_path = EXPORT_DIR / file_name
+    def _build_workbook(self, dataset: ExportDataset, tenant_id, file_path, meter, loop, stop) -> bool:
+        def report(progress: dict | None = None) -> bool:
+            # Progress and the cancel check run on the loop; True = stop
+            async def step():
+                if await self.is_cancelled_cb():
+                    return True
+                if progress:
+                    await self.progress_cb(progress)
+                return False
 
-        await self.progress_cb({"stage": "Saving File", "percent": 95})
-        wb.save(file_path)
-        await self.progress_cb({"stage": "Done", "percent": 100})
+            return stop.is_set() or asyncio.run_coroutine_threadsafe(step(), loop).result()
 
-        return str(file_path)
+        # Create workbook (write-only, each sheet is flushed once built)
+        wb = create_streaming_workbook()
+        titles = SheetTitleRegistry()
+
+        if not tenant_id:
+            build_all_tenants_sheet(wb, dataset, titles)
+            if report():
+                return False
+
+        # Build per-tenant sheets. Progress and cancellation are only checked
+        # when the reported percent moves, not once per tenant.
+        total_tenants = len(dataset)
+        last_percent = None
+        for idx, tenant in enumerate(dataset.tenants(), start=1):
+            if meter is not None:
+                meter.record(tenant.tenant_id)
+                percent = meter.progress()["percent"]
+            else:
+                percent = 60 + int(30 * idx / total_tenants)
+            if percent != last_percent:
+                if report({
+                    "stage": "Building Tenant Sheets",
+                    **(meter.progress() if meter is not None else {}),
+                    "percent": percent,
+                    "tenant": tenant.tenant_name,
+                    "completed": idx,
+                    "total": total_tenants,
+                }):
+                    return False
+                last_percent = percent
+            elif stop.is_set():
+                return False
+            build_tenant_sheet(wb, tenant, titles)
+
+        if report({
+            "stage": "Saving File",
+            **(meter.progress() if meter is not None else {"percent": 95}),
+        }):
+            return False
+        wb.save(file_path)
+        return True
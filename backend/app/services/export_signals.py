@@ -0,0 +1,172 @@
+# app/services/export_signals.py
+#
+# Push-based cancellation for running exports.
+#
+# cancel_export publishes on export:cancel:<job id> (and leaves the same key
+# set, for a worker that subscribes a moment too late). The worker runs its
+# export as a task under run_cancellable, which cancels the task, in-flight
+# HTTP requests included, as soon as the cancel is heard.
+#
+# Each event loop has one listener (one Redis connection, subscribed to
+# export:cancel:*) that hands cancels to the jobs waiting on them, so
+# exports running side by side on a worker don't each hold a connection.
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import defaultdict
+
+import redis.asyncio as aioredis
+
+from app.services.redis_queue import REDIS_HOST, REDIS_PORT, redis_client
+from app.utils.exceptions import ExportCancelled
+
+logger = logging.getLogger("app.export_signals")
+
+CANCEL_KEY_TTL_SECONDS = 60 * 60 * 24
+LISTENER_RETRY_SECONDS = 1
+
+
+def cancel_channel(job_id: str) -> str:
+    return f"export:cancel:{job_id}"
+
+
+def publish_cancel(job_id: str) -> float:
+    """
+    Ask whichever worker runs job_id to stop. Returns the request time.
+    """
+    requested_at = time.time()
+    pipe = redis_client.pipeline()
+    pipe.set(cancel_channel(job_id), requested_at, ex=CANCEL_KEY_TTL_SECONDS)
+    pipe.publish(cancel_channel(job_id), requested_at)
+    pipe.execute()
+    return requested_at
+
+
+def cancel_requested(job_id: str) -> bool:
+    """
+    Cheap check for a pending cancel, used at the service's own
+    checkpoints in case the listener is not connected.
+    """
+    return bool(redis_client.exists(cancel_channel(job_id)))
+
+
+def cancel_latency_ms(job_id: str) -> int | None:
+    """
+    Milliseconds since the pending cancel for job_id was requested.
+    """
+    requested_at = redis_client.get(cancel_channel(job_id))
+    if requested_at is None:
+        return None
+    return int((time.time() - float(requested_at)) * 1000)
+
+
+class _CancelListener:
+    """
+    The event loop's cancel subscription. wait_for(job_id) resolves with the
+    request time once a cancel for job_id is published.
+    """
+
+    def __init__(self):
+        self.client = aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0)
+        self.subscribed = asyncio.Event()
+        self.waiters: dict[str, set[asyncio.Future]] = defaultdict(set)
+        self.task = asyncio.create_task(self._listen())
+
+    async def wait_for(self, job_id: str) -> float:
+        future = asyncio.get_running_loop().create_future()
+        self.waiters[job_id].add(future)
+        try:
+            await self.subscribed.wait()
+
+            # Published before we subscribed: the key is still there
+            requested_at = await self.client.get(cancel_channel(job_id))
+            if requested_at is None:
+                requested_at = await future
+            return float(requested_at)
+        finally:
+            self.waiters[job_id].discard(future)
+            if not self.waiters[job_id]:
+                del self.waiters[job_id]
+
+    async def _listen(self):
+        prefix = cancel_channel("")
+        try:
+            while True:
+                pubsub = self.client.pubsub()
+                try:
+                    await pubsub.psubscribe(cancel_channel("*"))
+                    self.subscribed.set()
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        job_id = message["channel"].decode()[len(prefix):]
+                        for future in self.waiters.get(job_id, ()):
+                            if not future.done():
+                                future.set_result(message["data"])
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    # Jobs fall back to their checkpoints until we are back
+                    logger.warning("Cancel listener failed, reconnecting", exc_info=True)
+                    self.subscribed.clear()
+                    await asyncio.sleep(LISTENER_RETRY_SECONDS)
+                finally:
+                    await pubsub.aclose()
+        finally:
+            await self.client.aclose()
+
+
+_listeners: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _CancelListener]" = weakref.WeakKeyDictionary()
+
+
+def _listener() -> _CancelListener:
+    loop = asyncio.get_running_loop()
+    listener = _listeners.get(loop)
+    if listener is None or listener.task.done():
+        listener = _listeners[loop] = _CancelListener()
+    return listener
+
+
+async def close_cancel_listener():
+    """
+    Stop the running loop's cancel listener (worker shutdown).
+    """
+    listener = _listeners.pop(asyncio.get_running_loop(), None)
+    if listener is None:
+        return
+    listener.task.cancel()
+    try:
+        await listener.task
+    except asyncio.CancelledError:
+        pass
+
+
+async def run_cancellable(job_id: str, coro):
+    """
+    Await coro as a task that is cancelled when a cancel for job_id is
+    published. Raises ExportCancelled with the cancel-to-stop latency.
+    """
+    task = asyncio.ensure_future(coro)
+    requested = {}
+
+    async def listen():
+        try:
+            requested["at"] = await _listener().wait_for(job_id)
+            task.cancel()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Cancel listener for %s failed, falling back to checkpoints", job_id, exc_info=True)
+
+    listener = asyncio.create_task(listen())
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if "at" not in requested:
+            raise  # we were cancelled ourselves, not by a cancel request
+        latency_ms = int((time.time() - requested["at"]) * 1000)
+        raise ExportCancelled(job_id, latency_ms) from None
+    finally:
+        listener.cancel()
@@ -37,52 +37,9 @@ class MTTDService:
 
         async def fetch_tenant_detections(tenant):
             try:
-                cases = await self.cases_client.list_cases(
-                    api_host=tenant["apiHost"],
-                    tenant_id=tenant["id"],
-                    created_after=created_after,
-                    created_before=created_before,
-                    # IMPORTANT: no status filter
-                )
-
-                detections: List[Dict[str, Any]] = []
-
-                case_count = 0
-                for case in cases:
-                    # print("[MTTD] Processing case %s for tenant %s", case["id"], tenant["id"])
-
-                    # FOR TESTING, LIMIT TO FIRST 5 CASES ONLY
-                    # if case_count >= 50:
-                    #     break
-                    # case_count += 1
-                    
-                    case_id = case["id"]
-                    if not case_id:
-                        continue
-                    
-                    try:
-                        case_detections = await self.detections_client.list_detections(
-                            api_host=tenant["apiHost"],
-                            tenant_id=tenant["id"],
-                            case_id=case_id,
-                        )
-
-                        # print(
-                        #     "[MTTD] Case %s (tenant=%s): detections fetched = %d",
-                        #     case_id,
-                        #     tenant["id"],
-                        #     len(case_detections) if "_error" not in case_detections else 0,
-                        # )
-                    
-                        detections.extend(case_detections)
-                    except Exception as exc:
-                        logger.warning(
-                            "Skipping detections for case %s in tenant %s: %s",
-                            case_id,
-                            tenant["id"],
-                            exc,
-                        )
+                return await self.fetch_tenant(tenant, created_after, created_before)
             except Exception as exc:
+                # One tenant's failure doesn't fail the whole metric
                 logger.error(
                     "Failed to fetch cases for tenant %s: %s",
                     tenant["id"],
@@ -90,7 +47,6 @@ class MTTDService:
                 )
                 return tenant["id"], tenant["showAs"], []
 
-            return tenant["id"], tenant["showAs"], detections
         results = await asyncio.gather(
             *[fetch_tenant_detections(t) for t in tenants],
             return_exceptions=False,
@@ -102,3 +58,57 @@ class MTTDService:
         }
 
         return MTTDAggregator.aggregate(detections_by_tenant)
+
+    async def fetch_tenant(self, tenant: Dict[str, Any], created_after: datetime, created_before: datetime):
+        """
+        One tenant's case detections as (tenant id, name, detections).
+        Raises if the tenant's cases can't be fetched, so the live routes
+        report the tenant as failed.
+        """
+        cases = await self.cases_client.list_cases(
+            api_host=tenant["apiHost"],
+            tenant_id=tenant["id"],
+            created_after=created_after,
+            created_before=created_before,
+            # IMPORTANT: no status filter
+        )
+
+        detections: List[Dict[str, Any]] = []
+
+        case_count = 0
+        for case in cases:
+            # print("[MTTD] Processing case %s for tenant %s", case["id"], tenant["id"])
+
+            # FOR TESTING, LIMIT TO FIRST 5 CASES ONLY
+            # if case_count >= 50:
+            #     break
+            # case_count += 1
+
+            case_id = case["id"]
+            if not case_id:
+                continue
+
+            try:
+                case_detections = await self.detections_client.list_detections(
+                    api_host=tenant["apiHost"],
+                    tenant_id=tenant["id"],
+                    case_id=case_id,
+                )
+
+                # print(
+                #     "[MTTD] Case %s (tenant=%s): detections fetched = %d",
+                #     case_id,
+                #     tenant["id"],
+                #     len(case_detections) if "_error" not in case_detections else 0,
+                # )
+
+                detections.extend(case_detections)
+            except Exception as exc:
+                logger.warning(
+                    "Skipping detections for case %s in tenant %s: %s",
+                    case_id,
+                    tenant["id"],
+                    exc,
+                )
+
+        return tenant["id"], tenant["showAs"], detections
@@ -27,9 +27,12 @@ class MTTDService2:
         self,
         created_after: datetime,
         created_before: datetime,
-        tenant_id: str | None
+        tenant_id: str | None,
+        tenants: List[Dict[str, Any]] | None = None,
     ) -> Dict[str, Any]:
-        if not tenant_id:
+        if tenants is not None:
+            pass  # explicit tenant subset (fan-out shards)
+        elif not tenant_id:
             tenants = await self.org_client.list_tenants()
         else:
             tenants = await self.org_client.list_tenant(tenant_id=tenant_id)
@@ -45,48 +48,8 @@ class MTTDService2:
                     # IMPORTANT: no status filter
                 )
 
-                detections: List[Dict[str, Any]] = []
-
-                case_count = 0
-                for case in cases:
-                    # print("[MTTD] Processing case %s for tenant %s", case["id"], tenant["id"])
-
-                    # FOR TESTING, LIMIT TO FIRST 5 CASES ONLY
-                    if case_count >= 50:
-                        break
-                    case_count += 1
-                    
-                    case_id = case["id"]
-                    if not case_id:
-                        continue
-
-                    initial_detection_id = case.get("initialDetection", {}).get("id")
-                    # print(f"Case {case_id} - Initial Detection ID: {initial_detection_id}")
-                    
-                    if not initial_detection_id:
-                        continue
-
-                    if initial_detection_id:
-                        try:
-                            case_detection = await self.detections_client.get_case_detection(
-                                api_host=tenant["apiHost"],
-                                tenant_id=tenant["id"],
-                                case_id=case_id,
-                                detection_id=initial_detection_id
-                            )
-                        
-                            detections.append({
-                                "tenant_id": tenant["id"],
-                                "case_id": case_id,
-                                "detection": case_detection
-                            })
-                        except Exception as exc:
-                            logger.warning(
-                                "Skipping detections for case %s in tenant %s: %s",
-                                case_id,
-                                tenant["id"],
-                                exc,
-                            )
+                # Exports keep the original testing cap of 50 cases
+                detections = await self.initial_detections(tenant, cases, limit=50)
             except Exception as exc:
                 logger.error(
                     "Failed to fetch cases for tenant %s: %s",
@@ -108,3 +71,58 @@ class MTTDService2:
         }
 
         return MTTDAggregator.aggregate2(detections_by_tenant)
+
+    async def initial_detections(
+        self,
+        tenant: Dict[str, Any],
+        cases: List[Dict[str, Any]],
+        limit: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        The initial detection of each case (of the first `limit` cases, all
+        by default), for aggregate2. Also used by the summary and series
+        endpoints with cases they already fetched.
+        """
+        detections: List[Dict[str, Any]] = []
+
+        case_count = 0
+        for case in cases:
+            # print("[MTTD] Processing case %s for tenant %s", case["id"], tenant["id"])
+
+            if limit is not None and case_count >= limit:
+                break
+            case_count += 1
+
+            case_id = case["id"]
+            if not case_id:
+                continue
+
+            initial_detection_id = case.get("initialDetection", {}).get("id")
+            # print(f"Case {case_id} - Initial Detection ID: {initial_detection_id}")
+
+            if not initial_detection_id:
+                continue
+
+            if initial_detection_id:
+                try:
+                    case_detection = await self.detections_client.get_case_detection(
+                        api_host=tenant["apiHost"],
+                        tenant_id=tenant["id"],
+                        case_id=case_id,
+                        detection_id=initial_detection_id
+                    )
+
+                    detections.append({
+                        "tenant_id": tenant["id"],
+                        "case_id": case_id,
+                        "detection": case_detection
+                    })
+                except Exception as exc:
+                    logger.warning(
+                        "Skipping detections for case %s in tenant %s: %s",
+                        case_id,
+                        tenant["id"],
+                        exc,
+                    )
+
+        return detections
@@ -2,7 +2,7 @@
 
 import asyncio
 import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from app.api.org_api import OrgApiClient
 from app.api.cases_api import CasesApiClient
@@ -22,9 +22,12 @@ class MTTRService:
             self,
             created_after: datetime,
             created_before: datetime,
-            tenant_id: str | None
+            tenant_id: str | None,
+            tenants: List[Dict[str, Any]] | None = None,
         ) -> Dict[str, Any]:
-        if not tenant_id:
+        if tenants is not None:
+            pass  # explicit tenant subset (fan-out shards)
+        elif not tenant_id:
             tenants = await self.org_client.list_tenants()
         else:
             tenants = await self.org_client.list_tenant(tenant_id=tenant_id)
@@ -48,17 +51,8 @@ class MTTRService:
         #         for tenant_id, tenant in [(tenant_id, tenant)]
         #     }
 
-        async def fetch_cases(tenant):
-            return tenant["id"], tenant["showAs"],await self.cases_client.list_cases(
-                api_host=tenant["apiHost"],
-                tenant_id=tenant["id"],
-                created_after=created_after,
-                created_before=created_before,
-                status="resolved",
-            )
-
         results = await asyncio.gather(
-            *[fetch_cases(t) for t in tenants]
+            *[self.fetch_tenant(t, created_after, created_before) for t in tenants]
         )
 
         cases_by_tenant = {
@@ -67,3 +61,15 @@ class MTTRService:
         }
 
         return MTTRAggregator.aggregate(cases_by_tenant)
+
+    async def fetch_tenant(self, tenant: Dict[str, Any], created_after: datetime, created_before: datetime):
+        """
+        One tenant's cases as (tenant id, name, cases).
+        """
+        return tenant["id"], tenant["showAs"], await self.cases_client.list_cases(
+            api_host=tenant["apiHost"],
+            tenant_id=tenant["id"],
+            created_after=created_after,
+            created_before=created_before,
+            status="resolved",
+        )
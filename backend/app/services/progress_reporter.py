@@ -0,0 +1,110 @@
+# app/services/progress_reporter.py
+
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.services.export_events import publish_job_event
+from app.services.export_job_service import update_job_progress_only
+
+logger = logging.getLogger("app.progress_reporter")
+
+
+async def _write_progress(job_id: str, progress: dict):
+    from app.core.database import get_worker_db
+
+    async with get_worker_db() as db:
+        await update_job_progress_only(db, job_id, progress)
+
+
+class ProgressReporter:
+    """
+    Write-behind progress for one export job.
+
+    Every update is published on the event stream straight away, but only
+    the newest one is written to export_jobs: on a stage change, when
+    min_interval has passed since the last write, and on close(). A failed
+    write (DB blip) is logged and retried with the next update instead of
+    failing the export.
+    """
+
+    def __init__(self, job_id: str, min_interval: float | None = None, write=None):
+        self.job_id = job_id
+        self.min_interval = (
+            settings.EXPORT_PROGRESS_MIN_INTERVAL_SECONDS
+            if min_interval is None
+            else min_interval
+        )
+        self._write = write or _write_progress
+
+        self._pending: dict | None = None
+        self._written_stage = None
+        self._last_write = 0.0
+        self._lock = asyncio.Lock()
+
+        self.writes = 0
+        self.coalesced = 0
+        self.failed_writes = 0
+
+    async def report(self, progress: dict, persist: bool = True):
+        publish_job_event(self.job_id, progress=progress)
+        if not persist:
+            return
+
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = progress
+
+        stage_changed = progress.get("stage") != self._written_stage
+        if stage_changed or time.monotonic() - self._last_write >= self.min_interval:
+            await self.flush()
+
+    # Usable directly as TelemetryExportService(progress_cb=...)
+    __call__ = report
+
+    async def flush(self) -> bool:
+        """
+        Write the pending update, if any. Returns False if the write failed
+        (the update stays pending).
+        """
+        async with self._lock:
+            progress = self._pending
+            if progress is None:
+                return True
+
+            try:
+                await self._write(self.job_id, progress)
+            except Exception as exc:
+                self.failed_writes += 1
+                logger.warning(
+                    "Progress write for job %s failed, will retry: %s",
+                    self.job_id,
+                    exc,
+                )
+                return False
+
+            # A newer update may have arrived while we were writing
+            if self._pending is progress:
+                self._pending = None
+            self._written_stage = progress.get("stage")
+            self._last_write = time.monotonic()
+            self.writes += 1
+            return True
+
+    async def close(self, attempts: int = 3):
+        """
+        Final flush at job end, with a few short retries.
+        """
+        for attempt in range(attempts):
+            if await self.flush():
+                break
+            await asyncio.sleep(0.5 * (attempt + 1))
+
+        logger.info(
+            "Progress for job %s: %d writes, %d coalesced, %d failed",
+            self.job_id,
+            self.writes,
+            self.coalesced,
+            self.failed_writes,
+        )
@@ -3,9 +3,15 @@ import os
 import redis
 import logging
 from rq import Queue
-from rq.registry import StartedJobRegistry, FinishedJobRegistry, FailedJobRegistry
-from rq.job import Job
-from sqlalchemy import select
+from rq.registry import (
+    DeferredJobRegistry,
+    FailedJobRegistry,
+    FinishedJobRegistry,
+    ScheduledJobRegistry,
+    StartedJobRegistry,
+)
+from rq.job import Job, parse_job_id
+from sqlalchemy import update
 
 from app.core.database import get_worker_db
 from app.models.export_job import ExportJob
@@ -28,6 +34,13 @@ telemetry_queue = Queue(
     default_timeout=7200,  # 2 hours
 )
 
+# Priority lanes, highest first, see app/services/export_scheduling.py.
+# "telemetry" stays the default lane; workers listen on all three in order.
+telemetry_high_queue = Queue("telemetry-high", connection=redis_client, default_timeout=7200)
+telemetry_low_queue = Queue("telemetry-low", connection=redis_client, default_timeout=7200)
+
+LANES = [telemetry_high_queue, telemetry_queue, telemetry_low_queue]
+
 started = StartedJobRegistry(queue=telemetry_queue)
 finished = FinishedJobRegistry(queue=telemetry_queue)
 failed = FailedJobRegistry(queue=telemetry_queue)
@@ -36,94 +49,162 @@ failed = FailedJobRegistry(queue=telemetry_queue)
 # Job recovery helpers (SAFE)
 # ================================
 
-def requeue_started_jobs() -> int:
+async def _mark_jobs_queued(job_ids: list[str]):
+    """
+    One DB transaction for every requeued job.
+    """
+    if not job_ids:
+        return
+
+    async with get_worker_db() as db:
+        await db.execute(
+            update(ExportJob)
+            .where(ExportJob.job_id.in_(job_ids))
+            .values(status="queued", error=None)
+        )
+        await db.commit()
+
+
+def _requeue_registry(registry_class, status: str) -> list[str]:
+    # One pipelined fetch per lane registry
+    requeued = []
+    for lane in LANES:
+        registry = registry_class(queue=lane)
+        for job in Job.fetch_many(registry.get_job_ids(), connection=redis_client):
+            if job is None or job.get_status(refresh=False) != status:
+                continue
+
+            logger.warning("Requeueing %s job %s", status, job.id)
+            job.requeue(at_front=True)
+            requeued.append(job.id)
+    return requeued
+
+
+def remove_from_lanes(job_id: str):
+    """
+    Take a queued job off whichever lane it is waiting in.
+    """
+    for lane in LANES:
+        lane.remove(job_id)
+
+
+async def requeue_started_jobs() -> int:
     """
     Requeue jobs that were marked as 'started' but whose worker died.
     Job IDs are preserved. DB is updated to 'queued'.
     """
-    count = 0
+    requeued = _requeue_registry(StartedJobRegistry, "started")
+    await _mark_jobs_queued(requeued)
+    return len(requeued)
 
-    for job_id in started.get_job_ids():
-        job = telemetry_queue.fetch_job(job_id)
-        if not job:
-            continue
 
-        if job.get_status() == "started":
-            logger.warning("Requeueing stuck started job %s", job.id)
-            job.requeue(at_front=True)
-            count += 1
-
-            # Update DB status safely
-            import asyncio
-            async def update_db():
-                async with get_worker_db() as db:
-                    result = await db.execute(
-                        select(ExportJob).where(ExportJob.job_id == job.id)
-                    )
-                    export_job = result.scalar_one_or_none()
-                    if export_job:
-                        export_job.status = "queued"
-                        export_job.error = None
-                        await db.commit()
-            asyncio.create_task(update_db())
-
-    return count
-
-
-def requeue_failed_jobs() -> int:
+async def requeue_failed_jobs() -> int:
     """
     Requeue jobs in FailedJobRegistry. Job IDs are preserved. DB is updated to 'queued'.
     """
-    count = 0
+    requeued = _requeue_registry(FailedJobRegistry, "failed")
+    await _mark_jobs_queued(requeued)
+    return len(requeued)
 
-    for job_id in failed.get_job_ids():
-        job = telemetry_queue.fetch_job(job_id)
-        if not job:
-            continue
 
-        if job.get_status() == "failed":
-            logger.warning("Requeueing failed job %s", job.id)
-            job.requeue(at_front=True)
-            count += 1
-
-            # Update DB status safely
-            import asyncio
-            async def update_db():
-                async with get_worker_db() as db:
-                    result = await db.execute(
-                        select(ExportJob).where(ExportJob.job_id == job.id)
-                    )
-                    export_job = result.scalar_one_or_none()
-                    if export_job:
-                        export_job.status = "queued"
-                        export_job.error = None
-                        await db.commit()
-            asyncio.create_task(update_db())
-
-    return count
-
-
-def reconcile_queue() -> dict:
+async def reconcile_queue() -> dict:
     """
     Reconcile telemetry queue state.
     Intended to be called from startup and periodically.
     """
-    started = requeue_started_jobs()
-    failed = requeue_failed_jobs()
+    started_count = await requeue_started_jobs()
+    failed_count = await requeue_failed_jobs()
 
     summary = {
-        "requeued_started": started,
-        "requeued_failed": failed,
+        "requeued_started": started_count,
+        "requeued_failed": failed_count,
     }
 
     logger.info("Queue reconciliation result: %s", summary)
     return summary
 
-def serialize_job(job):
+def serialize_job(job, refresh: bool = True):
+    # refresh=False: use the status loaded with the job (no extra round trip)
     return {
         "job_id": job.id,
-        "status": job.get_status(),
+        "status": job.get_status(refresh=refresh),
         "enqueued_at": job.enqueued_at,
         "started_at": job.started_at,
         "ended_at": job.ended_at,
-    }
\ No newline at end of file
+    }
+
+
+# ================================
+# Registry inspection (paged)
+# ================================
+
+# In listing order. "queued" is the lane itself (a list), the rest are
+# sorted sets
+REGISTRIES = {
+    "queued": None,
+    "started": StartedJobRegistry,
+    "scheduled": ScheduledJobRegistry,
+    "deferred": DeferredJobRegistry,
+    "finished": FinishedJobRegistry,
+    "failed": FailedJobRegistry,
+}
+
+
+def inspect_registries(
+    registries: list[str],
+    lanes: list[Queue],
+    offset: int,
+    limit: int,
+) -> tuple[list[dict], int]:
+    """
+    One page of the jobs in the given registries of the given lanes, plus
+    the total. Three Redis round trips whatever the page size: sizes, the
+    page's ids, the jobs. Blocking, run it off the event loop.
+
+    Order: registry, then lane (highest first); newest first within a
+    registry, queue order within "queued".
+    """
+    sources = []  # (registry name, lane, key)
+    for name in registries:
+        for lane in lanes:
+            registry_class = REGISTRIES[name]
+            key = lane.key if registry_class is None else registry_class(queue=lane).key
+            sources.append((name, lane, key))
+
+    pipe = redis_client.pipeline(transaction=False)
+    for name, _, key in sources:
+        if name == "queued":
+            pipe.llen(key)
+        else:
+            pipe.zcard(key)
+    sizes = pipe.execute()
+    total = sum(sizes)
+
+    # Slice [offset, offset + limit) across the sources
+    windows = []  # (registry name, lane)
+    pipe = redis_client.pipeline(transaction=False)
+    start, end = offset, offset + limit
+    for (name, lane, key), size in zip(sources, sizes):
+        if start < size and end > 0:
+            stop = min(end, size) - 1
+            if name == "queued":
+                pipe.lrange(key, max(start, 0), stop)
+            else:
+                pipe.zrange(key, max(start, 0), stop, desc=True)
+            windows.append((name, lane))
+        start -= size
+        end -= size
+    id_lists = pipe.execute() if windows else []
+
+    placed = [
+        (name, lane, parse_job_id(raw.decode()))
+        for (name, lane), raw_ids in zip(windows, id_lists)
+        for raw in raw_ids
+    ]
+    jobs = Job.fetch_many([job_id for _, _, job_id in placed], connection=redis_client)
+
+    page = []
+    for (name, lane, job_id), job in zip(placed, jobs):
+        item = serialize_job(job, refresh=False) if job else {"job_id": job_id, "status": None}
+        page.append({**item, "registry": name, "lane": lane.name})
+    return page, total
\ No newline at end of file
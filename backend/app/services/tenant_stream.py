@@ -0,0 +1,153 @@
+# app/services/tenant_stream.py
+#
+# Per-tenant streaming and deadlines for the live /telemetry routes.
+#
+# The services' collect_* methods gather every tenant and aggregate once at
+# the end, so the response waits for the slowest tenant. The helpers here
+# run the same per-tenant fetches (the services' fetch_tenant methods):
+#
+#   stream_tenants()   yields each tenant's aggregate as soon as it is done,
+#                      then the aggregate over all tenants, built exactly
+#                      like the non-streamed response
+#   collect_tenants()  one response, but bounded by a deadline: tenants
+#                      still running are cancelled and the aggregate covers
+#                      the ones that finished
+#
+# Both report a per-tenant status: complete, timed_out or error.
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger("app.tenant_stream")
+
+# (tenant) -> (tenant id, tenant name, data)
+TenantFetch = Callable[[Dict[str, Any]], Awaitable[tuple]]
+# {(tenant id, tenant name): data} -> response body
+Aggregate = Callable[[Dict[tuple, Any]], Dict[str, Any]]
+
+
+def _start(tenants: List[Dict[str, Any]], fetch: TenantFetch) -> Dict[asyncio.Task, Dict[str, Any]]:
+    async def run(tenant):
+        try:
+            return tenant, await fetch(tenant), None
+        except Exception as exc:
+            logger.warning("Live telemetry for tenant %s failed: %s", tenant.get("id"), exc)
+            return tenant, None, exc
+
+    return {asyncio.create_task(run(t)): t for t in tenants}
+
+
+def _status(tenant: Dict[str, Any], status: str, exc: Exception | None = None) -> Dict[str, Any]:
+    record = {"tenantId": tenant.get("id"), "tenantName": tenant.get("showAs"), "status": status}
+    if exc is not None:
+        record["error"] = str(exc)
+    return record
+
+
+async def _cancel(tasks):
+    for task in tasks:
+        task.cancel()
+    # Let in-flight requests unwind before the response goes out
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def stream_tenants(
+    tenants: List[Dict[str, Any]],
+    fetch: TenantFetch,
+    aggregate: Aggregate,
+    timeout: float | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    One {"type": "tenant"} record per tenant in completion order, then one
+    {"type": "totals"} record. Failed and timed out tenants are left out of
+    the totals. Pending fetches are cancelled at the deadline (timeout
+    seconds) or if the consumer stops early (client went away).
+    """
+    tasks = _start(tenants, fetch)
+    collected: Dict[tuple, Any] = {}
+    counts = {"complete": 0, "timed_out": 0, "error": 0}
+
+    try:
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=timeout):
+                tenant, result, exc = await next_done
+                if exc is not None:
+                    counts["error"] += 1
+                    yield {"type": "tenant", **_status(tenant, "error", exc)}
+                    continue
+
+                tenant_id, tenant_name, data = result
+                collected[(tenant_id, tenant_name)] = data
+                counts["complete"] += 1
+                yield {
+                    "type": "tenant",
+                    "tenantId": tenant_id,
+                    "tenantName": tenant_name,
+                    "status": "complete",
+                    "data": aggregate({(tenant_id, tenant_name): data}),
+                }
+        except asyncio.TimeoutError:
+            pending = [task for task in tasks if not task.done()]
+            await _cancel(pending)
+            for task in pending:
+                counts["timed_out"] += 1
+                yield {"type": "tenant", **_status(tasks[task], "timed_out")}
+
+        yield {
+            "type": "totals",
+            "tenants": len(tenants),
+            **counts,
+            "partial": counts["complete"] < len(tenants),
+            "data": aggregate(collected),
+        }
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def collect_tenants(
+    tenants: List[Dict[str, Any]],
+    fetch: TenantFetch,
+    aggregate: Aggregate,
+    timeout: float | None,
+) -> Dict[str, Any]:
+    """
+    The aggregate over the tenants that finish within timeout seconds, plus
+    "tenant_status" (one entry per tenant) and "partial".
+    """
+    tasks = _start(tenants, fetch)
+    pending = set()
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        await _cancel(pending)
+
+    collected: Dict[tuple, Any] = {}
+    statuses = []
+    for task, tenant in tasks.items():
+        if task in pending:
+            statuses.append(_status(tenant, "timed_out"))
+            continue
+
+        _, result, exc = task.result()
+        if exc is not None:
+            statuses.append(_status(tenant, "error", exc))
+            continue
+
+        tenant_id, tenant_name, data = result
+        collected[(tenant_id, tenant_name)] = data
+        statuses.append(_status(tenant, "complete"))
+
+    return {
+        **aggregate(collected),
+        "tenant_status": statuses,
+        "partial": len(collected) < len(tenants),
+    }
+
+
+async def ndjson_lines(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for record in records:
+        yield (json.dumps(jsonable_encoder(record)) + "\n").encode("utf-8")
@@ -5,3 +5,22 @@ class ApiClientError(Exception):
         self.status_code = status_code
         self.message = message
         super().__init__(f"API Error {status_code}: {message}")
+
+
+class ExportCancelled(Exception):
+    def __init__(self, job_id: str, latency_ms: int | None = None):
+        self.job_id = job_id
+        self.latency_ms = latency_ms  # cancel request -> work stopped
+        super().__init__(f"Export {job_id} cancelled")
+
+
+class JobStatusConflict(ValueError):
+    """
+    A status transition did not apply because the job had already moved
+    to a status it cannot go from.
+    """
+    def __init__(self, job_id: str, current_status: str, new_status: str):
+        self.job_id = job_id
+        self.current_status = current_status
+        self.new_status = new_status
+        super().__init__(f"Invalid status transition: {current_status} to {new_status}")
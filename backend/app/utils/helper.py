@@ -2,8 +2,6 @@
 
 import re
 
-from openpyxl import Workbook
-
 INVALID_SHEET_CHARS = r'[\[\]\:\*\?\/\\]'
 
 def safe_sheet_title(name: str, max_len: int = 31) -> str:
@@ -16,12 +14,25 @@ def safe_sheet_title(name: str, max_len: int = 31) -> str:
     # Excel also rejects empty titles
     return safe or "Sheet"
 
-def unique_sheet_title(wb: Workbook, name: str) -> str:
-    base = safe_sheet_title(name)
-    title = base
-    i = 1
-    while title in wb.sheetnames:
-        suffix = f" ({i})"
-        title = base[: 31 - len(suffix)] + suffix
-        i += 1
-    return title
\ No newline at end of file
+class SheetTitleRegistry:
+    """
+    Hands out unique sheet titles. Taken titles live in a set (Excel
+    compares them case-insensitively) and the next free suffix is
+    remembered per base title, so each claim is O(1) amortised.
+    """
+
+    def __init__(self):
+        self._taken: set[str] = set()
+        self._next_suffix: dict[str, int] = {}
+
+    def claim(self, name: str) -> str:
+        base = safe_sheet_title(name)
+        title = base
+        i = self._next_suffix.get(base.casefold(), 1)
+        while title.casefold() in self._taken:
+            suffix = f" ({i})"
+            title = base[: 31 - len(suffix)] + suffix
+            i += 1
+        self._next_suffix[base.casefold()] = i
+        self._taken.add(title.casefold())
+        return title
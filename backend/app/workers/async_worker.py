@@ -0,0 +1,142 @@
+# app/workers/async_worker.py
+#
+# RQ worker class for the telemetry queue:
+#
+#   rq worker telemetry --worker-class app.workers.async_worker.AsyncExportWorker
+#
+# Runs jobs in the worker process itself (no fork per job), with one
+# long-lived event loop, DB pool and set of API clients shared by every job.
+# See app/workers/runtime.py.
+#
+# With EXPORT_WORKER_CONCURRENCY=N the worker also starts N-1 "lane" workers
+# in threads. Every lane is a normal RQ worker (own name, heartbeat, current
+# job, stop-job channel) that dequeues on its own, so up to N exports run on
+# the shared loop at once. Upstream requests from all of them are capped by
+# UPSTREAM_MAX_IN_FLIGHT (app/api/base.py).
+
+import logging
+import threading
+
+from rq import SimpleWorker
+from rq.timeouts import BaseDeathPenalty
+
+from app.core.config import settings
+from app.workers.runtime import get_runtime, start_runtime, stop_runtime
+
+logger = logging.getLogger("app.async_worker")
+
+LANE_DEQUEUE_TIMEOUT = 10  # idle lanes notice a shutdown within this many seconds
+
+
+class LoopDeathPenalty(BaseDeathPenalty):
+    """
+    No-op: job timeouts are enforced on the runtime loop (asyncio.wait_for),
+    SIGALRM only works in the main thread.
+    """
+
+    def setup_death_penalty(self):
+        pass
+
+    def cancel_death_penalty(self):
+        pass
+
+
+class AsyncExportWorker(SimpleWorker):
+    """
+    SimpleWorker that owns an ExportRuntime (and any lane workers) for its
+    whole lifetime.
+    """
+
+    death_penalty_class = LoopDeathPenalty
+
+    def __init__(self, *args, lane: bool = False, **kwargs):
+        self.lane = lane  # before super(): RQ reads dequeue_timeout in __init__
+        super().__init__(*args, **kwargs)
+        self._lanes: list[tuple["AsyncExportWorker", threading.Thread]] = []
+
+    @property
+    def dequeue_timeout(self) -> int:
+        # Read-only in RQ (worker_ttl - 15). Lanes get a short one without
+        # shortening their worker_ttl, which also bounds their heartbeat
+        if self.lane:
+            return LANE_DEQUEUE_TIMEOUT
+        return super().dequeue_timeout
+
+    def work(self, *args, **kwargs):
+        if self.lane:
+            return super().work(*args, **kwargs)
+
+        start_runtime()
+        try:
+            self._start_lanes(kwargs.get("burst", False))
+            return super().work(*args, **kwargs)
+        except SystemExit:
+            # Cold shutdown: take the lanes' jobs down with us
+            get_runtime().cancel_all()
+            raise
+        finally:
+            self._stop_lanes()
+            stop_runtime()
+
+    # -----------------------------
+    # Lanes
+    # -----------------------------
+    def _start_lanes(self, burst: bool):
+        for idx in range(1, max(settings.EXPORT_WORKER_CONCURRENCY, 1)):
+            lane = type(self)(
+                self.queues,
+                name=f"{self.name}-lane{idx}",
+                connection=self.connection,
+                lane=True,
+            )
+
+            thread = threading.Thread(
+                target=self._run_lane,
+                args=(lane, burst),
+                name=f"export-lane-{idx}",
+                daemon=True,
+            )
+            thread.start()
+            self._lanes.append((lane, thread))
+
+        if self._lanes:
+            logger.info(
+                "Worker %s: running up to %d export jobs at once",
+                self.name,
+                len(self._lanes) + 1,
+            )
+
+    @staticmethod
+    def _run_lane(lane: "AsyncExportWorker", burst: bool):
+        try:
+            lane.work(burst=burst)
+        except Exception:
+            # One lane dying must not take the others with it
+            logger.exception("Worker lane %s crashed", lane.name)
+
+    def _stop_lanes(self):
+        # Warm shutdown: busy lanes finish their job, idle ones stop at the
+        # next dequeue timeout
+        for lane, _ in self._lanes:
+            lane._stop_requested = True
+        for lane, thread in self._lanes:
+            thread.join()
+        self._lanes = []
+
+    def _install_signal_handlers(self):
+        # Signals are handled by the main worker only
+        if not self.lane:
+            super()._install_signal_handlers()
+
+    def handle_warm_shutdown_request(self):
+        super().handle_warm_shutdown_request()
+        for lane, _ in self._lanes:
+            lane._stop_requested = True
+
+    def kill_horse(self, sig=None):
+        # No work horse here: the default would killpg() the worker itself.
+        # A stop-job command cancels just this worker's job on the loop.
+        runtime = get_runtime()
+        job_id = self.get_current_job_id()
+        if runtime is not None and job_id and runtime.cancel(job_id):
+            logger.info("Worker %s: cancelled job %s", self.name, job_id)
@@ -1,20 +1,41 @@
 # app/workers/reconcile_jobs.py
 
 import logging
-from sqlalchemy import select
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from sqlalchemy import select, update
+from rq import Queue
 from rq.job import Job
-from rq.exceptions import NoSuchJobError, InvalidJobOperation
-from rq.registry import FailedJobRegistry, StartedJobRegistry, FinishedJobRegistry
+from rq.exceptions import InvalidJobOperation
+from rq.registry import FailedJobRegistry, StartedJobRegistry
 
 from app.core.database import get_worker_db
 from app.models import ExportJob
-from app.services.redis_queue import telemetry_queue
-from app.workers.telemetry_export_sync import run_export_sync
+from app.services.export_events import publish_job_event
+from app.services.export_fanout import fanned_out_many
+from app.services.export_leases import expired_leases, forget_leases, leases_held
+from app.services.export_scheduling import enqueue_export
+from app.services.redis_queue import LANES, telemetry_queue
 
 logger = logging.getLogger("app.reconcile")
 
+FANOUT_MEMBER_FUNCS = {
+    "app.workers.telemetry_export_sync.run_export_shard_sync",
+    "app.workers.telemetry_export_sync.run_export_merge_sync",
+}
+
+# DB status each action moves the job to (applied in one batch)
+STATUS_TRANSITIONS = {
+    "requeue_running": "queued",
+    "mark_running": "running",
+    "mark_completed": "completed",
+    "mark_queued": "queued",
+}
+
 
-async def reconcile_jobs():
+async def reconcile_jobs() -> dict:
     """
     Production-grade reconciliation between Postgres and RQ.
 
@@ -22,179 +43,282 @@ async def reconcile_jobs():
     - DB is authoritative
     - RQ state is repaired to match DB state
     - No exception should crash reconciliation
-    """
 
+    RQ state for every job comes from one pipelined fetch, and every status
+    change is applied in one DB transaction. Returns (and logs) counts and
+    duration for the run.
+    """
+    start = time.perf_counter()
     redis_conn = telemetry_queue.connection
 
     async with get_worker_db() as db:
         result = await db.execute(
-            select(ExportJob).where(
+            select(
+                ExportJob.job_id,
+                ExportJob.status,
+                ExportJob.date_from,
+                ExportJob.date_to,
+                ExportJob.tenant_id,
+                ExportJob.format,
+            ).where(
                 ExportJob.status.in_(["queued", "failed", "running"])
             )
         )
-        jobs = result.scalars().all()
+        jobs = result.all()
+        job_ids = [job.job_id for job in jobs]
 
-        for job in jobs:
-            try:
-                await _reconcile_single_job(job, db, redis_conn)
-            except Exception:
-                logger.exception(
-                    "Reconciliation failed for job %s",
-                    job.job_id,
-                )
-                # DO NOT re-raise — reconciliation must continue
-                continue
+        # Bulk, pipelined reads: RQ job hashes and fan-out markers
+        rq_jobs = Job.fetch_many(job_ids, connection=redis_conn) if job_ids else []
+        fanned_out = fanned_out_many(job_ids)
+        leased = leases_held(job_ids) if job_ids else []
 
+        plans = []
+        for job, rq_job, is_fanout, is_leased in zip(jobs, rq_jobs, fanned_out, leased):
+            rq_status = _rq_status(rq_job)
 
-async def _reconcile_single_job(job, db, redis_conn):
-    """
-    Deterministic, resurrection-safe reconciliation.
-    DB is authoritative.
-    """
+            # FAN-OUT PARENT: shard and merge jobs own the row
+            action = None if is_fanout else _plan(job.status, rq_status)
 
-    try:
-        rq_job = Job.fetch(job.job_id, connection=redis_conn)
-        rq_status = rq_job.get_status()
-    except NoSuchJobError:
-        rq_job = None
-        rq_status = "missing"
+            # A live lease means a worker is on it, whatever RQ says
+            if action == "requeue_running" and is_leased:
+                action = None
 
-    logger.info(
-        "Reconciling job %s | DB=%s | RQ=%s",
-        job.job_id,
-        job.status,
-        rq_status,
-    )
+            logger.debug(
+                "Reconciling job %s | DB=%s | RQ=%s | %s",
+                job.job_id,
+                job.status,
+                rq_status,
+                action or "no-op",
+            )
+            plans.append((job, rq_job, action))
+
+        # ==========================================================
+        # RQ before DB: retry explicitly failed jobs
+        # ==========================================================
+        transitions = defaultdict(list)  # (from, to) -> job ids
+
+        for job, rq_job, action in plans:
+            if action == "retry_failed":
+                try:
+                    # Failed registry of the lane the job ran on
+                    FailedJobRegistry(rq_job.origin, connection=redis_conn).requeue(
+                        rq_job, at_front=True
+                    )
+                    transitions[("failed", "queued")].append(job.job_id)
+                except InvalidJobOperation:
+                    logger.warning("Race while requeueing %s", job.job_id)
+            elif action in STATUS_TRANSITIONS:
+                transitions[(job.status, STATUS_TRANSITIONS[action])].append(job.job_id)
+
+        # ==========================================================
+        # One transaction for every status change. Each UPDATE only
+        # applies if the row still has the status we saw, so a worker
+        # that moved the job meanwhile wins.
+        # ==========================================================
+        applied = {}  # job id -> new status
+        try:
+            for (from_status, to_status), ids in transitions.items():
+                values = {"status": to_status}
+                if to_status in ("queued", "completed"):
+                    values["error"] = None
+                if to_status == "completed":
+                    values["completed_at"] = datetime.utcnow()
+
+                result = await db.execute(
+                    update(ExportJob)
+                    .where(
+                        ExportJob.job_id.in_(ids),
+                        ExportJob.status == from_status,
+                    )
+                    .values(**values)
+                    .returning(ExportJob.job_id)
+                )
+                applied.update(dict.fromkeys(result.scalars().all(), to_status))
+            await db.commit()
+        except Exception:
+            # DO NOT re-raise — reconciliation must continue
+            logger.exception("Reconciliation DB batch failed")
+            await db.rollback()
+            applied = {}
 
-    # ==========================================================
-    # HARD TERMINAL GUARD
-    # ==========================================================
-    if job.status in ["cancelled", "completed"]:
-        logger.info(
-            "Skipping terminal job %s (%s)",
-            job.job_id,
-            job.status,
-        )
-        return
+    for job_id, status in applied.items():
+        publish_job_event(job_id, status=status)
 
     # ==========================================================
-    # CRASH RECOVERY: Docker killed while running
+    # RQ after DB: re-enqueue jobs missing from Redis
     # ==========================================================
-    if job.status == "running" and rq_status == "missing":
-        logger.warning(
-            "Job %s was running but missing in RQ. Requeueing (crash recovery)",
-            job.job_id,
-        )
+    enqueued = 0
+    for job, _, action in plans:
+        if action == "enqueue_queued" or (
+            action == "requeue_running" and job.job_id in applied
+        ):
+            try:
+                enqueue_export(
+                    job.date_from.isoformat(),
+                    job.date_to.isoformat(),
+                    job.tenant_id,
+                    job.format,
+                    job_id=job.job_id,
+                )
+                enqueued += 1
+            except Exception:
+                logger.exception("Re-enqueue failed for job %s", job.job_id)
 
-        job.status = "queued"
-        job.error = None
-        await db.commit()
+    summary = {
+        "checked": len(plans),
+        "fanned_out": sum(fanned_out),
+        "actions": dict(Counter(action for _, _, action in plans if action)),
+        "db_updates": len(applied),
+        "enqueued": enqueued,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+    logger.info("Reconciliation finished: %s", summary)
+    return summary
 
-        telemetry_queue.enqueue(
-            run_export_sync,
-            job.date_from.isoformat(),
-            job.date_to.isoformat(),
-            job.tenant_id,
-            job_timeout=7200,
-            job_id=job.job_id,
-        )
-        return
 
-    # ==========================================================
-    # QUEUED but missing in Redis. Redis restart recovery
-    # ==========================================================
-    if job.status == "queued" and rq_status == "missing":
-        logger.warning(
-            "Queued job %s missing in Redis. Requeueing",
-            job.job_id,
-        )
+async def recover_expired_leases() -> dict:
+    """
+    Requeue running jobs whose worker lease expired (worker died), see
+    app/services/export_leases.py. Run every EXPORT_LEASE_WATCH_SECONDS by
+    the API, so a crashed job waits seconds instead of a reconcile interval.
+    A job cancelled while its worker was dying is marked cancelled.
+    Fan-out shard and merge jobs (no row of their own) go back on their
+    queue as the same RQ job.
+    """
+    job_ids = expired_leases()
+    if not job_ids:
+        return {"expired": 0, "requeued": 0, "cancelled": 0, "members_requeued": 0}
 
-        telemetry_queue.enqueue(
-            run_export_sync,
-            job.date_from.isoformat(),
-            job.date_to.isoformat(),
-            job.tenant_id,
-            job_timeout=7200,
-            job_id=job.job_id,
-        )
-        return
+    redis_conn = telemetry_queue.connection
 
-    # ==========================================================
-    # RQ FAILED
-    # ==========================================================
-    if rq_status == "failed":
+    async with get_worker_db() as db:
+        requeued = (
+            await db.execute(
+                update(ExportJob)
+                .where(ExportJob.job_id.in_(job_ids), ExportJob.status == "running")
+                .values(status="queued", error=None, progress={"stage": "Requeued"})
+                .returning(
+                    ExportJob.job_id,
+                    ExportJob.date_from,
+                    ExportJob.date_to,
+                    ExportJob.tenant_id,
+                    ExportJob.format,
+                )
+            )
+        ).all()
+        cancelled = (
+            await db.execute(
+                update(ExportJob)
+                .where(ExportJob.job_id.in_(job_ids), ExportJob.status == "cancelling")
+                .values(status="cancelled", progress={"stage": "Cancelled"})
+                .returning(ExportJob.job_id)
+            )
+        ).scalars().all()
+        await db.commit()
 
-        # Only retry if DB explicitly says failed
-        if job.status == "failed":
-            logger.warning(
-                "Retrying explicitly failed job %s",
-                job.job_id,
+    rq_jobs = Job.fetch_many([job.job_id for job in requeued], connection=redis_conn) if requeued else []
+    for job, rq_job in zip(requeued, rq_jobs):
+        try:
+            # Out of the dead worker's started registry first, or RQ's own
+            # cleanup would later fail the requeued job
+            if rq_job is not None:
+                for lane in LANES:
+                    StartedJobRegistry(queue=lane).remove_executions(rq_job)
+
+            enqueue_export(
+                job.date_from.isoformat(),
+                job.date_to.isoformat(),
+                job.tenant_id,
+                job.format,
+                job_id=job.job_id,
             )
+            publish_job_event(job.job_id, status="queued", progress={"stage": "Requeued"})
+        except Exception:
+            # Row is queued: the next reconcile re-enqueues it
+            logger.exception("Re-enqueue after expired lease failed for %s", job.job_id)
 
-            failed_registry = FailedJobRegistry(queue=telemetry_queue)
+    for job_id in cancelled:
+        publish_job_event(job_id, status="cancelled")
 
-            try:
-                failed_registry.requeue(rq_job, at_front=True)
-                job.status = "queued"
-                job.error = None
-                await db.commit()
-            except InvalidJobOperation:
-                logger.warning("Race while requeueing %s", job.job_id)
-
-        else:
-            logger.info(
-                "RQ failed but DB=%s. not requeueing %s",
-                job.status,
-                job.job_id,
-            )
+    rows = {job.job_id for job in requeued} | set(cancelled)
+    members_requeued = _requeue_fanout_members([j for j in job_ids if j not in rows])
 
-        return
+    forget_leases(job_ids)
 
-    # ==========================================================
-    # RQ STARTED
-    # ==========================================================
-    if rq_status == "started":
+    summary = {
+        "expired": len(job_ids),
+        "requeued": len(requeued),
+        "cancelled": len(cancelled),
+        "members_requeued": members_requeued,
+    }
+    logger.warning("Expired export leases: %s", summary)
+    return summary
 
-        # Only allow transition to running from queued
-        if job.status == "queued":
-            logger.info(
-                "Updating DB. running for job %s",
-                job.job_id,
-            )
-            job.status = "running"
-            await db.commit()
 
-        return
+def _requeue_fanout_members(job_ids: list[str]) -> int:
+    """
+    Put shard / merge jobs whose worker died back on their queue, same job
+    id (the merge depends on the shards by id). Returns the number requeued.
+    """
+    if not job_ids:
+        return 0
 
-    # ==========================================================
-    # RQ FINISHED
-    # ==========================================================
-    if rq_status == "finished":
+    redis_conn = telemetry_queue.connection
+    requeued = 0
+    for rq_job in Job.fetch_many(job_ids, connection=redis_conn):
+        if rq_job is None or rq_job.func_name not in FANOUT_MEMBER_FUNCS:
+            continue
+        if _rq_status(rq_job) != "started":
+            continue  # finished, failed or already requeued
+        try:
+            queue = Queue(rq_job.origin, connection=redis_conn)
+            StartedJobRegistry(queue=queue).remove_executions(rq_job)
+            queue.enqueue_job(rq_job)
+            requeued += 1
+        except Exception:
+            # RQ's own cleanup fails it later; the merge then fails the parent
+            logger.exception("Re-enqueue after expired lease failed for fan-out job %s", rq_job.id)
+    return requeued
+
+
+def _rq_status(rq_job) -> str:
+    if rq_job is None:
+        return "missing"
+    status = rq_job.get_status(refresh=False)
+    return getattr(status, "value", status)
+
+
+def _plan(db_status: str, rq_status: str) -> str | None:
+    """
+    Deterministic, resurrection-safe reconciliation of one job.
+    DB is authoritative. Returns the action to take, or None.
+    """
+    # HARD TERMINAL GUARD
+    if db_status in ["cancelled", "completed"]:
+        return None
 
-        # Only auto-complete if DB was running
-        if job.status == "running":
-            logger.info(
-                "Updating DB. completed for job %s",
-                job.job_id,
-            )
-            job.status = "completed"
-            job.error = None
-            await db.commit()
+    # CRASH RECOVERY: Docker killed while running
+    if db_status == "running" and rq_status == "missing":
+        return "requeue_running"
 
-        return
+    # QUEUED but missing in Redis. Redis restart recovery
+    if db_status == "queued" and rq_status == "missing":
+        return "enqueue_queued"
 
-    # ==========================================================
-    # RQ QUEUED
-    # ==========================================================
-    if rq_status == "queued":
+    # RQ FAILED: only retry if DB explicitly says failed
+    if rq_status == "failed":
+        return "retry_failed" if db_status == "failed" else None
 
-        if job.status == "running":
-            # Worker restarted mid-transition
-            logger.info(
-                "Correcting DB running. queued for job %s",
-                job.job_id,
-            )
-            job.status = "queued"
-            await db.commit()
+    # RQ STARTED: only allow transition to running from queued
+    if rq_status == "started":
+        return "mark_running" if db_status == "queued" else None
+
+    # RQ FINISHED: only auto-complete if DB was running
+    if rq_status == "finished":
+        return "mark_completed" if db_status == "running" else None
+
+    # RQ QUEUED: worker restarted mid-transition
+    if rq_status == "queued":
+        return "mark_queued" if db_status == "running" else None
 
-        return
+    return None
@@ -0,0 +1,203 @@
+# app/workers/runtime.py
+#
+# Long-lived event loop for the export worker.
+#
+# Without it every RQ job does asyncio.run(...): new loop, new DB pool, new
+# HTTP clients, new OAuth token and a fresh tenant listing. The runtime keeps
+# one loop running in a background thread for the life of the worker process
+# so all of that is built once and reused by every job.
+#
+# Jobs are still executed by RQ worker threads; they just hand their
+# coroutine to the runtime loop and block on the result. With several worker
+# threads (EXPORT_WORKER_CONCURRENCY) several jobs run on the loop at once.
+
+import asyncio
+import logging
+import threading
+import time
+
+from rq import get_current_job
+from rq.timeouts import JobTimeoutException
+
+from app.core.database import dispose_engine, init_engine, run_with_engine
+
+logger = logging.getLogger("app.worker_runtime")
+
+
+class ExportRuntime:
+    """
+    One event loop (in a daemon thread) shared by every job in the process.
+    """
+
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._futures = {}  # job id -> future of the running job
+        self.jobs_run = 0
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None and self.loop.is_running()
+
+    def start(self):
+        if self.running:
+            return
+
+        self._ready.clear()
+        self._thread = threading.Thread(
+            target=self._run_loop,
+            name="export-runtime",
+            daemon=True,
+        )
+        self._thread.start()
+        self._ready.wait()
+
+        # Engine is created on (and belongs to) the runtime loop
+        self.run(self._warm_up())
+        logger.info("Export runtime started")
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        self.loop.run_forever()
+
+        # Loop stopped: let anything left finish its cleanup, then close
+        pending = asyncio.all_tasks(self.loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.loop.run_until_complete(
+                asyncio.gather(*pending, return_exceptions=True)
+            )
+        self.loop.close()
+
+    async def _warm_up(self):
+        init_engine()
+
+    def run(self, coro, key: str | None = None):
+        """
+        Run a coroutine on the runtime loop and block until it is done.
+
+        If the calling thread is interrupted (Ctrl+C, cold shutdown) the task
+        on the loop is cancelled before re-raising, so the job does not keep
+        running in the background.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if key is not None:
+            self._futures[key] = future
+        try:
+            return future.result()
+        except BaseException:
+            if not future.done():
+                future.cancel()
+            raise
+        finally:
+            if key is not None:
+                self._futures.pop(key, None)
+
+    def cancel(self, key: str) -> bool:
+        """
+        Cancel one running job (RQ stop-job command). Other jobs on the loop
+        are not affected.
+        """
+        future = self._futures.get(key)
+        if future is None or future.done():
+            return False
+        return future.cancel()
+
+    def cancel_all(self):
+        for future in list(self._futures.values()):
+            future.cancel()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._futures)
+
+    def run_job(self, job_id: str, coro, timeout: int | None = None):
+        """
+        Run one RQ job's coroutine. The job timeout is enforced on the loop
+        (a signal-based death penalty can't interrupt a worker thread).
+        """
+        if timeout and timeout > 0:
+            coro = _with_timeout(coro, timeout)
+
+        start = time.perf_counter()
+        try:
+            return self.run(coro, key=job_id)
+        finally:
+            self.jobs_run += 1
+            logger.debug(
+                "Runtime job %s finished in %.1fms (%d in flight)",
+                job_id,
+                (time.perf_counter() - start) * 1000,
+                self.in_flight,
+            )
+
+    def stop(self, timeout: float = 10):
+        if not self.running:
+            return
+
+        from app.services.export_signals import close_cancel_listener
+        from app.workers.telemetry_export import close_export_clients
+
+        try:
+            self.run(close_export_clients())
+            self.run(close_cancel_listener())
+            self.run(dispose_engine())
+        except Exception:
+            logger.exception("Export runtime cleanup failed")
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        self.loop = None
+        logger.info("Export runtime stopped after %d jobs", self.jobs_run)
+
+
+async def _with_timeout(coro, timeout: int):
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        raise JobTimeoutException(
+            f"Task exceeded maximum timeout value ({timeout} seconds)"
+        ) from None
+
+
+_runtime: ExportRuntime | None = None
+
+
+def start_runtime() -> ExportRuntime:
+    global _runtime
+
+    if _runtime is None:
+        _runtime = ExportRuntime()
+    _runtime.start()
+    return _runtime
+
+
+def stop_runtime():
+    global _runtime
+
+    if _runtime is not None:
+        _runtime.stop()
+    _runtime = None
+
+
+def get_runtime() -> ExportRuntime | None:
+    if _runtime is not None and _runtime.running:
+        return _runtime
+    return None
+
+
+def run_worker_coro(coro):
+    """
+    Entry point for the RQ sync wrappers. Uses the long-lived runtime when
+    the worker has one (AsyncExportWorker), otherwise falls back to a
+    throwaway loop per job as before.
+    """
+    runtime = get_runtime()
+    job = get_current_job()
+    if runtime is not None and job is not None:
+        return runtime.run_job(job.id, coro, job.timeout)
+    return asyncio.run(run_with_engine(coro))
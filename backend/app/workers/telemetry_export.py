@@ -1,20 +1,196 @@
 # app/workers/telemetry_export.py
 
+import asyncio
 import traceback
 import logging
+import weakref
 from datetime import datetime
 from pathlib import Path
 
+from app.core.config import settings
+from app.core.data_cache import use_data_cache
 from app.models.export_job import ExportJob
+from app.services.export_fanout import start_fanout
 from app.services.export_job_service import update_job_progress_only, update_job_status
+from app.core.work_meter import WorkMeter, activate_meter
+from app.services.export_estimator import (
+    EXPORT_STAGES,
+    estimate_export,
+    record_export_volumes,
+    record_tenant_count,
+)
 from app.services.export_service import TelemetryExportService
+from app.services.progress_reporter import ProgressReporter
+from app.services.export_leases import acquire_lease, release_lease
+from app.services.export_signals import cancel_latency_ms, cancel_requested, run_cancellable
+from app.utils.exceptions import ExportCancelled
 
 logger = logging.getLogger("app.telemetry_export")
 
 EXPORT_DIR = Path("/code/exports")  # <-- Docker-mounted volume for persistence
 EXPORT_DIR.mkdir(parents=True, exist_ok=True)
 
-async def run_export(job_id: str, date_from: str, date_to: str, tenant_id: str | None):
+METER_TICK_SECONDS = 5  # live percent / ETA between stage changes
+
+
+# Collectors and their API clients, per event loop. Under the long-lived
+# worker runtime (app/workers/runtime.py) there is one loop, so every job
+# reuses the same warm HTTP pools, OAuth token and tenant directory. With a
+# loop per job the entry goes away together with the loop.
+_collectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+
+def _build_collectors() -> dict:
+    from app.api.oauth_api import TokenManager
+    from app.api.org_api import OrgApiClient
+    from app.api.alerts_api import AlertsApiClient
+    from app.api.case_detections_api import CaseDetectionsApiClient
+    from app.api.cases_api import CasesApiClient
+    from app.api.health_check_api import HealthCheckApiClient
+    from app.services.alert_service import AlertTelemetryService
+    from app.services.case_service import CaseTelemetryService
+    # from app.services.mttd_service import MTTDService
+    from app.services.mttd_service2 import MTTDService2
+    from app.services.mtta_service import MTTAService
+    from app.services.mttr_service import MTTRService
+    from app.services.endpoint_health_service import (
+        EndpointHealthService,
+    )
+    from app.core.constants import oauth_url, global_url
+
+    token_manager = TokenManager(oauth_url, global_url)
+    org_client = OrgApiClient(
+        token_manager,
+        tenant_cache_seconds=settings.EXPORT_TENANT_CACHE_SECONDS,
+    )
+
+    alerts_client = AlertsApiClient(token_manager)
+    alerts_service = AlertTelemetryService(org_client, alerts_client)
+
+    cases_client = CasesApiClient(token_manager)
+    case_service = CaseTelemetryService(org_client, cases_client)
+
+    detections_client = CaseDetectionsApiClient(token_manager)
+    # MTTD
+    # mttd_service = MTTDService(
+    #     org_client=org_client,
+    #     cases_client=cases_client,
+    #     detections_client=detections_client,
+    # )
+
+    mttd_service2 = MTTDService2(
+        org_client=org_client,
+        cases_client=cases_client,
+        detections_client=detections_client,
+    )
+
+    mtta_service = MTTAService(org_client, cases_client)
+    mttr_service = MTTRService(org_client, cases_client)
+
+    endpoint_health_client = HealthCheckApiClient(token_manager)
+    endpoint_health_service = EndpointHealthService(
+        org_client, endpoint_health_client
+    )
+
+    return {
+        "alert_service": alerts_service,
+        "case_sla_service": case_service,
+        # "mttd_service": mttd_service,
+        "mttd_service2": mttd_service2,
+        "mtta_service": mtta_service,
+        "mttr_service": mttr_service,
+        "endpoint_health_service": endpoint_health_service,
+        "_clients": [
+            org_client,
+            alerts_client,
+            cases_client,
+            detections_client,
+            endpoint_health_client,
+        ],
+    }
+
+
+def build_export_service(progress_cb=None, is_cancelled_cb=None) -> TelemetryExportService:
+    """
+    Build the export service for one job. Call from inside the coroutine that
+    uses it: the API clients are shared by every job on the running loop.
+    """
+    loop = asyncio.get_running_loop()
+    collectors = _collectors.get(loop)
+    if collectors is None:
+        collectors = _collectors[loop] = _build_collectors()
+
+    # create export service
+    return TelemetryExportService(
+        **{k: v for k, v in collectors.items() if not k.startswith("_")},
+        progress_cb=progress_cb,
+        is_cancelled_cb=is_cancelled_cb,
+    )
+
+
+async def close_export_clients():
+    """
+    Close the API clients of the running loop (worker shutdown).
+    """
+    collectors = _collectors.pop(asyncio.get_running_loop(), None)
+    if collectors is None:
+        return
+
+    for client in collectors["_clients"]:
+        await client.aclose()
+
+
+async def start_work_meter(
+    date_from,
+    date_to,
+    tenant_ids: list[str] | None,
+    report,
+    stages: list[str] = EXPORT_STAGES,
+) -> tuple[WorkMeter, asyncio.Task]:
+    """
+    Activate a WorkMeter for the calling task (and everything it spawns) and
+    start a ticker that reports its live percent / ETA through `report`.
+    """
+    try:
+        estimate = estimate_export(date_from, date_to, tenant_ids, stages)
+    except Exception as exc:
+        logger.warning("No export estimate, progress falls back to stages: %s", exc)
+        estimate = None
+
+    meter = WorkMeter(estimate)
+    activate_meter(meter)
+
+    async def tick():
+        while True:
+            await asyncio.sleep(METER_TICK_SECONDS)
+            if meter.stage is not None:
+                await report(meter.snapshot())
+
+    return meter, asyncio.create_task(tick())
+
+
+async def stop_work_meter(meter: WorkMeter, ticker: asyncio.Task, date_from, date_to, record: bool):
+    """
+    Stop the ticker and, for a finished export, feed the meter into the
+    estimator. Never fails the job.
+    """
+    ticker.cancel()
+    if not record:
+        return
+    try:
+        record_export_volumes(meter, date_from, date_to)
+    except Exception as exc:
+        logger.warning("Could not record export volumes: %s", exc)
+
+
+async def run_export(
+    job_id: str,
+    date_from: str,
+    date_to: str,
+    tenant_id: str | None,
+    fmt: str = "xlsx",
+    force: bool = False,
+):
     """
     Telemetry export worker.
     - NO long-lived DB sessions
@@ -37,6 +213,11 @@ async def run_export(job_id: str, date_from: str, date_to: str, tenant_id: str |
     ):
         from app.core.database import get_worker_db
 
+        # Fenced: once the lease is gone the job belongs to whoever re-ran it
+        if not lease.held():
+            logger.warning("Job %s: lease lost, not writing status %s", job_id, status)
+            return
+
         async with get_worker_db() as db:
             await update_job_status(
                 db,
@@ -47,21 +228,13 @@ async def run_export(job_id: str, date_from: str, date_to: str, tenant_id: str |
                 file_path=file_path,
             )
 
-    async def update_progress(progress: dict):
-        from app.core.database import get_worker_db
-
-        async with get_worker_db() as db:
-            await update_job_progress_only(db, job_id, progress)
+    # Publishes every update, writes the row at most every few seconds
+    update_progress = ProgressReporter(job_id)
 
     async def is_cancelled() -> bool:
-        from app.core.database import get_worker_db
-
-        async with get_worker_db() as db:
-            result = await db.execute(
-                ExportJob.__table__.select().where(ExportJob.job_id == job_id)
-            )
-            job = result.first()
-            return bool(job and job._mapping["status"] == "cancelling")
+        # Redis key set by cancel_export; the pub/sub listener in
+        # run_cancellable normally interrupts the export before this runs
+        return cancel_requested(job_id)
 
     async def should_abort_before_start() -> bool:
         """
@@ -83,8 +256,23 @@ async def run_export(job_id: str, date_from: str, date_to: str, tenant_id: str |
 
             return current_status in ["cancelled", "cancelling"]
 
+    async def mark_cancelled(latency_ms: int | None):
+        await update_progress.close()
+        await set_status(
+            job_id,
+            status="cancelled",
+            progress={"stage": "Cancelled", "cancel_latency_ms": latency_ms},
+        )
+        print(f"[EXPORT] Job {job_id} CANCELLED ({latency_ms} ms after request)")
+
     # ───────────────────── job execution ──────────────────────
 
+    # One worker per job, see app/services/export_leases.py
+    lease = acquire_lease(job_id)
+    if lease is None:
+        print(f"[EXPORT] Job {job_id} is leased by another worker, not running it")
+        return
+
     try:
         # HARD GUARD: prevent resurrection
         if await should_abort_before_start():
@@ -98,78 +286,70 @@ async def run_export(job_id: str, date_from: str, date_to: str, tenant_id: str |
             progress={"stage": "Starting"}
         )
 
-        # create all async clients INSIDE coroutine
-        from app.api.oauth_api import TokenManager
-        from app.api.org_api import OrgApiClient
-        from app.api.alerts_api import AlertsApiClient
-        from app.api.case_detections_api import CaseDetectionsApiClient
-        from app.api.cases_api import CasesApiClient
-        from app.api.health_check_api import HealthCheckApiClient
-        from app.services.alert_service import AlertTelemetryService
-        from app.services.case_service import CaseTelemetryService
-        # from app.services.mttd_service import MTTDService
-        from app.services.mttd_service2 import MTTDService2
-        from app.services.mtta_service import MTTAService
-        from app.services.mttr_service import MTTRService
-        from app.services.endpoint_health_service import (
-            EndpointHealthService,
-        )
-        from app.core.constants import oauth_url, global_url
-
-        token_manager = TokenManager(oauth_url, global_url)
-        org_client = OrgApiClient(token_manager)
+        # Tenants and closed-period alerts come from the data cache;
+        # force=true refetches
+        use_data_cache("refresh" if force else "use")
 
-        alerts_client = AlertsApiClient(token_manager)
-        alerts_service = AlertTelemetryService(org_client, alerts_client)
-
-        cases_client = CasesApiClient(token_manager)
-        case_service = CaseTelemetryService(org_client, cases_client)
-
-        detections_client = CaseDetectionsApiClient(token_manager)
-        # MTTD
-        # mttd_service = MTTDService(
-        #     org_client=org_client,
-        #     cases_client=cases_client,
-        #     detections_client=detections_client,
-        # )
-
-        mttd_service2 = MTTDService2(
-            org_client=org_client,
-            cases_client=cases_client,
-            detections_client=detections_client,
-        )
-
-        mtta_service = MTTAService(org_client, cases_client)
-        mttr_service = MTTRService(org_client, cases_client)
-
-        endpoint_health_client = HealthCheckApiClient(token_manager)
-        endpoint_health_service = EndpointHealthService(
-            org_client, endpoint_health_client
-        )
-
-        # create export service
-        service = TelemetryExportService(
-            alert_service=alerts_service,
-            case_sla_service=case_service,
-            # mttd_service=mttd_service,
-            mttd_service2=mttd_service2,
-            mtta_service=mtta_service,
-            mttr_service=mttr_service,
-            endpoint_health_service=endpoint_health_service,
-            progress_cb=update_progress,
-            is_cancelled_cb=is_cancelled,
+        # create all async clients INSIDE coroutine
+        service = build_export_service(update_progress, is_cancelled)
+
+        if tenant_id:
+            tenant_ids = [tenant_id]
+        else:
+            # Served from the org client's tenant cache for the collectors
+            tenants = await service.alerts.org_client.list_tenants()
+            tenant_ids = [tenant["id"] for tenant in tenants]
+            record_tenant_count(len(tenants))
+
+        # Large all-tenant exports are split into per-shard sub-jobs, see
+        # app/workers/telemetry_fanout.py. This job then just hands over.
+        if not tenant_id and settings.EXPORT_FANOUT_SHARD_SIZE > 0:
+            if len(tenants) > settings.EXPORT_FANOUT_SHARD_SIZE:
+                shards = start_fanout(
+                    job_id,
+                    date_from,
+                    date_to,
+                    fmt,
+                    tenants,
+                    settings.EXPORT_FANOUT_SHARD_SIZE,
+                    force=force,
+                )
+                await update_progress({
+                    "stage": "Collecting",
+                    "percent": 0,
+                    "shards": shards,
+                    "shards_done": 0,
+                })
+                await update_progress.close()
+                print(f"[EXPORT] Job {job_id} FANNED OUT into {shards} shards")
+                return
+
+        # Live percent / ETA from completed work units vs the estimate
+        meter, ticker = await start_work_meter(
+            date_from_dt, date_to_dt, tenant_ids, update_progress
         )
 
-        # run export
-        file_path = await service.export_to_excel(date_from_dt, date_to_dt, tenant_id)
+        # run export, interrupted straight away by a published cancel
+        file_path = None
+        try:
+            file_path = await run_cancellable(
+                job_id, service.export(date_from_dt, date_to_dt, tenant_id, fmt)
+            )
+        except ExportCancelled as cancelled:
+            await mark_cancelled(cancelled.latency_ms)
+            return
+        finally:
+            await stop_work_meter(
+                meter, ticker, date_from_dt, date_to_dt, record=file_path is not None
+            )
 
         if file_path is None or await is_cancelled():
-            # job cancelled mid-run
-            await set_status(job_id, status="cancelled", progress={"stage": "Cancelled"})
-            print(f"[EXPORT] Job {job_id} CANCELLED")
+            # job cancelled mid-run, caught at a checkpoint
+            await mark_cancelled(cancel_latency_ms(job_id))
             return
 
         # mark completed
+        await update_progress.close()
         await set_status(
             job_id=job_id,
             status="completed",
@@ -179,13 +359,29 @@ async def run_export(job_id: str, date_from: str, date_to: str, tenant_id: str |
         )
 
         print(f"[EXPORT] Job {job_id} COMPLETED")
+    except asyncio.CancelledError:
+        if not lease.lost:
+            # Job timeout (wait_for), RQ stop-job or shutdown cancelled the
+            # run. RQ counts the job failed, the row must say so too
+            try:
+                await update_progress.close()
+                await set_status(job_id, "failed", error="Export timed out or was stopped")
+            except ValueError:
+                logger.warning("Job %s already marked failed", job_id)
+            raise
+        # Our lease expired and the job was requeued: the new run owns it
+        asyncio.current_task().uncancel()
+        print(f"[EXPORT] Job {job_id} STOPPED, lease lost")
     except Exception as exc:
         try:
+            await update_progress.close()
             await set_status(job_id, "failed", error=str(exc))
         except ValueError:
             # Job already failed — do not explode
             logger.warning("Job %s already marked failed", job_id)
         raise
+    finally:
+        release_lease(lease)
 
 # Optional helper for updating progress
 async def update_progress(job_id: str, progress: dict):
@@ -4,10 +4,19 @@ import asyncio
 import logging
 
 from app.workers.telemetry_export import run_export
+from app.workers.telemetry_fanout import run_export_merge, run_export_shard
+from app.workers.scheduled_exports import run_schedule
+from app.workers.runtime import run_worker_coro
 from rq import get_current_job
 
 
-def run_export_sync(date_from: str, date_to: str, tenant_id: str | None = None):
+def run_export_sync(
+    date_from: str,
+    date_to: str,
+    tenant_id: str | None = None,
+    fmt: str = "xlsx",
+    force: bool = False,
+):
     """
     Sync wrapper for RQ to run async export job.
     """
@@ -21,7 +30,69 @@ def run_export_sync(date_from: str, date_to: str, tenant_id: str | None = None):
     try:
         job = get_current_job()
     
-        asyncio.run(run_export(job.id, date_from, date_to, tenant_id))
+        run_worker_coro(run_export(job.id, date_from, date_to, tenant_id, fmt, force))
     except Exception:
         logging.exception(f"Export job failed")
         raise
+
+
+def run_export_shard_sync(
+    parent_id: str,
+    shard_index: int,
+    date_from: str,
+    date_to: str,
+    tenants: list,
+    force: bool = False,
+):
+    """
+    Sync wrapper for one fan-out shard, see app/services/export_fanout.py.
+    """
+    if hasattr(asyncio, "WindowsSelectorEventLoopPolicy"):
+        asyncio.set_event_loop_policy(
+            asyncio.WindowsSelectorEventLoopPolicy()
+        )
+
+    try:
+        job = get_current_job()
+
+        run_worker_coro(
+            run_export_shard(parent_id, shard_index, date_from, date_to, tenants, force, job.id)
+        )
+    except Exception:
+        logging.exception(f"Export shard {shard_index} of {parent_id} failed")
+        raise
+
+
+def run_export_merge_sync(parent_id: str, shards: int, date_from: str, date_to: str, fmt: str = "xlsx"):
+    """
+    Sync wrapper for the fan-out merge job.
+    """
+    if hasattr(asyncio, "WindowsSelectorEventLoopPolicy"):
+        asyncio.set_event_loop_policy(
+            asyncio.WindowsSelectorEventLoopPolicy()
+        )
+
+    try:
+        job = get_current_job()
+
+        run_worker_coro(run_export_merge(parent_id, shards, date_from, date_to, fmt, job.id))
+    except Exception:
+        logging.exception(f"Export merge of {parent_id} failed")
+        raise
+
+
+def run_schedule_sync(schedule_id: int):
+    """
+    Sync wrapper for one run of a recurring export, see
+    app/services/export_schedules.py.
+    """
+    if hasattr(asyncio, "WindowsSelectorEventLoopPolicy"):
+        asyncio.set_event_loop_policy(
+            asyncio.WindowsSelectorEventLoopPolicy()
+        )
+
+    try:
+        run_worker_coro(run_schedule(schedule_id))
+    except Exception:
+        logging.exception(f"Scheduled export {schedule_id} failed")
+        raise
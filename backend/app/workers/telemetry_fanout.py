@@ -0,0 +1,282 @@
+# app/workers/telemetry_fanout.py
+#
+# Shard and merge workers for fanned-out exports, see
+# app/services/export_fanout.py for the overall flow.
+#
+# Like whole exports, each shard and merge run holds a lease keyed by its
+# RQ job id (app/services/export_leases.py): if its worker dies, the lease
+# watcher puts the same RQ job back on its queue within seconds, and the
+# merge still waits on it.
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+
+from app.core.data_cache import use_data_cache
+from app.exporters.dataset import merge_datasets
+from app.models.export_job import ExportJob
+from app.services.export_fanout import (
+    COLLECT_PERCENT_SHARE,
+    cleanup_fanout,
+    read_partials,
+    record_shard_progress,
+    write_partial,
+)
+from app.services.export_estimator import EXPORT_STAGES
+from app.services.export_signals import cancel_latency_ms, cancel_requested, run_cancellable
+from app.services.export_job_service import update_job_status
+from app.services.export_leases import Lease, acquire_lease, release_lease
+from app.services.progress_reporter import ProgressReporter
+from app.utils.exceptions import ExportCancelled
+from app.workers.telemetry_export import build_export_service, start_work_meter, stop_work_meter
+
+logger = logging.getLogger("app.telemetry_fanout")
+
+
+async def _parent_status(parent_id: str) -> str | None:
+    from app.core.database import get_worker_db
+
+    async with get_worker_db() as db:
+        result = await db.execute(
+            ExportJob.__table__.select().where(ExportJob.job_id == parent_id)
+        )
+        job = result.first()
+        return job._mapping["status"] if job else None
+
+
+async def _set_parent_status(parent_id: str, status: str, **kwargs):
+    from app.core.database import get_worker_db
+
+    async with get_worker_db() as db:
+        await update_job_status(db, parent_id, new_status=status, **kwargs)
+
+
+async def _run_leased(job_id: str | None, label: str, run):
+    """
+    Await run(lease) under the lease on job_id. Not run if another worker
+    holds it; stopped quietly if the lease is lost (the job was requeued).
+    """
+    if job_id is None:
+        return await run(None)
+
+    lease = acquire_lease(job_id)
+    if lease is None:
+        print(f"[EXPORT] {label} is leased by another worker, not running it")
+        return None
+
+    try:
+        return await run(lease)
+    except asyncio.CancelledError:
+        if not lease.lost:
+            raise
+        asyncio.current_task().uncancel()
+        print(f"[EXPORT] {label} STOPPED, lease lost")
+    finally:
+        release_lease(lease)
+
+
+async def run_export_shard(
+    parent_id: str,
+    shard_index: int,
+    date_from: str,
+    date_to: str,
+    tenants: List[Dict[str, Any]],
+    force: bool = False,
+    job_id: str | None = None,
+):
+    """
+    Collect metrics for one slice of tenants and write them as a partial.
+    Progress is folded into the parent job's progress. job_id is the shard's
+    RQ job, leased while it runs.
+    """
+    await _run_leased(
+        job_id,
+        f"Shard {shard_index} of {parent_id}",
+        lambda lease: _export_shard(parent_id, shard_index, date_from, date_to, tenants, force),
+    )
+
+
+async def _export_shard(
+    parent_id: str,
+    shard_index: int,
+    date_from: str,
+    date_to: str,
+    tenants: List[Dict[str, Any]],
+    force: bool,
+):
+    print(f"[EXPORT] Shard {shard_index} of {parent_id} STARTED ({len(tenants)} tenants)")
+
+    if await _parent_status(parent_id) != "running":
+        print(f"[EXPORT] Shard {shard_index} of {parent_id} skipped, parent not running")
+        return
+
+    # Every shard reports into the parent row, write-behind
+    parent_progress = ProgressReporter(parent_id)
+    last_percent = None
+
+    async def report(percent: int):
+        nonlocal last_percent
+        combined = record_shard_progress(parent_id, shard_index, percent)
+        if combined["percent"] == last_percent:
+            return
+        last_percent = combined["percent"]
+        await parent_progress.report({"stage": "Collecting", **combined})
+
+    async def update_progress(progress: dict):
+        await report(progress.get("percent", 0))
+
+    async def is_cancelled() -> bool:
+        return await asyncio.to_thread(cancel_requested, parent_id)
+
+    use_data_cache("refresh" if force else "use")
+    service = build_export_service(update_progress, is_cancelled)
+    date_from_dt = datetime.fromisoformat(date_from).date()
+    date_to_dt = datetime.fromisoformat(date_to).date()
+
+    # Shard percent comes from its own work units, see app/core/work_meter.py
+    meter, ticker = await start_work_meter(
+        date_from_dt,
+        date_to_dt,
+        [tenant["id"] for tenant in tenants],
+        update_progress,
+        stages=[stage for stage in EXPORT_STAGES if stage != "write"],  # merge writes
+    )
+
+    # Shards listen on the parent's cancel channel
+    dataset = None
+    try:
+        dataset = await run_cancellable(
+            parent_id,
+            service.collect_dataset(date_from_dt, date_to_dt, None, tenants=tenants),
+        )
+    except ExportCancelled:
+        pass
+    finally:
+        meter.end_stage()
+        await stop_work_meter(meter, ticker, date_from_dt, date_to_dt, record=dataset is not None)
+
+    if dataset is None:
+        print(f"[EXPORT] Shard {shard_index} of {parent_id} CANCELLED")
+        return
+
+    write_partial(parent_id, shard_index, dataset)
+    await report(100)
+    await parent_progress.close()
+
+    print(f"[EXPORT] Shard {shard_index} of {parent_id} COMPLETED")
+
+
+async def run_export_merge(
+    parent_id: str,
+    shards: int,
+    date_from: str,
+    date_to: str,
+    fmt: str,
+    job_id: str | None = None,
+):
+    """
+    Merge every shard's partial into one dataset and write the export file.
+    Finishes the parent job: completed, failed or cancelled. job_id is the
+    merge's RQ job, leased while it runs.
+    """
+    await _run_leased(
+        job_id,
+        f"Merge of {parent_id}",
+        lambda lease: _export_merge(parent_id, shards, date_from, date_to, fmt, lease),
+    )
+
+
+async def _export_merge(
+    parent_id: str,
+    shards: int,
+    date_from: str,
+    date_to: str,
+    fmt: str,
+    lease: Lease | None,
+):
+    print(f"[EXPORT] Merge of {parent_id} STARTED ({shards} shards)")
+
+    keep_partials = False
+    try:
+        status = await _parent_status(parent_id)
+        if status != "running":
+            if status == "cancelling":
+                await _set_parent_status(parent_id, "cancelled", progress={"stage": "Cancelled"})
+            print(f"[EXPORT] Merge of {parent_id} skipped, parent {status}")
+            return
+
+        update_progress = ProgressReporter(parent_id)
+        await update_progress({"stage": "Merging Shards", "percent": COLLECT_PERCENT_SHARE})
+        # File reads and JSON decoding, off the loop other jobs share
+        dataset = await asyncio.to_thread(lambda: merge_datasets(read_partials(parent_id, shards)))
+
+        async def is_cancelled() -> bool:
+            return await asyncio.to_thread(cancel_requested, parent_id)
+
+        # write_export reports 60-95% on its own scale (no work meter here);
+        # the merge owns COLLECT_PERCENT_SHARE-99, and never goes backwards
+        last_percent = COLLECT_PERCENT_SHARE
+
+        async def write_progress(progress: dict):
+            nonlocal last_percent
+            percent = progress.get("percent")
+            if percent is not None and percent < 100:
+                scaled = COLLECT_PERCENT_SHARE + (max(percent, 60) - 60) * (99 - COLLECT_PERCENT_SHARE) // 40
+                last_percent = max(last_percent, min(scaled, 99))
+                progress = {**progress, "percent": last_percent}
+            await update_progress(progress)
+
+        service = build_export_service(write_progress, is_cancelled)
+        try:
+            file_path = await run_cancellable(
+                parent_id,
+                service.write_export(
+                    dataset,
+                    datetime.fromisoformat(date_from).date(),
+                    datetime.fromisoformat(date_to).date(),
+                    None,
+                    fmt,
+                ),
+            )
+            latency_ms = cancel_latency_ms(parent_id)
+        except ExportCancelled as cancelled:
+            file_path, latency_ms = None, cancelled.latency_ms
+
+        await update_progress.close()
+
+        if file_path is None or await is_cancelled():
+            await _set_parent_status(
+                parent_id,
+                "cancelled",
+                progress={"stage": "Cancelled", "cancel_latency_ms": latency_ms},
+            )
+            print(f"[EXPORT] Merge of {parent_id} CANCELLED")
+            return
+
+        await _set_parent_status(
+            parent_id,
+            "completed",
+            progress={"stage": "Done", "percent": 100},
+            file_path=file_path,
+        )
+        print(f"[EXPORT] Job {parent_id} COMPLETED")
+    except asyncio.CancelledError:
+        if lease is not None and lease.lost:
+            keep_partials = True  # the requeued merge reads them
+            raise
+        # Job timeout or stop-job: the parent must not stay "running"
+        try:
+            await _set_parent_status(parent_id, "failed", error="Export merge timed out or was stopped")
+        except ValueError:
+            logger.warning("Job %s already finished", parent_id)
+        raise
+    except Exception as exc:
+        try:
+            await _set_parent_status(parent_id, "failed", error=str(exc))
+        except ValueError:
+            logger.warning("Job %s already finished", parent_id)
+        raise
+    finally:
+        if not keep_partials:
+            cleanup_fanout(parent_id)
@@ -0,0 +1,161 @@
+# benchmarks/bench_export.py
+#
+# End-to-end export benchmark against the mock Sophos server.
+#
+#   cd backend && python -m benchmarks.bench_export --tenants 200 --alerts 2000 \
+#       --latency lognormal --latency-ms 80 --runs 3
+#
+# Starts benchmarks/mock_sophos.py in a subprocess (so its CPU and memory
+# don't count), points the API clients at it and runs
+# TelemetryExportService.export_to_excel the way a worker job does. Per
+# run: wall time, upstream requests by route (counted by the mock) and peak
+# memory (Python allocations via tracemalloc, and the process's max RSS).
+#
+# The Redis data cache is off unless --data-cache is given, so every run
+# really fetches. With --data-cache the export uses it the way a worker job
+# does (tenants and closed-window alerts only) and the window ends
+# yesterday, since a window reaching into today is never cached; run 1
+# fills it, runs 2+ read it. The workbook goes to a temp dir and is
+# deleted. Run 1 also pays for first-use imports; compare runs 2+ across
+# changes.
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from datetime import date, timedelta
+from pathlib import Path
+
+from benchmarks.mock_sophos import add_arguments
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def mock_call(base_url: str, path: str, method: str = "GET") -> dict:
+    request = urllib.request.Request(f"{base_url}{path}", method=method)
+    with urllib.request.urlopen(request, timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def start_mock(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    mock_args = [
+        "--port", str(port),
+        "--tenants", str(args.tenants),
+        "--page-size", str(args.page_size),
+        "--alerts", str(args.alerts),
+        "--cases", str(args.cases),
+        "--resolved-ratio", str(args.resolved_ratio),
+        "--detections", str(args.detections),
+        "--latency", args.latency,
+        "--latency-ms", str(args.latency_ms),
+        "--seed", str(args.seed),
+    ]
+    proc = subprocess.Popen([sys.executable, "-m", "benchmarks.mock_sophos", *mock_args])
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Mock Sophos server exited on startup")
+        try:
+            mock_call(base_url, "/_mock/stats")
+            return proc
+        except OSError:
+            time.sleep(0.1)
+
+    proc.terminate()
+    raise RuntimeError("Mock Sophos server did not come up")
+
+
+def point_clients_at(base_url: str, export_dir: str, data_cache: bool):
+    # Before the first build_export_service(): it reads these when it
+    # builds the loop's API clients
+    import app.core.constants as constants
+    import app.services.export_service as export_service
+    from app.core.config import settings
+
+    constants.oauth_url = base_url
+    constants.global_url = base_url
+    export_service.EXPORT_DIR = Path(export_dir)
+    if not data_cache:
+        settings.EXPORT_DATA_CACHE_TTL_SECONDS = 0
+
+
+async def run_export(date_from: date, date_to: date, tenant_id: str | None, data_cache: bool) -> str | None:
+    from app.core.data_cache import use_data_cache
+    from app.workers.telemetry_export import build_export_service, close_export_clients
+
+    if data_cache:
+        use_data_cache("use")
+    try:
+        service = build_export_service()
+        return await service.export_to_excel(date_from, date_to, tenant_id)
+    finally:
+        await close_export_clients()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end export benchmark")
+    add_arguments(parser)
+    parser.add_argument("--days", type=int, default=30, help="export window, ending today (yesterday with --data-cache)")
+    parser.add_argument("--tenant-id", default=None, help="single-tenant export")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--data-cache", action="store_true", help="keep the Redis data cache on")
+    args = parser.parse_args()
+
+    date_to = date.today() - timedelta(days=1 if args.data_cache else 0)
+    date_from = date_to - timedelta(days=args.days)
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    mock = start_mock(args, port)
+    try:
+        with tempfile.TemporaryDirectory() as export_dir:
+            point_clients_at(base_url, export_dir, args.data_cache)
+            print(
+                f"tenants={args.tenants} alerts/tenant={args.alerts} cases/tenant={args.cases} "
+                f"page_size={args.page_size} latency={args.latency}:{args.latency_ms:.0f}ms "
+                f"window={date_from}..{date_to}"
+            )
+
+            for run in range(1, args.runs + 1):
+                mock_call(base_url, "/_mock/reset", "POST")
+                tracemalloc.start()
+                start = time.perf_counter()
+
+                path = asyncio.run(run_export(date_from, date_to, args.tenant_id, args.data_cache))
+
+                wall_s = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                stats = mock_call(base_url, "/_mock/stats")
+                size = os.path.getsize(path) if path else 0
+                # ru_maxrss is KiB on Linux
+                max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+                print(
+                    f"run {run}: wall={wall_s:.2f}s requests={stats['total']} "
+                    f"peak_alloc={peak / 1024 / 1024:.1f}MiB max_rss={max_rss:.0f}MiB "
+                    f"file={size / 1024:.0f}KiB"
+                )
+                for route, count in sorted(stats["requests"].items(), key=lambda kv: -kv[1]):
+                    print(f"    {count:>7}  {route}")
+    finally:
+        mock.terminate()
+        mock.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
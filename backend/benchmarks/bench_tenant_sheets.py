@@ -0,0 +1,149 @@
+# benchmarks/bench_tenant_sheets.py
+#
+# Sheet-building benchmark on synthetic aggregator results.
+#
+#   cd backend && python -m benchmarks.bench_tenant_sheets --tenants 5000
+#
+# Compares the old per-tenant lookups (a linear scan of five result lists
+# plus a linear sheet title check) with ExportDataset / SheetTitleRegistry,
+# then times a full write-only workbook build and save.
+
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+
+from app.aggregator.alert_aggregator import AlertTelemetryAggregator
+from app.aggregator.case_aggregator import CaseTelemetryAggregator
+from app.aggregator.endpoint_health_aggregator import EndpointHealthAggregator
+from app.aggregator.mtta_aggregator import MTTAAggregator
+from app.aggregator.mttd_aggregator import MTTDAggregator
+from app.aggregator.mttr_aggregator import MTTRAggregator
+from app.exporters.dataset import ExportDataset
+from app.exporters.excel.all_tenants_sheet import build_all_tenants_sheet
+from app.exporters.excel.tenant_sheet import build_tenant_sheet
+from app.exporters.excel.writer import create_streaming_workbook
+from app.utils.helper import SheetTitleRegistry, safe_sheet_title
+
+
+def synthetic_dataset(tenant_count: int) -> ExportDataset:
+    # Half the tenant names collide so sheet title de-duplication is exercised
+    keys = [
+        (f"tenant-{i}", f"Customer {i % max(tenant_count // 2, 1)}")
+        for i in range(tenant_count)
+    ]
+    alert = {"severity": "high", "category": "malware", "raisedAt": "2026-01-05T10:00:00Z"}
+    case = {
+        "status": "resolved",
+        "createdAt": "2026-01-05T10:00:00Z",
+        "resolvedAt": "2026-01-05T10:20:00Z",
+        "initialDetection": {"time": "2026-01-05T09:58:00Z"},
+    }
+    detection = {"detection": {"sensorGeneratedAt": "2026-01-05T09:57:00Z", "time": "2026-01-05T09:58:00Z"}}
+    health = {
+        "endpoint": {
+            "protection": {"computer": {"notFullyProtected": 3}},
+            "tamperProtection": {"server": {"disabled": 1}},
+        }
+    }
+
+    return ExportDataset(
+        alerts=AlertTelemetryAggregator.aggregate({k: [alert] * 4 for k in keys}),
+        sla=CaseTelemetryAggregator.aggregate({k: [case] for k in keys}),
+        mttd=MTTDAggregator.aggregate2({k: [detection] for k in keys}),
+        mtta=MTTAAggregator.aggregate({k: [case] for k in keys}),
+        mttr=MTTRAggregator.aggregate({k: [case] for k in keys}),
+        endpoint=EndpointHealthAggregator.aggregate({k: health for k in keys}),
+    )
+
+
+def legacy_lookups(dataset: ExportDataset) -> int:
+    """
+    What build_tenant_sheet / unique_sheet_title used to do per tenant.
+    """
+    sheetnames = ["All Tenants"]
+    for tenant in dataset.alerts["incidents"]:
+        tenant_id = tenant["tenantId"]
+        next(i for i in dataset.alerts["incidents"] if i["tenantId"] == tenant_id)
+        next(i for i in dataset.sla["incidents"] if i["tenantId"] == tenant_id)
+        next(i for i in dataset.mttd["incidents"] if i["tenantId"] == tenant_id)
+        next(i for i in dataset.mtta["incidents"] if i["tenantId"] == tenant_id)
+        next(i for i in dataset.mttr["incidents"] if i["tenantId"] == tenant_id)
+        next(i for i in dataset.endpoint["tenants"] if i["tenantId"] == tenant_id)
+
+        base = safe_sheet_title(tenant["tenantName"])
+        title = base
+        i = 1
+        while title in sheetnames:
+            suffix = f" ({i})"
+            title = base[: 31 - len(suffix)] + suffix
+            i += 1
+        sheetnames.append(title)
+    return len(sheetnames)
+
+
+def indexed_lookups(dataset: ExportDataset) -> int:
+    titles = SheetTitleRegistry()
+    titles.claim("All Tenants")
+    count = 1
+    for tenant in dataset.tenants():
+        titles.claim(tenant.tenant_name)
+        count += 1
+    return count
+
+
+def progress_writes(tenant_count: int) -> Counter:
+    writes = Counter(legacy=tenant_count)
+    last_percent = None
+    for idx in range(1, tenant_count + 1):
+        percent = 60 + int(30 * idx / tenant_count)
+        if percent != last_percent:
+            writes["throttled"] += 1
+            last_percent = percent
+    return writes
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sheet-building benchmark")
+    parser.add_argument("--tenants", type=int, default=5000)
+    args = parser.parse_args()
+
+    dataset, build_s = timed(synthetic_dataset, args.tenants)
+    print(f"tenants={args.tenants} synthetic data built in {build_s:.2f}s")
+
+    legacy_count, legacy_s = timed(legacy_lookups, dataset)
+    indexed_count, indexed_s = timed(indexed_lookups, dataset)
+    assert legacy_count == indexed_count
+    print(f"lookups+titles  legacy={legacy_s:.3f}s  indexed={indexed_s:.3f}s  "
+          f"speedup={legacy_s / max(indexed_s, 1e-9):.0f}x")
+
+    writes = progress_writes(args.tenants)
+    print(f"progress writes legacy={writes['legacy']}  throttled={writes['throttled']}")
+
+    def build_and_save():
+        wb = create_streaming_workbook()
+        titles = SheetTitleRegistry()
+        build_all_tenants_sheet(wb, dataset, titles)
+        for tenant in dataset.tenants():
+            build_tenant_sheet(wb, tenant, titles)
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        try:
+            wb.save(path)
+            return os.path.getsize(path)
+        finally:
+            os.remove(path)
+
+    size, workbook_s = timed(build_and_save)
+    print(f"workbook build+save={workbook_s:.2f}s size={size / 1024 / 1024:.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
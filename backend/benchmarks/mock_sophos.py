@@ -0,0 +1,337 @@
+# benchmarks/mock_sophos.py
+#
+# Local stand-in for Sophos Central, for export benchmarks without live
+# credentials.
+#
+#   cd backend && python -m benchmarks.mock_sophos --tenants 200 --latency-ms 80
+#
+# Serves the calls the API clients in app/api make, with the paging they
+# use (page / pages.total):
+#
+#   POST /api/v2/oauth2/token
+#   GET  /whoami/v1
+#   GET  /organization/v1/tenants[/{id}]
+#   GET  /common/v1/alerts
+#   GET  /cases/v1/cases
+#   GET  /cases/v1/cases/{id}/detections[/{detection id}]
+#   GET  /account-health-check/v1/health-check
+#
+# Data is synthetic and deterministic (same --seed, same records), spread
+# over whatever window is asked for. Each request waits for a latency drawn
+# from --latency (fixed, uniform, exponential, lognormal) around
+# --latency-ms. Requests are counted per route:
+#
+#   GET  /_mock/stats   {"requests": {route: count}, "total": n}
+#   POST /_mock/reset   zero the counters
+
+import argparse
+import asyncio
+import math
+import random
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+
+LATENCIES = ("fixed", "uniform", "exponential", "lognormal")
+
+SEVERITIES = ("low", "medium", "high")
+CATEGORIES = ("malware", "pua", "runtimeDetections", "policy", "connectivity")
+CASE_STATUSES = ("new", "investigating", "actionRequired", "resolved")
+
+
+@dataclass
+class MockSophosConfig:
+    tenants: int = 50
+    page_size: int = 100  # items per page on every list call
+    alerts: int = 500  # per tenant, over the requested window
+    cases: int = 50  # per tenant, over the requested window
+    resolved_ratio: float = 0.7
+    detections: int = 3  # per case
+    latency: str = "fixed"
+    latency_ms: float = 0.0  # mean
+    seed: int = 1
+
+
+# -----------------------------
+# Synthetic data
+# -----------------------------
+def _iso(ts: datetime) -> str:
+    return ts.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _parse(value: str) -> datetime:
+    if len(value) == 10:  # date only (alerts from / to)
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class SyntheticData:
+    def __init__(self, config: MockSophosConfig):
+        self.config = config
+        self.tenant_ids = [
+            str(uuid.UUID(int=random.Random(f"{config.seed}:tenant:{i}").getrandbits(128)))
+            for i in range(config.tenants)
+        ]
+        self.tenant_index = {tenant_id: i for i, tenant_id in enumerate(self.tenant_ids)}
+        # Records per (tenant, window), so every page of a listing agrees
+        self.alerts = lru_cache(maxsize=1024)(self._alerts)
+        self.cases = lru_cache(maxsize=1024)(self._cases)
+
+    def _rng(self, *parts) -> random.Random:
+        # str seeds are stable between runs, hash() of a tuple isn't
+        return random.Random(":".join(map(str, (self.config.seed, *parts))))
+
+    def tenant(self, tenant_id: str, api_host: str) -> Dict[str, Any]:
+        i = self.tenant_index[tenant_id]
+        return {
+            "id": tenant_id,
+            "name": f"Customer {i}",
+            "showAs": f"Customer {i}",
+            "dataGeolocation": "eu",
+            "dataRegion": "eu02",
+            "billingType": "term",
+            "status": "active",
+            "apiHost": api_host,
+        }
+
+    def _alerts(self, tenant_id: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        rng = self._rng("alerts", tenant_id, start, end)
+        span = max((end - start).total_seconds(), 1)
+        raised = sorted(rng.uniform(0, span) for _ in range(self.config.alerts))
+        return [
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "category": rng.choice(CATEGORIES),
+                "severity": rng.choice(SEVERITIES),
+                "type": "Event::Endpoint::Threat::Detected",
+                "description": "Synthetic alert",
+                "raisedAt": _iso(start + timedelta(seconds=offset)),
+                "tenant": {"id": tenant_id},
+            }
+            for offset in raised
+        ]
+
+    def _cases(self, tenant_id: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        rng = self._rng("cases", tenant_id, start, end)
+        span = max((end - start).total_seconds(), 1)
+        cases = []
+        for offset in sorted(rng.uniform(0, span) for _ in range(self.config.cases)):
+            created = start + timedelta(seconds=offset)
+            detected = created - timedelta(seconds=rng.uniform(30, 1800))
+            resolved = rng.random() < self.config.resolved_ratio
+            case = {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "type": "investigation",
+                "name": "Synthetic case",
+                "severity": rng.choice(SEVERITIES),
+                "status": "resolved" if resolved else rng.choice(CASE_STATUSES[:-1]),
+                "createdAt": _iso(created),
+                "assignedAt": _iso(created + timedelta(seconds=rng.uniform(10, 3600))),
+                "initialDetection": {
+                    "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "time": _iso(detected),
+                },
+                "tenant": {"id": tenant_id},
+            }
+            if resolved:
+                case["resolvedAt"] = _iso(created + timedelta(seconds=rng.lognormvariate(8, 1.5)))
+            cases.append(case)
+        return cases
+
+    def detection(self, case_id: str, detection_id: str) -> Dict[str, Any]:
+        rng = self._rng("detection", case_id, detection_id)
+        detected = datetime.now(timezone.utc)
+        return {
+            "id": detection_id,
+            "type": "threat",
+            "severity": rng.randint(1, 10),
+            "time": _iso(detected),
+            "sensorGeneratedAt": _iso(detected - timedelta(seconds=rng.uniform(1, 600))),
+        }
+
+    def health(self, tenant_id: str) -> Dict[str, Any]:
+        rng = self._rng("health", tenant_id)
+        return {
+            "endpoint": {
+                "protection": {
+                    kind: {"total": total, "notFullyProtected": rng.randint(0, total // 10), "snoozed": False}
+                    for kind, total in (("computer", rng.randint(10, 500)), ("server", rng.randint(1, 50)))
+                },
+                "tamperProtection": {
+                    kind: {"total": total, "disabled": rng.randint(0, total // 20), "snoozed": False}
+                    for kind, total in (("computer", rng.randint(10, 500)), ("server", rng.randint(1, 50)))
+                },
+            }
+        }
+
+
+def _page(items: List[Any], page: int, size: int) -> Dict[str, Any]:
+    total = max(math.ceil(len(items) / size), 1)
+    return {
+        "items": items[(page - 1) * size: page * size],
+        "pages": {"current": page, "size": size, "total": total, "items": len(items)},
+    }
+
+
+# -----------------------------
+# Server
+# -----------------------------
+def create_app(config: MockSophosConfig) -> FastAPI:
+    app = FastAPI(title="Mock Sophos Central")
+    data = SyntheticData(config)
+    requests_by_route: Counter = Counter()
+    rng = random.Random(config.seed)
+    org_id = str(uuid.UUID(int=rng.getrandbits(128)))
+
+    def latency() -> float:
+        mean = config.latency_ms / 1000
+        if mean <= 0:
+            return 0.0
+        if config.latency == "uniform":
+            return rng.uniform(0, 2 * mean)
+        if config.latency == "exponential":
+            return rng.expovariate(1 / mean)
+        if config.latency == "lognormal":
+            # sigma 0.75: most calls near the mean, a long tail of slow ones
+            sigma = 0.75
+            return rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+        return mean
+
+    @app.middleware("http")
+    async def count_and_delay(request: Request, call_next):
+        response = await call_next(request)
+        if not request.url.path.startswith("/_mock"):
+            route = request.scope.get("route")
+            requests_by_route[route.path if route else request.url.path] += 1
+            await asyncio.sleep(latency())
+        return response
+
+    def api_host(request: Request) -> str:
+        return str(request.base_url).rstrip("/")
+
+    def tenant_of(tenant_id: str | None) -> str:
+        if tenant_id not in data.tenant_index:
+            raise HTTPException(status_code=404, detail="Tenant not found")
+        return tenant_id
+
+    @app.post("/api/v2/oauth2/token")
+    async def token():
+        return {
+            "access_token": uuid.uuid4().hex,
+            "refresh_token": uuid.uuid4().hex,
+            "token_type": "bearer",
+            "expires_in": 3600,
+        }
+
+    @app.get("/whoami/v1")
+    async def whoami(request: Request):
+        host = api_host(request)
+        return {"id": org_id, "idType": "organization", "apiHosts": {"global": host, "dataRegion": host}}
+
+    @app.get("/organization/v1/tenants")
+    async def tenants(request: Request, page: int = 1):
+        host = api_host(request)
+        return _page([data.tenant(t, host) for t in data.tenant_ids], page, config.page_size)
+
+    @app.get("/organization/v1/tenants/{tenant_id}")
+    async def tenant(request: Request, tenant_id: str):
+        return data.tenant(tenant_of(tenant_id), api_host(request))
+
+    @app.get("/common/v1/alerts")
+    async def alerts(
+        date_from: str = Query(alias="from"),
+        date_to: str = Query(alias="to"),
+        page: int = 1,
+        x_tenant_id: str | None = Header(default=None),
+    ):
+        tenant_id = tenant_of(x_tenant_id)
+        return _page(data.alerts(tenant_id, _parse(date_from), _parse(date_to)), page, config.page_size)
+
+    @app.get("/cases/v1/cases")
+    async def cases(
+        createdAfter: str,
+        createdBefore: str,
+        page: int = 1,
+        status: str | None = None,
+        x_tenant_id: str | None = Header(default=None),
+    ):
+        tenant_id = tenant_of(x_tenant_id)
+        items = data.cases(tenant_id, _parse(createdAfter), _parse(createdBefore))
+        if status:
+            items = [case for case in items if case["status"] == status]
+        return _page(items, page, config.page_size)
+
+    @app.get("/cases/v1/cases/{case_id}/detections")
+    async def detections(case_id: str, page: int = 1, x_tenant_id: str | None = Header(default=None)):
+        tenant_of(x_tenant_id)
+        items = [data.detection(case_id, f"{case_id}:{i}") for i in range(config.detections)]
+        return _page(items, page, config.page_size)
+
+    @app.get("/cases/v1/cases/{case_id}/detections/{detection_id}")
+    async def detection(case_id: str, detection_id: str, x_tenant_id: str | None = Header(default=None)):
+        tenant_of(x_tenant_id)
+        # The case's initialDetection.time isn't known here, so the
+        # detection is timed relative to now; MTTD only uses the difference
+        return data.detection(case_id, detection_id)
+
+    @app.get("/account-health-check/v1/health-check")
+    async def health_check(x_tenant_id: str | None = Header(default=None)):
+        return data.health(tenant_of(x_tenant_id))
+
+    @app.get("/_mock/stats")
+    async def stats():
+        return {"requests": dict(requests_by_route), "total": sum(requests_by_route.values())}
+
+    @app.post("/_mock/reset")
+    async def reset():
+        requests_by_route.clear()
+        return {"ok": True}
+
+    return app
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--alerts", type=int, default=500, help="alerts per tenant in the window")
+    parser.add_argument("--cases", type=int, default=50, help="cases per tenant in the window")
+    parser.add_argument("--resolved-ratio", type=float, default=0.7)
+    parser.add_argument("--detections", type=int, default=3, help="detections per case")
+    parser.add_argument("--latency", choices=LATENCIES, default="fixed")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean latency per request")
+    parser.add_argument("--seed", type=int, default=1)
+
+
+def config_from_args(args: argparse.Namespace) -> MockSophosConfig:
+    return MockSophosConfig(
+        tenants=args.tenants,
+        page_size=args.page_size,
+        alerts=args.alerts,
+        cases=args.cases,
+        resolved_ratio=args.resolved_ratio,
+        detections=args.detections,
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        seed=args.seed,
+    )
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock Sophos Central server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect, Suspense } from "react";
+import { useState, useEffect, useRef, Suspense } from "react";
 import DatePickerCard from "../../components/DatePickerCard";
 import DataTable from "../../components/DataTable";
 import SideNav from "../../components/SideNav";
@@ -23,6 +23,18 @@ type TelemetryExport = {
   created_at: string;
 };
 
+// Payload of a "progress" event from /api/telemetry/events
+type TelemetryEvent = {
+  job_id: string;
+  status?: string;
+  progress?: {
+    stage: string;
+    percent: number;
+  };
+  file_path?: string | null;
+  error?: string | null;
+};
+
 type TableData = {
   jobId: string;
   tenantId?: string | null;
@@ -118,18 +130,59 @@ function ReportsPageContent() {
     }
   };
 
+  // Job IDs currently in the table, read by the event handler below
+  const jobIdsRef = useRef<Set<string>>(new Set());
+  useEffect(() => {
+    jobIdsRef.current = new Set(tableData.map((row) => row.jobId));
+  }, [tableData]);
+
   useEffect(() => {
     // Initial fetch with loading state
     fetchTelemetryData(true);
 
-    // Set up polling every 1 minute (60000 milliseconds)
-    const intervalId = setInterval(() => {
-      fetchTelemetryData(false);
-    }, 60000);
+    // Live updates from the backend's export event stream instead of polling
+    const source = new EventSource("/api/telemetry/events");
+    let opened = false;
+
+    source.onopen = () => {
+      // Re-sync after a reconnect, events may have been missed meanwhile
+      if (opened) {
+        fetchTelemetryData(false);
+      }
+      opened = true;
+    };
+
+    source.addEventListener("progress", (event) => {
+      const update = JSON.parse((event as MessageEvent).data) as TelemetryEvent;
+
+      if (update.status === "deleted") {
+        setTableData((rows) => rows.filter((row) => row.jobId !== update.job_id));
+        return;
+      }
+
+      // A job created elsewhere: fetch it with all its columns
+      if (!jobIdsRef.current.has(update.job_id)) {
+        fetchTelemetryData(false);
+        return;
+      }
+
+      setTableData((rows) =>
+        rows.map((row) =>
+          row.jobId !== update.job_id
+            ? row
+            : {
+                ...row,
+                status: update.status ?? row.status,
+                progress: update.progress ?? row.progress,
+                downloadUrl: update.file_path ?? row.downloadUrl,
+              }
+        )
+      );
+    });
 
-    // Cleanup interval on component unmount
+    // Close the stream on component unmount
     return () => {
-      clearInterval(intervalId);
+      source.close();
     };
   }, []);
 
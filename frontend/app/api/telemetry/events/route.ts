@@ -0,0 +1,48 @@
+import { NextRequest, NextResponse } from "next/server";
+
+// Server-sent events need the response streamed as it arrives
+export const dynamic = "force-dynamic";
+
+export async function GET(request: NextRequest) {
+  try {
+    const backendUrl = process.env.NEXT_PUBLIC_BACKEND_URL;
+    const endpoint = `${backendUrl}/exports/events`;
+
+    // Pass Last-Event-ID through so a reconnecting EventSource resumes
+    // where it left off
+    const headers: HeadersInit = { Accept: "text/event-stream" };
+    const lastEventId = request.headers.get("last-event-id");
+    if (lastEventId) {
+      headers["Last-Event-ID"] = lastEventId;
+    }
+
+    const response = await fetch(endpoint, {
+      method: "GET",
+      headers,
+      signal: request.signal,
+      cache: "no-store",
+    });
+
+    if (!response.ok || !response.body) {
+      return NextResponse.json(
+        { error: "Failed to open telemetry event stream" },
+        { status: response.status || 502 }
+      );
+    }
+
+    return new Response(response.body, {
+      status: 200,
+      headers: {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache, no-transform",
+        Connection: "keep-alive",
+      },
+    });
+  } catch (error) {
+    console.error("Error in telemetry events API route:", error);
+    return NextResponse.json(
+      { error: "Internal server error" },
+      { status: 500 }
+    );
+  }
+}
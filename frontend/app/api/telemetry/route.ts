@@ -33,11 +33,13 @@ const extractBackendErrorMessage = (
   return fallback;
 };
 
-export async function GET() {
+export async function GET(request: NextRequest) {
   try {
     // Get backend URL from environment variable
     const backendUrl = process.env.NEXT_PUBLIC_BACKEND_URL;
-    const endpoint = `${backendUrl}/exports`;
+
+    // Pass paging / filter params (limit, before, tenant_id, summary) through
+    const endpoint = `${backendUrl}/exports${request.nextUrl.search}`;
 
     // Forward the GET request to the external endpoint
     const response = await fetch(endpoint, {
@@ -57,7 +59,14 @@ export async function GET() {
       );
     }
 
-    return NextResponse.json(data, { status: response.status });
+    // Cursor for the next page, absent on the last one
+    const headers: HeadersInit = {};
+    const nextCursor = response.headers.get("x-next-cursor");
+    if (nextCursor) {
+      headers["X-Next-Cursor"] = nextCursor;
+    }
+
+    return NextResponse.json(data, { status: response.status, headers });
   } catch (error) {
     console.error("Error in telemetry GET API route:", error);
     return NextResponse.json(
@@ -70,7 +79,7 @@ export async function GET() {
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json();
-    const { date_from, date_to, tenant_id } = body;
+    const { date_from, date_to, tenant_id, format } = body;
 
 
     // Validate dates
@@ -103,6 +112,11 @@ export async function POST(request: NextRequest) {
       url.searchParams.append("tenant_id", tenant_id.trim());
     }
 
+    // Export format (xlsx, csv, ndjson). Backend defaults to xlsx
+    if (format && format.trim()) {
+      url.searchParams.append("format", format.trim());
+    }
+
     // Forward the request to the external endpoint with query parameters
     const response = await fetch(url.toString(), {
       method: "POST",